@@ -5,7 +5,7 @@ CarePill 시스템 설정
 
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 from dotenv import load_dotenv
 
 # 환경 변수 로드
@@ -21,10 +21,6 @@ TEMP_DIR = BASE_DIR / "temp"
 LOGS_DIR = BASE_DIR / "logs"
 MODELS_DIR = BASE_DIR / "models"
 
-# 디렉토리 생성
-for directory in [UPLOAD_DIR, IMAGES_DIR, TEMP_DIR, LOGS_DIR, MODELS_DIR]:
-    directory.mkdir(exist_ok=True)
-
 
 class Settings:
     """시스템 설정 클래스"""
@@ -43,6 +39,16 @@ class Settings:
     DB_PASSWORD: str = os.getenv('DB_PASSWORD', '')
     DB_NAME: str = os.getenv('DB_NAME', 'carepill')
     DB_ECHO: bool = os.getenv('DB_ECHO', 'false').lower() == 'true'
+    DB_POOL_SIZE: int = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW: int = int(os.getenv('DB_MAX_OVERFLOW', '5'))
+    DB_POOL_TIMEOUT: int = int(os.getenv('DB_POOL_TIMEOUT', '30'))  # 초
+
+    # SQLite 튜닝 설정 (PRAGMA)
+    SQLITE_JOURNAL_MODE: str = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS: str = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE: int = int(os.getenv('SQLITE_MMAP_SIZE', '134217728'))  # 128MB
+    SQLITE_CACHE_SIZE: int = int(os.getenv('SQLITE_CACHE_SIZE', '-16000'))  # 음수: KiB 단위 (16MB)
+    SQLITE_BUSY_TIMEOUT: int = int(os.getenv('SQLITE_BUSY_TIMEOUT', '20000'))  # 밀리초
 
     # OpenAI API 설정
     OPENAI_API_KEY: str = os.getenv('OPENAI_API_KEY', '')
@@ -58,12 +64,27 @@ class Settings:
     TESSERACT_DATA_PATH: str = os.getenv('TESSERACT_DATA_PATH', '/usr/share/tesseract-ocr/4.00/tessdata')
     OCR_LANGUAGES: str = os.getenv('OCR_LANGUAGES', 'kor+eng')
     OCR_CONFIDENCE_THRESHOLD: float = float(os.getenv('OCR_CONFIDENCE_THRESHOLD', '0.6'))
+    OCR_PREPROCESS: bool = os.getenv('OCR_PREPROCESS', 'true').lower() == 'true'  # 텍스트 영역만 잘라 OCR
+    OCR_TARGET_WIDTH: int = int(os.getenv('OCR_TARGET_WIDTH', '1280'))  # 전처리 후 최대 너비 (픽셀)
+    OCR_BATCH_SIZE: int = int(os.getenv('OCR_BATCH_SIZE', '0'))  # 0이면 작업 프로세스 수의 2배
+    OCR_POLL_INTERVAL: float = float(os.getenv('OCR_POLL_INTERVAL', '2'))  # 초
+    OCR_JOB_TIMEOUT: int = int(os.getenv('OCR_JOB_TIMEOUT', '300'))  # 초, 초과한 processing 작업은 재시도
+    OCR_MAX_ATTEMPTS: int = int(os.getenv('OCR_MAX_ATTEMPTS', '3'))  # 작업 프로세스 비정상 종료 시 작업당 최대 시도 횟수
+
+    # 이미지 중복 처리 방지
+    IMAGE_HASH_CACHE_SIZE: int = int(os.getenv('IMAGE_HASH_CACHE_SIZE', '256'))  # OCR/YOLO 각각
+    IMAGE_HASH_MAX_DISTANCE: int = int(os.getenv('IMAGE_HASH_MAX_DISTANCE', '4'))  # 지각 해시 해밍 거리 (비트, YOLO 결과만)
 
     # YOLO 설정
     YOLO_MODEL_PATH: str = os.getenv('YOLO_MODEL_PATH', str(MODELS_DIR / 'yolo' / 'best.pt'))
     YOLO_CONFIDENCE_THRESHOLD: float = float(os.getenv('YOLO_CONFIDENCE_THRESHOLD', '0.5'))
     YOLO_IOU_THRESHOLD: float = float(os.getenv('YOLO_IOU_THRESHOLD', '0.45'))
     YOLO_MAX_DETECTIONS: int = int(os.getenv('YOLO_MAX_DETECTIONS', '100'))
+    YOLO_BACKEND: str = os.getenv('YOLO_BACKEND', 'ultralytics')  # ultralytics, onnx, openvino
+    YOLO_INPUT_SIZE: int = int(os.getenv('YOLO_INPUT_SIZE', '640'))
+    YOLO_BATCH_SIZE: int = int(os.getenv('YOLO_BATCH_SIZE', '2'))  # 한 번에 추론할 최대 프레임 수
+    YOLO_BUFFER_SIZE: int = int(os.getenv('YOLO_BUFFER_SIZE', '4'))  # 카메라 프레임 링 버퍼 크기
+    YOLO_WRITE_QUEUE_SIZE: int = int(os.getenv('YOLO_WRITE_QUEUE_SIZE', '256'))
 
     # 파일 경로 설정
     UPLOAD_DIR: Path = UPLOAD_DIR
@@ -82,6 +103,15 @@ class Settings:
     LOG_FILE: str = os.getenv('LOG_FILE', str(LOGS_DIR / 'carepill.log'))
     LOG_FORMAT: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     LOG_DATE_FORMAT: str = '%Y-%m-%d %H:%M:%S'
+    LOG_MAX_BYTES: int = int(os.getenv('LOG_MAX_BYTES', '10485760'))  # 10MB
+    LOG_BACKUP_COUNT: int = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+    LOG_ASYNC: bool = os.getenv('LOG_ASYNC', 'true').lower() == 'true'  # 큐 기반 비동기 로깅
+    LOG_QUEUE_SIZE: int = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+    LOG_BATCH_SIZE: int = int(os.getenv('LOG_BATCH_SIZE', '100'))
+    SYSTEM_LOG_DB_ENABLED: bool = os.getenv('SYSTEM_LOG_DB_ENABLED', 'true').lower() == 'true'  # system_logs 테이블 저장
+    SYSTEM_LOG_BATCH_SIZE: int = int(os.getenv('SYSTEM_LOG_BATCH_SIZE', '200'))
+    SYSTEM_LOG_FLUSH_INTERVAL: float = float(os.getenv('SYSTEM_LOG_FLUSH_INTERVAL', '5'))  # 초
+    SYSTEM_LOG_RETENTION_DAYS: int = int(os.getenv('SYSTEM_LOG_RETENTION_DAYS', '30'))
 
     # 하드웨어 설정 (라즈베리파이)
     CAMERA_ENABLED: bool = os.getenv('CAMERA_ENABLED', 'true').lower() == 'true'
@@ -98,10 +128,24 @@ class Settings:
     AUDIO_CHANNELS: int = int(os.getenv('AUDIO_CHANNELS', '1'))
     AUDIO_CHUNK_SIZE: int = int(os.getenv('AUDIO_CHUNK_SIZE', '1024'))
 
+    # 음성 인터페이스 설정
+    VOICE_STREAMING: bool = os.getenv('VOICE_STREAMING', 'true').lower() == 'true'  # 응답 생성/TTS/재생 병렬 처리
+    TTS_CACHE_ENABLED: bool = os.getenv('TTS_CACHE_ENABLED', 'true').lower() == 'true'
+    TTS_CACHE_DIR: str = os.getenv('TTS_CACHE_DIR', str(TEMP_DIR / 'tts_cache'))
+    TTS_CACHE_MEMORY_BYTES: int = int(os.getenv('TTS_CACHE_MEMORY_BYTES', '8388608'))  # 8MB
+    TTS_CACHE_DISK_BYTES: int = int(os.getenv('TTS_CACHE_DISK_BYTES', '104857600'))  # 100MB
+
     # DUR API 설정
     KFDA_API_KEY: str = os.getenv('KFDA_API_KEY', '')
     DRUG_INFO_API_URL: str = os.getenv('DRUG_INFO_API_URL', 'https://api.example.com/drug-info')
     DUR_UPDATE_INTERVAL: int = int(os.getenv('DUR_UPDATE_INTERVAL', '24'))  # 시간
+    DUR_INFO_API_URL: str = os.getenv('DUR_INFO_API_URL', 'https://api.example.com/dur-info')
+    KFDA_DRUG_DATA_PATH: str = os.getenv('KFDA_DRUG_DATA_PATH', '')  # 약품 허가정보 덤프 파일 (CSV/XML/JSON, 지정 시 API 대신 사용)
+    KFDA_DUR_DATA_PATH: str = os.getenv('KFDA_DUR_DATA_PATH', '')  # DUR 병용금기 덤프 파일
+    KFDA_IMPORT_CHUNK_SIZE: int = int(os.getenv('KFDA_IMPORT_CHUNK_SIZE', '500'))  # upsert 한 번에 반영할 행 수
+
+    # 재고 경보 설정
+    INVENTORY_SCAN_INTERVAL: int = int(os.getenv('INVENTORY_SCAN_INTERVAL', '300'))  # 초
 
     # 알림 설정
     ENABLE_NOTIFICATIONS: bool = os.getenv('ENABLE_NOTIFICATIONS', 'true').lower() == 'true'
@@ -114,6 +158,10 @@ class Settings:
     # 성능 설정
     MAX_WORKERS: int = int(os.getenv('MAX_WORKERS', '4'))
     CACHE_TTL: int = int(os.getenv('CACHE_TTL', '300'))  # 초
+    STATISTICS_TTL: int = int(os.getenv('STATISTICS_TTL', '60'))  # 초, 상태 통계 전체 재조회 주기
+    METRICS_WINDOW: int = int(os.getenv('METRICS_WINDOW', '1024'))  # 백분위수 계산용 최근 표본 수
+    METRICS_FILE: str = os.getenv('METRICS_FILE', str(LOGS_DIR / 'carepill_metrics.prom'))
+    PERF_SLOW_THRESHOLD: float = float(os.getenv('PERF_SLOW_THRESHOLD', '1.0'))  # 초, 초과 시 성능 로그 기록
 
     @classmethod
     def get_database_url(cls) -> str:
@@ -125,6 +173,18 @@ class Settings:
         else:
             raise ValueError(f"지원하지 않는 데이터베이스 타입: {cls.DB_TYPE}")
 
+    @classmethod
+    def get_sqlite_pragmas(cls) -> Dict[str, Any]:
+        """SQLite 연결마다 적용할 PRAGMA 설정 반환"""
+        return {
+            'journal_mode': cls.SQLITE_JOURNAL_MODE,
+            'synchronous': cls.SQLITE_SYNCHRONOUS,
+            'mmap_size': cls.SQLITE_MMAP_SIZE,
+            'cache_size': cls.SQLITE_CACHE_SIZE,
+            'busy_timeout': cls.SQLITE_BUSY_TIMEOUT,
+            'temp_store': 'MEMORY',
+        }
+
     @classmethod
     def get_logging_config(cls) -> Dict[str, Any]:
         """로깅 설정 딕셔너리 반환"""
@@ -146,9 +206,12 @@ class Settings:
                 'file': {
                     'level': cls.LOG_LEVEL,
                     'formatter': 'standard',
-                    'class': 'logging.FileHandler',
+                    'class': 'logging.handlers.RotatingFileHandler',
                     'filename': cls.LOG_FILE,
                     'mode': 'a',
+                    'maxBytes': cls.LOG_MAX_BYTES,
+                    'backupCount': cls.LOG_BACKUP_COUNT,
+                    'encoding': 'utf-8',
                 },
             },
             'loggers': {
@@ -160,6 +223,23 @@ class Settings:
             }
         }
 
+    @classmethod
+    def ensure_directories(cls) -> List[str]:
+        """
+        작업 디렉토리 생성 (import 시점이 아니라 애플리케이션 시작 시 호출)
+
+        Returns:
+            List[str]: 생성에 실패한 디렉토리 오류 메시지
+        """
+        errors = []
+        for directory in [cls.UPLOAD_DIR, cls.IMAGES_DIR, cls.TEMP_DIR, cls.LOGS_DIR, cls.MODELS_DIR]:
+            if not directory.exists():
+                try:
+                    directory.mkdir(parents=True, exist_ok=True)
+                except Exception as e:
+                    errors.append(f"디렉토리 생성 실패 {directory}: {e}")
+        return errors
+
     @classmethod
     def validate_settings(cls) -> bool:
         """설정 유효성 검사"""
@@ -174,12 +254,7 @@ class Settings:
             errors.append(f"지원하지 않는 데이터베이스 타입: {cls.DB_TYPE}")
 
         # 디렉토리 접근 권한 검사
-        for directory in [cls.UPLOAD_DIR, cls.TEMP_DIR, cls.LOGS_DIR]:
-            if not directory.exists():
-                try:
-                    directory.mkdir(parents=True, exist_ok=True)
-                except Exception as e:
-                    errors.append(f"디렉토리 생성 실패 {directory}: {e}")
+        errors.extend(cls.ensure_directories())
 
         if errors:
             for error in errors:
@@ -14,7 +14,8 @@ from .models import (
     OCRResult,
     YOLODetection,
     SystemLog,
-    Configuration
+    Configuration,
+    SchemaVersion
 )
 
 from .database import (
@@ -24,6 +25,29 @@ from .database import (
     create_tables
 )
 
+from .migrator import (
+    MigrationRunner,
+    find_missing_indexes,
+    check_indexes
+)
+
+from .config_service import (
+    ConfigService,
+    get_config_service
+)
+
+from .statistics import (
+    DatabaseStatistics,
+    StatisticsService,
+    get_statistics_service
+)
+
+from .async_database import (
+    AsyncDatabaseManager,
+    init_async_database,
+    get_async_db_manager
+)
+
 __all__ = [
     'Base',
     'Medication',
@@ -37,8 +61,20 @@ __all__ = [
     'YOLODetection',
     'SystemLog',
     'Configuration',
+    'SchemaVersion',
     'DatabaseManager',
     'get_db_session',
     'init_database',
-    'create_tables'
+    'create_tables',
+    'MigrationRunner',
+    'find_missing_indexes',
+    'check_indexes',
+    'ConfigService',
+    'get_config_service',
+    'DatabaseStatistics',
+    'StatisticsService',
+    'get_statistics_service',
+    'AsyncDatabaseManager',
+    'init_async_database',
+    'get_async_db_manager'
 ]
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""
+CarePill 비동기 데이터베이스 연결 및 관리
+SQLAlchemy asyncio 확장(aiosqlite / asyncmy)을 사용한 데이터베이스 연결 관리
+"""
+
+import logging
+from typing import AsyncGenerator, Optional
+from contextlib import asynccontextmanager
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from config import settings
+from .models import Base
+from .database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# 동기 드라이버 → 비동기 드라이버 매핑
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+    'mysql': 'mysql+asyncmy',
+    'mysql+mysqlconnector': 'mysql+asyncmy',
+    'mysql+pymysql': 'mysql+asyncmy',
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """동기 드라이버 URL을 비동기 드라이버 URL로 변환"""
+    scheme, sep, rest = database_url.partition('://')
+    if not sep:
+        raise ValueError(f"잘못된 데이터베이스 URL: {database_url}")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+class AsyncDatabaseManager:
+    """비동기 데이터베이스 연결 관리 클래스"""
+
+    def __init__(self, database_url: Optional[str] = None):
+        """
+        비동기 데이터베이스 매니저 초기화
+
+        Args:
+            database_url: 데이터베이스 연결 URL (동기 드라이버 URL도 자동 변환)
+        """
+        self.database_url = to_async_url(database_url or settings.get_database_url())
+        self.engine: Optional[AsyncEngine] = None
+        self.SessionLocal: Optional[async_sessionmaker] = None
+        self._initialize_engine()
+
+    def _initialize_engine(self):
+        """비동기 데이터베이스 엔진 초기화"""
+        try:
+            if self.database_url.startswith('sqlite'):
+                if self._is_sqlite_memory():
+                    pool_options = {'poolclass': StaticPool}
+                else:
+                    pool_options = {
+                        'pool_size': settings.DB_POOL_SIZE,
+                        'max_overflow': settings.DB_MAX_OVERFLOW,
+                        'pool_timeout': settings.DB_POOL_TIMEOUT,
+                    }
+                self.engine = create_async_engine(
+                    self.database_url,
+                    connect_args={"timeout": settings.SQLITE_BUSY_TIMEOUT / 1000},
+                    echo=settings.DB_ECHO,
+                    **pool_options
+                )
+                event.listen(self.engine.sync_engine, 'connect', DatabaseManager._apply_sqlite_pragmas)
+            else:
+                # MySQL 설정
+                self.engine = create_async_engine(
+                    self.database_url,
+                    pool_size=settings.DB_POOL_SIZE,
+                    max_overflow=settings.DB_MAX_OVERFLOW,
+                    pool_timeout=settings.DB_POOL_TIMEOUT,
+                    pool_pre_ping=True,
+                    pool_recycle=300,
+                    echo=settings.DB_ECHO
+                )
+
+            self.SessionLocal = async_sessionmaker(
+                bind=self.engine,
+                autoflush=False,
+                expire_on_commit=False
+            )
+
+            logger.info(f"비동기 데이터베이스 엔진 초기화 완료: {self.database_url}")
+
+        except Exception as e:
+            logger.error(f"비동기 데이터베이스 엔진 초기화 실패: {e}")
+            raise
+
+    def _is_sqlite_memory(self) -> bool:
+        """인메모리 SQLite URL 여부"""
+        _, _, rest = self.database_url.partition('://')
+        return rest in ('', '/:memory:') or 'mode=memory' in rest
+
+    async def create_tables(self):
+        """데이터베이스 테이블 생성"""
+        try:
+            async with self.engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+            logger.info("데이터베이스 테이블 생성 완료")
+        except Exception as e:
+            logger.error(f"테이블 생성 실패: {e}")
+            raise
+
+    def get_session(self) -> AsyncSession:
+        """비동기 데이터베이스 세션 반환"""
+        if not self.SessionLocal:
+            raise RuntimeError("데이터베이스가 초기화되지 않았습니다.")
+        return self.SessionLocal()
+
+    @asynccontextmanager
+    async def async_session_scope(self) -> AsyncGenerator[AsyncSession, None]:
+        """비동기 세션 컨텍스트 매니저"""
+        session = self.get_session()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def test_connection(self) -> bool:
+        """데이터베이스 연결 테스트"""
+        try:
+            async with self.async_session_scope() as session:
+                await session.execute(text("SELECT 1"))
+            logger.info("데이터베이스 연결 테스트 성공")
+            return True
+        except Exception as e:
+            logger.error(f"데이터베이스 연결 테스트 실패: {e}")
+            return False
+
+    async def close(self):
+        """데이터베이스 연결 종료"""
+        if self.engine:
+            await self.engine.dispose()
+            logger.info("데이터베이스 연결 종료")
+
+
+# 전역 비동기 데이터베이스 매니저 인스턴스
+_async_db_manager: Optional[AsyncDatabaseManager] = None
+
+
+async def init_async_database(database_url: Optional[str] = None) -> AsyncDatabaseManager:
+    """
+    비동기 데이터베이스 초기화
+
+    Args:
+        database_url: 데이터베이스 연결 URL
+
+    Returns:
+        AsyncDatabaseManager: 비동기 데이터베이스 매니저 인스턴스
+    """
+    global _async_db_manager
+
+    if _async_db_manager is None:
+        _async_db_manager = AsyncDatabaseManager(database_url)
+        await _async_db_manager.create_tables()
+
+    return _async_db_manager
+
+
+def get_async_db_manager() -> AsyncDatabaseManager:
+    """비동기 데이터베이스 매니저 인스턴스 반환"""
+    if _async_db_manager is None:
+        raise RuntimeError("데이터베이스가 초기화되지 않았습니다. init_async_database()를 먼저 호출하세요.")
+    return _async_db_manager
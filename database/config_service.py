@@ -0,0 +1,250 @@
+"""
+CarePill 런타임 설정 서비스
+configurations 테이블을 한 번에 읽어 타입 변환 후 메모리에 캐시 (CACHE_TTL 만료 시 백그라운드 재적재, write-through 갱신)
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from config import settings
+from .database import DatabaseManager, get_db_manager
+from .models import Configuration
+
+logger = logging.getLogger(__name__)
+
+# 변경 알림 콜백: (key, 이전 값, 새 값)
+ConfigCallback = Callable[[str, Any, Any], None]
+
+_TRUE_VALUES = {'true', '1', 'yes', 'on', 'y'}
+
+
+def convert_value(value: Optional[str], data_type: Optional[str]) -> Any:
+    """문자열 설정 값을 data_type에 맞게 변환"""
+    if value is None:
+        return None
+    data_type = (data_type or 'string').lower()
+    try:
+        if data_type in ('boolean', 'bool'):
+            return value.strip().lower() in _TRUE_VALUES
+        if data_type in ('integer', 'int'):
+            return int(value)
+        if data_type == 'float':
+            return float(value)
+        if data_type == 'json':
+            return json.loads(value)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"설정 값 변환 실패 ({data_type}: {value!r}): {e}")
+    return value
+
+
+def serialize_value(value: Any) -> Tuple[str, str]:
+    """파이썬 값을 (문자열 값, data_type)으로 변환"""
+    if isinstance(value, bool):
+        return ('true' if value else 'false'), 'boolean'
+    if isinstance(value, int):
+        return str(value), 'integer'
+    if isinstance(value, float):
+        return repr(value), 'float'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False), 'json'
+    return str(value), 'string'
+
+
+class ConfigService:
+    """DB 기반 런타임 설정 캐시
+
+    최초 조회만 동기적으로 적재하고, 이후 캐시가 만료되면 기존 값을 그대로 반환하면서 백그라운드
+    스레드에서 재적재한다. 따라서 이벤트 루프 안에서 get()을 호출해도 DB 조회를 기다리지 않는다.
+    """
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, ttl: Optional[int] = None):
+        """
+        Args:
+            db_manager: 데이터베이스 매니저 (기본값: 전역 매니저)
+            ttl: 캐시 유효 시간 (초, 기본값: settings.CACHE_TTL)
+        """
+        self.db_manager = db_manager or get_db_manager()
+        self.ttl = settings.CACHE_TTL if ttl is None else ttl
+        self._values: Dict[str, Any] = {}
+        self._types: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._reloading = False
+        self._reload_lock = threading.Lock()
+        self._subscribers: Dict[Optional[str], List[ConfigCallback]] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """설정 값 조회 (캐시 만료 시 기존 값을 반환하고 백그라운드에서 재적재)"""
+        self._refresh_if_expired()
+        return self._values.get(key, default)
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        value = self.get(key, default)
+        return value if isinstance(value, bool) else convert_value(str(value), 'boolean')
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        value = self.get(key, default)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, key: str, default: float = 0.0) -> float:
+        value = self.get(key, default)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
+
+    def all(self) -> Dict[str, Any]:
+        """전체 설정 값 반환"""
+        self._refresh_if_expired()
+        return dict(self._values)
+
+    def reload(self) -> Dict[str, Any]:
+        """활성 설정 전체를 단일 쿼리로 다시 적재하고 변경된 값 알림"""
+        with self._lock:
+            with self.db_manager.session_scope() as session:
+                rows = session.execute(
+                    select(Configuration.key, Configuration.value, Configuration.data_type)
+                    .where(Configuration.is_active.is_(True))
+                ).all()
+
+            values = {row.key: convert_value(row.value, row.data_type) for row in rows}
+            types = {row.key: row.data_type or 'string' for row in rows}
+
+            previous = self._values if self._loaded else None
+            self._values = values
+            self._loaded = True
+            self._types = types
+            self._expires_at = time.monotonic() + self.ttl
+
+        self._notify_changes(previous, values)
+        return values
+
+    def invalidate(self):
+        """캐시 만료 처리 (다음 조회 시 백그라운드 재적재 시작)"""
+        self._expires_at = 0.0
+
+    def _refresh_if_expired(self):
+        if time.monotonic() < self._expires_at:
+            return
+        if not self._loaded:
+            # 반환할 값이 없으므로 최초 적재는 기다림
+            self.reload()
+            return
+
+        with self._reload_lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._background_reload, name='ConfigReload', daemon=True).start()
+
+    def _background_reload(self):
+        try:
+            self.reload()
+        except Exception as e:
+            # DB 장애 중에는 TTL마다 한 번만 재시도
+            self._expires_at = time.monotonic() + self.ttl
+            logger.error(f"런타임 설정 재적재 실패: {e}")
+        finally:
+            with self._reload_lock:
+                self._reloading = False
+
+    def set(self, key: str, value: Any, category: str = 'general',
+            description: Optional[str] = None, data_type: Optional[str] = None):
+        """
+        설정 값 저장 (DB와 캐시를 함께 갱신)
+
+        Args:
+            key: 설정 키
+            value: 설정 값
+            category: 새로 생성할 때의 카테고리
+            description: 설정 설명
+            data_type: 저장 타입 (기본값: 기존 타입 또는 값으로부터 추론)
+        """
+        raw_value, inferred_type = serialize_value(value)
+
+        with self._lock:
+            with self.db_manager.session_scope() as session:
+                config = session.execute(
+                    select(Configuration).where(Configuration.key == key)
+                ).scalar_one_or_none()
+
+                if config is None:
+                    config = Configuration(key=key, category=category)
+                    session.add(config)
+
+                config.value = raw_value
+                config.data_type = data_type or config.data_type or inferred_type
+                config.is_active = True
+                if description is not None:
+                    config.description = description
+                stored_type = config.data_type
+
+            old_value = self._values.get(key)
+            new_value = convert_value(raw_value, stored_type)
+            self._values[key] = new_value
+            self._types[key] = stored_type
+
+        if old_value != new_value:
+            self._notify(key, old_value, new_value)
+
+    def subscribe(self, callback: ConfigCallback, key: Optional[str] = None) -> Callable[[], None]:
+        """
+        설정 변경 알림 등록
+
+        Args:
+            callback: (key, 이전 값, 새 값)을 받는 함수
+            key: 특정 키만 구독 (None이면 전체)
+
+        Returns:
+            Callable: 구독 해제 함수
+        """
+        with self._lock:
+            self._subscribers.setdefault(key, []).append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(key, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+
+        return unsubscribe
+
+    def _notify_changes(self, previous: Optional[Dict[str, Any]], current: Dict[str, Any]):
+        if previous is None:
+            return
+        for key in previous.keys() | current.keys():
+            old_value, new_value = previous.get(key), current.get(key)
+            if old_value != new_value:
+                self._notify(key, old_value, new_value)
+
+    def _notify(self, key: str, old_value: Any, new_value: Any):
+        with self._lock:
+            callbacks = list(self._subscribers.get(key, ())) + list(self._subscribers.get(None, ()))
+        for callback in callbacks:
+            try:
+                callback(key, old_value, new_value)
+            except Exception as e:
+                logger.error(f"설정 변경 알림 처리 실패 ({key}): {e}")
+
+
+# 전역 설정 서비스 인스턴스
+_config_service: Optional[ConfigService] = None
+
+
+def get_config_service() -> ConfigService:
+    """설정 서비스 인스턴스 반환 (최초 호출 시 전역 데이터베이스 매니저로 생성)"""
+    global _config_service
+
+    if _config_service is None:
+        _config_service = ConfigService()
+
+    return _config_service
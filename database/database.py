@@ -7,9 +7,11 @@ import os
 import logging
 from typing import Generator, Optional
 from contextlib import contextmanager
-from sqlalchemy import create_engine, Engine, text
+from sqlalchemy import create_engine, Connection, Engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
+from config import settings
+from utils.metrics import timer
 from .models import Base
 
 logger = logging.getLogger(__name__)
@@ -53,21 +55,40 @@ class DatabaseManager:
     def _initialize_engine(self):
         """데이터베이스 엔진 초기화"""
         try:
-            if self.database_url.startswith('sqlite'):
-                # SQLite 설정
+            if self._is_sqlite_memory():
+                # 인메모리 SQLite는 단일 연결을 공유해야 데이터가 유지됨
                 self.engine = create_engine(
                     self.database_url,
                     poolclass=StaticPool,
                     connect_args={
                         "check_same_thread": False,
-                        "timeout": 20
+                        "timeout": settings.SQLITE_BUSY_TIMEOUT / 1000
                     },
                     echo=os.getenv('DB_ECHO', 'false').lower() == 'true'
                 )
+                event.listen(self.engine, 'connect', self._apply_sqlite_pragmas)
+            elif self.database_url.startswith('sqlite'):
+                # 파일 SQLite: WAL 모드에서 스레드별 연결을 풀링하여 읽기/쓰기 동시 처리
+                self.engine = create_engine(
+                    self.database_url,
+                    poolclass=QueuePool,
+                    pool_size=settings.DB_POOL_SIZE,
+                    max_overflow=settings.DB_MAX_OVERFLOW,
+                    pool_timeout=settings.DB_POOL_TIMEOUT,
+                    connect_args={
+                        "check_same_thread": False,
+                        "timeout": settings.SQLITE_BUSY_TIMEOUT / 1000
+                    },
+                    echo=os.getenv('DB_ECHO', 'false').lower() == 'true'
+                )
+                event.listen(self.engine, 'connect', self._apply_sqlite_pragmas)
             else:
                 # MySQL 설정
                 self.engine = create_engine(
                     self.database_url,
+                    pool_size=settings.DB_POOL_SIZE,
+                    max_overflow=settings.DB_MAX_OVERFLOW,
+                    pool_timeout=settings.DB_POOL_TIMEOUT,
                     pool_pre_ping=True,
                     pool_recycle=300,
                     echo=os.getenv('DB_ECHO', 'false').lower() == 'true'
@@ -85,6 +106,20 @@ class DatabaseManager:
             logger.error(f"데이터베이스 엔진 초기화 실패: {e}")
             raise
 
+    def _is_sqlite_memory(self) -> bool:
+        """인메모리 SQLite URL 여부"""
+        return self.database_url in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in self.database_url
+
+    @staticmethod
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        """새 SQLite 연결에 PRAGMA 설정 적용"""
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in settings.get_sqlite_pragmas().items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
     def create_tables(self):
         """데이터베이스 테이블 생성"""
         try:
@@ -94,6 +129,18 @@ class DatabaseManager:
             logger.error(f"테이블 생성 실패: {e}")
             raise
 
+    def migrate(self):
+        """번호 붙은 마이그레이션 적용 및 누락 인덱스 점검"""
+        from .migrator import migrate
+
+        try:
+            applied = migrate(self.engine)
+            if applied:
+                logger.info(f"스키마 마이그레이션 {len(applied)}건 적용 완료")
+        except Exception as e:
+            logger.error(f"스키마 마이그레이션 실패: {e}")
+            raise
+
     def drop_tables(self):
         """데이터베이스 테이블 삭제"""
         try:
@@ -112,15 +159,33 @@ class DatabaseManager:
     @contextmanager
     def session_scope(self) -> Generator[Session, None, None]:
         """세션 컨텍스트 매니저"""
-        session = self.get_session()
-        try:
-            yield session
-            session.commit()
-        except Exception:
-            session.rollback()
-            raise
-        finally:
-            session.close()
+        with timer('db.session_scope', module='database'):
+            session = self.get_session()
+            try:
+                yield session
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+    @contextmanager
+    def write_transaction(self) -> Generator[Connection, None, None]:
+        """쓰기 잠금을 먼저 확보하는 트랜잭션 (SQLite는 BEGIN IMMEDIATE)
+
+        읽은 뒤 갱신하는 작업에서 SQLite의 지연 잠금 승격 실패(database is locked)를 피한다.
+        MySQL에서는 호출하는 쪽에서 SELECT ... FOR UPDATE로 행을 잠가야 한다.
+        """
+        with self.engine.connect() as connection:
+            if self.engine.dialect.name == 'sqlite':
+                connection.exec_driver_sql('BEGIN IMMEDIATE')
+            try:
+                yield connection
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
 
     def test_connection(self) -> bool:
         """데이터베이스 연결 테스트"""
@@ -159,6 +224,7 @@ def init_database(database_url: Optional[str] = None) -> DatabaseManager:
     if _db_manager is None:
         _db_manager = DatabaseManager(database_url)
         _db_manager.create_tables()
+        _db_manager.migrate()
 
     return _db_manager
 
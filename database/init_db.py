@@ -7,6 +7,7 @@ CarePill 데이터베이스 초기화 스크립트
 import os
 import sys
 import logging
+import argparse
 from datetime import datetime, date
 from pathlib import Path
 
@@ -187,8 +188,24 @@ def create_sample_data(db_manager: DatabaseManager):
         logger.info("샘플 데이터 생성 완료")
 
 
+def create_synthetic_data(db_manager: DatabaseManager, scale: float, seed: int = 42):
+    """용량 계획/부하 테스트용 합성 데이터 생성 (scale 1.0 = 약품 10만, 재고 100만, 처방 50만)"""
+    from database.synthetic import DatasetSize, SyntheticDataGenerator
+
+    logger.info(f"합성 데이터 생성 시작 (규모 {scale}, 시드 {seed})...")
+    result = SyntheticDataGenerator(db_manager.engine, seed=seed).generate(DatasetSize().scaled(scale))
+    for table, count in result.counts.items():
+        logger.info(f"  {table}: {count:,}건")
+
+
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="CarePill 데이터베이스 초기화")
+    parser.add_argument('--synthetic', type=float, metavar='SCALE',
+                        help="샘플 데이터 대신 지정 규모의 합성 데이터 생성 (예: 0.01)")
+    parser.add_argument('--seed', type=int, default=42, help="합성 데이터 난수 시드")
+    args = parser.parse_args()
+
     try:
         # 환경 변수 설정 (개발 환경)
         os.environ.setdefault('DB_TYPE', 'sqlite')
@@ -211,7 +228,10 @@ def main():
         logger.info("데이터베이스 테이블 생성 완료")
 
         # 샘플 데이터 생성 (자동 생성)
-        create_sample_data(db_manager)
+        if args.synthetic:
+            create_synthetic_data(db_manager, args.synthetic, args.seed)
+        else:
+            create_sample_data(db_manager)
 
         logger.info("데이터베이스 초기화 완료!")
 
@@ -0,0 +1,322 @@
+"""
+CarePill 부하 테스트
+합성 데이터 위에서 조제/DUR 점검/OCR 점유/이력 조회 등 혼합 작업을 여러 작업 스레드로 재생하고
+작업별 처리량과 지연 시간 백분위수(p50/p95/p99)를 보고한다.
+
+사용법:
+    python -m database.load_test                                 # 임시 SQLite DB, 축소 규모, 8개 스레드 30초
+    python -m database.load_test --workers 16 --duration 60 --scale 0.1
+    python -m database.load_test --database mysql+mysqlconnector://... --workers 32
+"""
+
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import func, select, update
+
+# 스크립트로 직접 실행할 때를 위해 프로젝트 루트를 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.database import DatabaseManager  # noqa: E402
+from database.models import (  # noqa: E402
+    InventoryItem, Medication, OCRResult, Patient, Prescription, PrescriptionItem, YOLODetection
+)
+from database.query_plans import HOT_QUERIES, QuerySample  # noqa: E402
+from database.synthetic import DOSAGES, HOSPITALS, PHARMACISTS  # noqa: E402
+from utils.metrics import MetricsRegistry  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+class Operation(NamedTuple):
+    """부하 작업"""
+    name: str
+    weight: int                                         # 혼합 비율 가중치
+    run: Callable[['LoadDriver', random.Random], None]
+
+
+class LoadReport(NamedTuple):
+    """부하 테스트 결과"""
+    workers: int
+    elapsed: float
+    stats: Dict[str, Dict[str, float]]                  # 작업별 MetricsRegistry.snapshot()
+
+    @property
+    def total(self) -> int:
+        return sum(int(stats['count']) for stats in self.stats.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(int(stats['errors']) for stats in self.stats.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+
+# --- 작업 (실제 모듈 호출 경로와 같은 코드를 사용) ------------------------
+
+_HOT_QUERIES = {query.name: query for query in HOT_QUERIES}
+
+
+def _read(name: str) -> Callable[['LoadDriver', random.Random], None]:
+    """query_plans의 핫 쿼리를 임의 파라미터로 실행하는 읽기 작업"""
+    query = _HOT_QUERIES[name]
+
+    def run(driver: 'LoadDriver', rng: random.Random):
+        with driver.db_manager.engine.connect() as connection:
+            connection.execute(query.build(driver.sample(rng))).all()
+
+    return run
+
+
+def _register_prescription(driver: 'LoadDriver', rng: random.Random):
+    """처방전 접수 (처방전 + 항목 INSERT) 후 조제 대기열에 추가"""
+    today = driver.today
+    with driver.db_manager.engine.begin() as connection:
+        prescription_id = connection.execute(Prescription.__table__.insert().values(
+            patient_id=rng.choice(driver.patient_ids),
+            prescription_number=f"LT{today:%Y%m%d}-{threading.get_ident() % 10000:04d}-{rng.getrandbits(32):08x}",
+            doctor_name='부하테스트',
+            hospital_name=rng.choice(HOSPITALS),
+            prescribed_date=today,
+            status='pending',
+        )).inserted_primary_key[0]
+        connection.execute(PrescriptionItem.__table__.insert(), [
+            {
+                'prescription_id': prescription_id,
+                'medication_id': medication_id,
+                'quantity': rng.randrange(3, 30),
+                'dosage': rng.choice(DOSAGES),
+                'duration_days': rng.choice((3, 5, 7)),
+            }
+            for medication_id in rng.sample(driver.medication_ids, min(len(driver.medication_ids), rng.randrange(1, 4)))
+        ])
+    driver.pending_prescriptions.append(prescription_id)
+
+
+def _dispense(driver: 'LoadDriver', rng: random.Random):
+    """대기 중인 처방전 FEFO 조제 (대기열이 비면 새로 접수)"""
+    try:
+        prescription_id = driver.pending_prescriptions.popleft()
+    except IndexError:
+        _register_prescription(driver, rng)
+        prescription_id = driver.pending_prescriptions.popleft()
+    driver.allocator.dispense_prescription(prescription_id, rng.choice(PHARMACISTS), allow_partial=True,
+                                           today=driver.today)
+
+
+def _dur_check(driver: 'LoadDriver', rng: random.Random):
+    """환자의 복용 중 처방 포함 DUR 점검"""
+    with driver.db_manager.session_scope() as session:
+        prescription = session.get(Prescription, rng.choice(driver.prescription_ids))
+        if prescription is not None:
+            driver.dur_index.check_prescription(session, prescription, today=driver.today)
+
+
+def _ocr_claim(driver: 'LoadDriver', rng: random.Random):
+    """OCR 작업 등록 후 점유하고 완료 처리 (OCR 엔진 호출은 제외)"""
+    hash_source = rng.choice(driver.image_hashes)
+    driver.ocr_pipeline.submit_image('uploads/images/load_test.jpg', hash_source)
+    jobs = driver.ocr_pipeline.claim_jobs()
+    if jobs:
+        with driver.db_manager.engine.begin() as connection:
+            connection.execute(
+                update(OCRResult)
+                .where(OCRResult.id.in_([job['id'] for job in jobs]))
+                .values(status='completed', extracted_text='처방전 텍스트', confidence_score=0.9,
+                        processed_at=datetime.utcnow())
+            )
+
+
+DEFAULT_OPERATIONS: List[Operation] = [
+    Operation('register_prescription', 10, _register_prescription),
+    Operation('dispense', 10, _dispense),
+    Operation('dur_check', 15, _dur_check),
+    Operation('patient_history', 20, _read('patient_history')),
+    Operation('fefo_batches', 15, _read('fefo_batches')),
+    Operation('image_hash_lookup', 10, _read('image_hash_lookup')),
+    Operation('yolo_hash_lookup', 5, _read('yolo_hash_lookup')),
+    Operation('expiry_window', 5, _read('expiry_window')),
+    Operation('ocr_claim', 10, _ocr_claim),
+]
+
+
+class LoadDriver:
+    """혼합 작업 부하 생성기
+
+    작업마다 가중치 비율로 무작위 선택하여 workers개 스레드가 동시에 실행한다. 스레드별 난수 생성기는
+    seed에서 파생되므로 같은 seed면 스레드마다 같은 작업 순서를 재생한다 (실제 인터리빙은 스케줄링에
+    따라 달라짐). 조회 파라미터는 시작 시 한 번 추출한 실제 ID/해시 목록에서 고른다.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, workers: int = 8, seed: int = 42,
+                 operations: Optional[List[Operation]] = None, today: Optional[date] = None):
+        """
+        Args:
+            db_manager: 데이터베이스 매니저 (합성 데이터가 적재된 DB)
+            workers: 동시 작업 스레드 수
+            seed: 난수 시드
+            operations: 실행할 작업 목록 (기본값: DEFAULT_OPERATIONS)
+            today: 조제/DUR 판단 기준일
+        """
+        from modules.dur.engine import DURIndex
+        from modules.inventory.dispensing import DispensingAllocator
+        from modules.ocr.pipeline import OCRPipeline
+
+        self.db_manager = db_manager
+        self.workers = workers
+        self.seed = seed
+        self.operations = operations or DEFAULT_OPERATIONS
+        self.today = today or date.today()
+
+        self.allocator = DispensingAllocator(db_manager)
+        self.ocr_pipeline = OCRPipeline(db_manager, max_workers=1, batch_size=4)
+        self.dur_index = DURIndex()
+        self.pending_prescriptions: Deque[int] = deque()
+        self._load_parameters()
+
+        with db_manager.session_scope() as session:
+            self.dur_index.rebuild(session)
+
+    def _load_parameters(self, limit: int = 10000):
+        """조회 파라미터 후보 추출"""
+        with self.db_manager.engine.connect() as connection:
+            self.medication_ids = list(connection.scalars(
+                select(InventoryItem.medication_id).distinct().where(InventoryItem.quantity > 0).limit(limit)
+            )) or list(connection.scalars(select(Medication.id).limit(limit)))
+            self.patient_ids = list(connection.scalars(select(Patient.id).limit(limit)))
+            self.prescription_ids = list(connection.scalars(
+                select(Prescription.id).order_by(Prescription.id.desc()).limit(limit)
+            ))
+            self.image_hashes = list(connection.scalars(
+                select(OCRResult.image_hash).where(OCRResult.image_hash.isnot(None)).limit(limit)
+            )) + list(connection.scalars(
+                select(YOLODetection.image_hash).where(YOLODetection.image_hash.isnot(None)).limit(limit)
+            ))
+            self.pending_prescriptions.extend(connection.scalars(
+                select(Prescription.id).where(Prescription.status == 'pending').order_by(Prescription.id)
+            ))
+
+        if not (self.medication_ids and self.patient_ids and self.prescription_ids and self.image_hashes):
+            raise RuntimeError("부하 테스트용 데이터가 없습니다. 합성 데이터를 먼저 생성하세요.")
+
+    def sample(self, rng: random.Random) -> QuerySample:
+        """핫 쿼리용 임의 파라미터"""
+        return QuerySample(
+            medication_ids=rng.sample(self.medication_ids, min(len(self.medication_ids), rng.randrange(1, 5))),
+            patient_id=rng.choice(self.patient_ids),
+            prescription_id=rng.choice(self.prescription_ids),
+            image_hash=rng.choice(self.image_hashes),
+            today=self.today,
+        )
+
+    def run(self, duration: float = 30.0, iterations: Optional[int] = None) -> LoadReport:
+        """
+        부하 실행
+
+        Args:
+            duration: 실행 시간(초)
+            iterations: 스레드당 작업 수 (지정하면 duration 대신 사용)
+
+        Returns:
+            LoadReport: 작업별 처리 건수와 지연 시간 통계
+        """
+        # 전체 표본으로 백분위수를 계산하고 느린 작업 로그는 남기지 않음
+        metrics = MetricsRegistry(window=1_000_000, slow_threshold=float('inf'))
+        deadline = time.perf_counter() + duration
+        names = [operation.name for operation in self.operations]
+        weights = [operation.weight for operation in self.operations]
+        by_name = {operation.name: operation for operation in self.operations}
+
+        def worker(index: int):
+            rng = random.Random(self.seed * 1000 + index)
+            done = 0
+            while (done < iterations) if iterations is not None else (time.perf_counter() < deadline):
+                operation = by_name[rng.choices(names, weights)[0]]
+                started = time.perf_counter()
+                error = False
+                try:
+                    operation.run(self, rng)
+                except Exception as e:
+                    error = True
+                    logger.debug(f"부하 작업 실패 ({operation.name}): {e}")
+                metrics.observe(operation.name, time.perf_counter() - started, module='load_test', error=error)
+                done += 1
+
+        threads = [threading.Thread(target=worker, args=(index,), name=f"load-{index}", daemon=True)
+                   for index in range(self.workers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        report = LoadReport(self.workers, time.perf_counter() - started, metrics.snapshot())
+        logger.info(f"부하 테스트 완료: {report.total}건, {report.throughput:.1f}건/초, 오류 {report.errors}건")
+        return report
+
+
+def format_report(report: LoadReport) -> str:
+    """작업별 처리량/지연 시간 표"""
+    lines = [
+        f"작업 스레드 {report.workers}개, {report.elapsed:.1f}초, 전체 {report.total}건 "
+        f"({report.throughput:.1f}건/초), 오류 {report.errors}건",
+        "",
+        f"{'작업':<24}{'건수':>8}{'건/초':>9}{'오류':>6}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}",
+    ]
+    for name, stats in report.stats.items():
+        lines.append(
+            f"{name:<24}{int(stats['count']):>8}{stats['count'] / report.elapsed:>9.1f}{int(stats['errors']):>6}"
+            f"{stats['p50'] * 1000:>10.2f}{stats['p95'] * 1000:>10.2f}{stats['p99'] * 1000:>10.2f}"
+            f"{stats['max'] * 1000:>10.2f}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """명령행 실행 (오류가 있으면 종료 코드 1)"""
+    from database.synthetic import DatasetSize, SyntheticDataGenerator
+
+    parser = argparse.ArgumentParser(description="CarePill 혼합 작업 부하 테스트")
+    parser.add_argument('--database', help="데이터베이스 URL (기본값: 임시 SQLite 파일)")
+    parser.add_argument('--scale', type=float, default=0.05,
+                        help="비어 있는 DB에 생성할 데이터 규모 배율 (1.0 = 약품 10만, 재고 100만, 처방 50만)")
+    parser.add_argument('--seed', type=int, default=42, help="난수 시드")
+    parser.add_argument('--workers', type=int, default=8, help="동시 작업 스레드 수")
+    parser.add_argument('--duration', type=float, default=30.0, help="실행 시간(초)")
+    parser.add_argument('--iterations', type=int, help="스레드당 작업 수 (지정하면 --duration 무시)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # 작업마다 남는 조제 완료 로그는 생략
+    logging.getLogger('modules').setLevel(logging.WARNING)
+
+    database_url = args.database or f"sqlite:///{Path(tempfile.mkdtemp()) / 'carepill_load.db'}"
+    db_manager = DatabaseManager(database_url)
+    db_manager.create_tables()
+    db_manager.migrate()
+
+    with db_manager.engine.connect() as connection:
+        seeded = connection.scalar(select(func.count()).select_from(select(Medication.id).limit(1).subquery()))
+    if not seeded:
+        SyntheticDataGenerator(db_manager.engine, seed=args.seed).generate(DatasetSize().scaled(args.scale))
+
+    report = LoadDriver(db_manager, workers=args.workers, seed=args.seed).run(args.duration, args.iterations)
+    print(f"\n부하 테스트 결과 ({db_manager.engine.dialect.name})")
+    print(format_report(report))
+    db_manager.close()
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
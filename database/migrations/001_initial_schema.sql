@@ -182,40 +182,3 @@ CREATE INDEX IF NOT EXISTS idx_dur_interactions_medication_id ON dur_interaction
 CREATE INDEX IF NOT EXISTS idx_ocr_results_status ON ocr_results(status);
 CREATE INDEX IF NOT EXISTS idx_system_logs_created_at ON system_logs(created_at);
 CREATE INDEX IF NOT EXISTS idx_configurations_key ON configurations(key);
-
--- 트리거 생성 (updated_at 자동 업데이트)
-CREATE TRIGGER IF NOT EXISTS update_medications_timestamp
-    AFTER UPDATE ON medications
-BEGIN
-    UPDATE medications SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
-END;
-
-CREATE TRIGGER IF NOT EXISTS update_inventory_items_timestamp
-    AFTER UPDATE ON inventory_items
-BEGIN
-    UPDATE inventory_items SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
-END;
-
-CREATE TRIGGER IF NOT EXISTS update_patients_timestamp
-    AFTER UPDATE ON patients
-BEGIN
-    UPDATE patients SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
-END;
-
-CREATE TRIGGER IF NOT EXISTS update_prescriptions_timestamp
-    AFTER UPDATE ON prescriptions
-BEGIN
-    UPDATE prescriptions SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
-END;
-
-CREATE TRIGGER IF NOT EXISTS update_dur_interactions_timestamp
-    AFTER UPDATE ON dur_interactions
-BEGIN
-    UPDATE dur_interactions SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
-END;
-
-CREATE TRIGGER IF NOT EXISTS update_configurations_timestamp
-    AFTER UPDATE ON configurations
-BEGIN
-    UPDATE configurations SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
-END;
\ No newline at end of file
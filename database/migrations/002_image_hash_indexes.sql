@@ -0,0 +1,5 @@
+-- CarePill 이미지 해시 인덱스
+-- OCR/YOLO 결과 중복 조회 (image_hash 일치 및 지각 해시 접두어 범위 조회)
+
+CREATE INDEX IF NOT EXISTS idx_ocr_results_image_hash_status ON ocr_results(image_hash, status);
+CREATE INDEX IF NOT EXISTS idx_yolo_detections_image_hash ON yolo_detections(image_hash);
@@ -0,0 +1,61 @@
+"""
+CarePill YOLO 검출 결과 압축 저장
+검출 결과 BLOB 컬럼 추가 및 기존 JSON 컬럼 NULL 허용 (SQLite는 테이블 재생성)
+기존 행의 JSON → BLOB 변환은 006_pack_yolo_detections에서 수행
+
+테이블 재생성은 반복 실행하면 안 되므로 detections 컬럼이 이미 있으면(ORM으로 생성된 DB 포함) 건너뛴다.
+"""
+
+from sqlalchemy import inspect
+
+SQLITE_REBUILD = """
+CREATE TABLE yolo_detections_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    image_path VARCHAR(500) NOT NULL,
+    image_hash VARCHAR(64),
+    detections BLOB,
+    detection_count INTEGER DEFAULT 0,
+    detected_objects TEXT,
+    confidence_scores TEXT,
+    bounding_boxes TEXT,
+    model_version VARCHAR(50) NOT NULL,
+    processing_time REAL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO yolo_detections_new (
+    id, image_path, image_hash, detected_objects, confidence_scores, bounding_boxes,
+    model_version, processing_time, created_at
+)
+SELECT
+    id, image_path, image_hash, detected_objects, confidence_scores, bounding_boxes,
+    model_version, processing_time, created_at
+FROM yolo_detections;
+
+DROP TABLE yolo_detections;
+ALTER TABLE yolo_detections_new RENAME TO yolo_detections;
+
+CREATE INDEX IF NOT EXISTS idx_yolo_detections_image_hash ON yolo_detections(image_hash);
+"""
+
+MYSQL_ALTER = """
+ALTER TABLE yolo_detections
+    ADD COLUMN detections LONGBLOB NULL,
+    ADD COLUMN detection_count INTEGER DEFAULT 0,
+    MODIFY detected_objects JSON NULL,
+    MODIFY confidence_scores JSON NULL,
+    MODIFY bounding_boxes JSON NULL
+"""
+
+
+def upgrade(engine):
+    columns = {column['name'] for column in inspect(engine).get_columns('yolo_detections')}
+    if 'detections' in columns:
+        return
+
+    if engine.dialect.name == 'sqlite':
+        from database.migrator import execute_sqlite_script
+        execute_sqlite_script(engine, SQLITE_REBUILD)
+    else:
+        with engine.begin() as connection:
+            connection.exec_driver_sql(MYSQL_ALTER)
@@ -0,0 +1,15 @@
+-- CarePill DUR 상호작용 고유 인덱스
+-- 식약처 DUR 데이터 일괄 반영(INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE)의 충돌 키
+-- 같은 (약품, 상호작용 약품, 유형) 조합이 이미 중복 저장되어 있으면 가장 최근 행만 남김
+
+DELETE FROM dur_interactions
+WHERE id NOT IN (
+    SELECT keep_id FROM (
+        SELECT MAX(id) AS keep_id
+        FROM dur_interactions
+        GROUP BY medication_id, interacting_medication, interaction_type
+    ) AS latest
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_dur_interactions_pair
+    ON dur_interactions(medication_id, interacting_medication, interaction_type);
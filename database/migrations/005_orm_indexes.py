@@ -0,0 +1,13 @@
+"""
+CarePill ORM 인덱스 생성
+models.py에 선언된 인덱스 중 DB에 없는 것을 생성 (001은 SQLite 전용이므로 MySQL 및
+create_all로만 생성된 기존 DB의 인덱스를 맞춤)
+"""
+
+from database.models import Base
+
+
+def upgrade(engine):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
@@ -0,0 +1,9 @@
+"""
+CarePill YOLO 검출 결과 JSON → BLOB 변환
+003에서 추가한 detections 컬럼으로 기존 JSON 검출 결과를 옮김 (변환되지 않은 행만 처리하므로 재실행 가능)
+"""
+
+
+def upgrade(engine):
+    from modules.yolo.storage import migrate_json_detections
+    migrate_json_detections(engine)
@@ -0,0 +1,37 @@
+"""
+CarePill 핵심 쿼리 인덱스
+database.query_plans 점검에서 임시 B-tree 정렬/전체 스캔으로 확인된 쿼리용 복합 인덱스 생성 및
+복합 인덱스의 앞부분과 겹치는 단일 컬럼 인덱스 제거
+"""
+
+from sqlalchemy import inspect
+
+from database.models import DURInteraction, InventoryItem, Prescription
+
+CREATED = {
+    InventoryItem: 'idx_inventory_medication_expiry',
+    Prescription: 'idx_prescriptions_patient_date',
+    DURInteraction: 'idx_dur_interactions_updated_at',
+}
+
+REPLACED = {
+    'inventory_items': 'idx_inventory_medication_id',
+    'prescriptions': 'idx_prescriptions_patient_id',
+}
+
+
+def upgrade(engine):
+    for model, name in CREATED.items():
+        for index in model.__table__.indexes:
+            if index.name == name:
+                index.create(engine, checkfirst=True)
+
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table, name in REPLACED.items():
+            if name not in {index['name'] for index in inspector.get_indexes(table)}:
+                continue
+            if engine.dialect.name == 'sqlite':
+                connection.exec_driver_sql(f"DROP INDEX {name}")
+            else:
+                connection.exec_driver_sql(f"DROP INDEX {name} ON {table}")
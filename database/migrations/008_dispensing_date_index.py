@@ -0,0 +1,12 @@
+"""
+CarePill 조제 시간 인덱스
+오늘 조제 건수 통계를 전체 스캔 없이 범위 조회로 세도록 dispensing_records.dispensed_at 인덱스 생성
+"""
+
+from database.models import DispensingRecord
+
+
+def upgrade(engine):
+    for index in DispensingRecord.__table__.indexes:
+        if index.name == 'idx_dispensing_records_dispensed_at':
+            index.create(engine, checkfirst=True)
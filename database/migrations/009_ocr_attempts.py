@@ -0,0 +1,14 @@
+"""
+CarePill OCR 작업 시도 횟수
+작업 프로세스 비정상 종료 후 재시도에 한도를 두도록 ocr_results.attempts 컬럼 추가
+(ORM으로 이미 생성된 DB는 건너뜀)
+"""
+
+from sqlalchemy import inspect
+
+
+def upgrade(engine):
+    if 'attempts' in {column['name'] for column in inspect(engine).get_columns('ocr_results')}:
+        return
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE ocr_results ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
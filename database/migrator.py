@@ -0,0 +1,225 @@
+"""
+CarePill 스키마 마이그레이션
+database/migrations의 번호 붙은 SQL/Python 마이그레이션을 순서대로 적용하고 schema_version에 기록
+"""
+
+import importlib.util
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import Engine, UniqueConstraint, inspect, select, text
+
+from .models import Base, SchemaVersion
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / 'migrations'
+
+# 001_initial_schema.sql (SQLite), 004_xxx.mysql.sql (MySQL 전용), 005_xxx.py (모든 DB)
+_MIGRATION_FILE = re.compile(r'^(\d+)_([\w\-]+?)(?:\.(sqlite|mysql))?\.(sql|py)$')
+
+
+class Migration(NamedTuple):
+    """마이그레이션 파일"""
+    version: int
+    name: str
+    path: Path
+    kind: str                   # 'sql' | 'py'
+    dialect: Optional[str]      # SQL 파일의 대상 DB (확장자 앞 접미사가 없으면 SQLite)
+
+
+class MissingIndex(NamedTuple):
+    """DB에 없는 ORM 인덱스"""
+    table: str
+    name: str
+    columns: Tuple[str, ...]
+    unique: bool
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """마이그레이션 파일 목록 (번호순)"""
+    migrations = []
+    for path in directory.iterdir():
+        match = _MIGRATION_FILE.match(path.name)
+        if not match:
+            continue
+        version, name, dialect, kind = match.groups()
+        if kind == 'sql':
+            # 기존 SQL 마이그레이션은 SQLite 문법으로 작성되어 있음
+            dialect = dialect or 'sqlite'
+        migrations.append(Migration(int(version), name, path, kind, dialect))
+
+    migrations.sort(key=lambda m: (m.version, m.kind != 'py'))
+    return migrations
+
+
+def execute_sqlite_script(engine: Engine, script: str):
+    """여러 문장 SQL 스크립트를 하나의 트랜잭션으로 실행"""
+    with engine.connect() as connection:
+        raw = connection.connection.driver_connection
+        try:
+            raw.executescript(f"BEGIN;\n{script}\nCOMMIT;")
+        except Exception:
+            if raw.in_transaction:
+                raw.rollback()
+            raise
+
+
+def _split_statements(script: str) -> List[str]:
+    """줄 끝의 세미콜론 기준으로 문장 분리 (MySQL 스크립트용)"""
+    lines = [line for line in script.splitlines() if not line.strip().startswith('--')]
+    return [statement.strip() for statement in re.split(r';\s*$', '\n'.join(lines), flags=re.MULTILINE)
+            if statement.strip()]
+
+
+class MigrationRunner:
+    """마이그레이션 실행기
+
+    적용된 번호는 schema_version에 기록하고 시작할 때마다 기록되지 않은 번호만 실행한다.
+    같은 번호에 DB별 SQL 파일과 Python 파일이 함께 있으면 현재 DB에 맞는 파일 하나만 실행하며,
+    현재 DB용 파일이 없는 번호는 실행 없이 적용된 것으로 기록한다. 모든 마이그레이션은 ORM으로
+    이미 생성된 테이블에 다시 실행되어도 안전하도록 작성한다.
+    """
+
+    def __init__(self, engine: Engine, directory: Path = MIGRATIONS_DIR):
+        self.engine = engine
+        self.directory = directory
+        self.dialect = 'mysql' if engine.dialect.name in ('mysql', 'mariadb') else engine.dialect.name
+
+    def applied_versions(self) -> Set[int]:
+        """적용된 마이그레이션 번호"""
+        SchemaVersion.__table__.create(self.engine, checkfirst=True)
+        with self.engine.connect() as connection:
+            return set(connection.scalars(select(SchemaVersion.version)))
+
+    def pending(self) -> List[Migration]:
+        """적용할 마이그레이션 (번호당 현재 DB에 맞는 파일 하나, 해당 파일이 없으면 None 경로)"""
+        applied = self.applied_versions()
+        by_version: Dict[int, List[Migration]] = {}
+        for migration in discover_migrations(self.directory):
+            if migration.version not in applied:
+                by_version.setdefault(migration.version, []).append(migration)
+
+        pending = []
+        for version in sorted(by_version):
+            candidates = by_version[version]
+            chosen = next((m for m in candidates if m.kind == 'sql' and m.dialect == self.dialect), None) \
+                or next((m for m in candidates if m.kind == 'py'), None)
+            pending.append(chosen or candidates[0]._replace(path=None))
+        return pending
+
+    def upgrade(self) -> List[int]:
+        """
+        적용되지 않은 마이그레이션 실행
+
+        Returns:
+            List[int]: 이번에 기록된 마이그레이션 번호
+        """
+        recorded = []
+        for migration in self.pending():
+            started = time.perf_counter()
+            if migration.path is None:
+                logger.info(f"마이그레이션 {migration.version:03d}_{migration.name}: "
+                            f"{self.dialect}용 파일이 없어 건너뜀")
+            else:
+                self._apply(migration)
+                logger.info(f"마이그레이션 {migration.path.name} 적용 완료")
+
+            with self.engine.begin() as connection:
+                connection.execute(SchemaVersion.__table__.insert().values(
+                    version=migration.version,
+                    name=migration.path.name if migration.path else migration.name,
+                    execution_time=time.perf_counter() - started,
+                ))
+            recorded.append(migration.version)
+        return recorded
+
+    def _apply(self, migration: Migration):
+        if migration.kind == 'py':
+            spec = importlib.util.spec_from_file_location(f"carepill_migration_{migration.version:03d}",
+                                                          migration.path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.upgrade(self.engine)
+            return
+
+        script = migration.path.read_text(encoding='utf-8')
+        if self.dialect == 'sqlite':
+            execute_sqlite_script(self.engine, script)
+        else:
+            with self.engine.begin() as connection:
+                for statement in _split_statements(script):
+                    connection.exec_driver_sql(statement)
+
+
+def _live_indexes(engine: Engine) -> Dict[str, List[Tuple[str, ...]]]:
+    """테이블별 DB 인덱스 컬럼 목록 (sqlite_master / information_schema 조회)"""
+    indexes: Dict[str, List[Tuple[str, ...]]] = {}
+    with engine.connect() as connection:
+        if engine.dialect.name == 'sqlite':
+            rows = connection.execute(text(
+                "SELECT tbl_name, name FROM sqlite_master WHERE type = 'index'"
+            )).all()
+            for table, name in rows:
+                columns = connection.exec_driver_sql(f'PRAGMA index_info("{name}")').all()
+                indexes.setdefault(table, []).append(tuple(row[2] for row in sorted(columns)))
+        else:
+            rows = connection.execute(text(
+                "SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX"
+            )).all()
+            grouped: Dict[Tuple[str, str], List[str]] = {}
+            for table, name, column in rows:
+                grouped.setdefault((table, name), []).append(column)
+            for (table, _), columns in grouped.items():
+                indexes.setdefault(table, []).append(tuple(columns))
+    return indexes
+
+
+def find_missing_indexes(engine: Engine) -> List[MissingIndex]:
+    """
+    ORM에 선언된 인덱스/고유 제약 중 DB에 없는 것 조회
+
+    이름이 아니라 컬럼으로 비교하므로, 같은 컬럼으로 시작하는 다른 이름의 인덱스가 있으면 있는 것으로
+    본다 (고유 인덱스는 컬럼 구성이 정확히 같아야 함).
+    """
+    live = _live_indexes(engine)
+    tables = set(inspect(engine).get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        expected = [(index.name, tuple(c.name for c in index.columns), bool(index.unique)) for index in table.indexes]
+        expected += [
+            (constraint.name or f"{table.name}_{'_'.join(c.name for c in constraint.columns)}_key",
+             tuple(c.name for c in constraint.columns), True)
+            for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint)
+        ]
+        existing = live.get(table.name, [])
+        for name, columns, unique in expected:
+            covered = any(
+                candidate == columns if unique else candidate[:len(columns)] == columns
+                for candidate in existing
+            )
+            if not covered:
+                missing.append(MissingIndex(table.name, name, columns, unique))
+    return missing
+
+
+def check_indexes(engine: Engine) -> List[MissingIndex]:
+    """시작 시 누락된 인덱스 경고"""
+    missing = find_missing_indexes(engine)
+    for index in missing:
+        logger.warning(f"인덱스 누락: {index.table}({', '.join(index.columns)}) - {index.name}")
+    return missing
+
+
+def migrate(engine: Engine) -> List[int]:
+    """마이그레이션 적용 후 인덱스 점검"""
+    applied = MigrationRunner(engine).upgrade()
+    check_indexes(engine)
+    return applied
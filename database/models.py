@@ -5,7 +5,7 @@ SQLAlchemy를 사용한 데이터베이스 스키마 정의
 
 from datetime import datetime, date
 from typing import Optional, List
-from sqlalchemy import Column, Integer, String, Text, DateTime, Date, Boolean, Float, ForeignKey, JSON, DECIMAL
+from sqlalchemy import Column, Integer, String, Text, DateTime, Date, Boolean, Float, ForeignKey, JSON, DECIMAL, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -15,6 +15,10 @@ Base = declarative_base()
 class Medication(Base):
     """약품 기본 정보"""
     __tablename__ = 'medications'
+    __table_args__ = (
+        Index('idx_medications_kfda_code', 'kfda_code'),
+        Index('idx_medications_name', 'name'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -54,6 +58,11 @@ class Medication(Base):
 class InventoryItem(Base):
     """재고 관리"""
     __tablename__ = 'inventory_items'
+    __table_args__ = (
+        Index('idx_inventory_expiry_date', 'expiry_date'),
+        # 조제 시 약품별 FEFO(유효기간 순) 조회
+        Index('idx_inventory_medication_expiry', 'medication_id', 'expiry_date'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     medication_id: Mapped[int] = mapped_column(Integer, ForeignKey('medications.id'), nullable=False)
@@ -112,6 +121,11 @@ class Patient(Base):
 class Prescription(Base):
     """처방전"""
     __tablename__ = 'prescriptions'
+    __table_args__ = (
+        # 환자별 처방 이력 (처방일 역순)
+        Index('idx_prescriptions_patient_date', 'patient_id', 'prescribed_date'),
+        Index('idx_prescriptions_number', 'prescription_number'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     patient_id: Mapped[int] = mapped_column(Integer, ForeignKey('patients.id'), nullable=False)
@@ -138,6 +152,10 @@ class Prescription(Base):
 class PrescriptionItem(Base):
     """처방전 항목"""
     __tablename__ = 'prescription_items'
+    __table_args__ = (
+        Index('idx_prescription_items_prescription_id', 'prescription_id'),
+        Index('idx_prescription_items_medication_id', 'medication_id'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     prescription_id: Mapped[int] = mapped_column(Integer, ForeignKey('prescriptions.id'), nullable=False)
@@ -161,6 +179,10 @@ class PrescriptionItem(Base):
 class DispensingRecord(Base):
     """조제 기록"""
     __tablename__ = 'dispensing_records'
+    __table_args__ = (
+        Index('idx_dispensing_records_prescription_item_id', 'prescription_item_id'),
+        Index('idx_dispensing_records_dispensed_at', 'dispensed_at'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     prescription_item_id: Mapped[int] = mapped_column(Integer, ForeignKey('prescription_items.id'), nullable=False)
@@ -179,6 +201,13 @@ class DispensingRecord(Base):
 class DURInteraction(Base):
     """DUR (Drug Utilization Review) 상호작용 데이터"""
     __tablename__ = 'dur_interactions'
+    __table_args__ = (
+        Index('idx_dur_interactions_medication_id', 'medication_id'),
+        # DUR 인덱스 증분 반영 (updated_at 워터마크)
+        Index('idx_dur_interactions_updated_at', 'updated_at'),
+        # 식약처 데이터 일괄 반영 시 upsert 충돌 키
+        Index('idx_dur_interactions_pair', 'medication_id', 'interacting_medication', 'interaction_type', unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     medication_id: Mapped[int] = mapped_column(Integer, ForeignKey('medications.id'), nullable=False)
@@ -207,6 +236,11 @@ class DURInteraction(Base):
 class OCRResult(Base):
     """OCR 처리 결과"""
     __tablename__ = 'ocr_results'
+    __table_args__ = (
+        Index('idx_ocr_results_status', 'status'),
+        # 완료된 결과만 해시로 조회 (status까지 포함해야 id 역순 정렬 없이 조회)
+        Index('idx_ocr_results_image_hash_status', 'image_hash', 'status'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -226,6 +260,7 @@ class OCRResult(Base):
     # 처리 상태
     status: Mapped[str] = mapped_column(String(20), default='pending', comment="처리 상태")
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True, comment="오류 메시지")
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="작업 점유 횟수")
 
     # 시스템 필드
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -235,6 +270,9 @@ class OCRResult(Base):
 class YOLODetection(Base):
     """YOLO 객체 인식 결과"""
     __tablename__ = 'yolo_detections'
+    __table_args__ = (
+        Index('idx_yolo_detections_image_hash', 'image_hash'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -242,10 +280,14 @@ class YOLODetection(Base):
     image_path: Mapped[str] = mapped_column(String(500), nullable=False, comment="이미지 파일 경로")
     image_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, comment="이미지 해시")
 
-    # 검출 결과
-    detected_objects: Mapped[str] = mapped_column(JSON, nullable=False, comment="검출된 객체 정보")
-    confidence_scores: Mapped[str] = mapped_column(JSON, nullable=False, comment="신뢰도 점수들")
-    bounding_boxes: Mapped[str] = mapped_column(JSON, nullable=False, comment="바운딩 박스 좌표")
+    # 검출 결과 (class_id int16, confidence float32, box int16×4 레코드 배열, modules.yolo.storage 참고)
+    detections: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, comment="압축된 검출 결과")
+    detection_count: Mapped[int] = mapped_column(Integer, default=0, comment="검출 객체 수")
+
+    # 이전 형식 검출 결과 (압축 형식으로 변환되면 비워짐)
+    detected_objects: Mapped[Optional[str]] = mapped_column(JSON, nullable=True, comment="검출된 객체 정보")
+    confidence_scores: Mapped[Optional[str]] = mapped_column(JSON, nullable=True, comment="신뢰도 점수들")
+    bounding_boxes: Mapped[Optional[str]] = mapped_column(JSON, nullable=True, comment="바운딩 박스 좌표")
 
     # 처리 정보
     model_version: Mapped[str] = mapped_column(String(50), nullable=False, comment="사용된 모델 버전")
@@ -258,6 +300,9 @@ class YOLODetection(Base):
 class SystemLog(Base):
     """시스템 로그"""
     __tablename__ = 'system_logs'
+    __table_args__ = (
+        Index('idx_system_logs_created_at', 'created_at'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -278,6 +323,9 @@ class SystemLog(Base):
 class Configuration(Base):
     """시스템 설정"""
     __tablename__ = 'configurations'
+    __table_args__ = (
+        Index('idx_configurations_key', 'key'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -291,4 +339,14 @@ class Configuration(Base):
     # 시스템 필드
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
\ No newline at end of file
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+
+class SchemaVersion(Base):
+    """적용된 스키마 마이그레이션"""
+    __tablename__ = 'schema_version'
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False, comment="마이그레이션 번호")
+    name: Mapped[str] = mapped_column(String(200), nullable=False, comment="마이그레이션 파일명")
+    applied_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    execution_time: Mapped[Optional[float]] = mapped_column(Float, nullable=True, comment="실행 시간(초)")
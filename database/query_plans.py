@@ -0,0 +1,343 @@
+"""
+CarePill 핵심 쿼리 실행 계획 점검
+등록된 핫 쿼리를 EXPLAIN QUERY PLAN(SQLite) / EXPLAIN(MySQL)으로 확인하여 전체 스캔이나 임시 B-tree
+정렬로 바뀐 쿼리를 찾는다. 스키마를 바꾼 뒤 인덱스 회귀를 잡기 위한 도구.
+
+사용법:
+    python -m database.query_plans                       # 임시 SQLite DB에 기본 규모로 생성 후 점검
+    python -m database.query_plans --scale 0.05          # 축소 규모
+    python -m database.query_plans --database mysql+mysqlconnector://...
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import Engine, func, select
+from sqlalchemy.sql import Executable
+
+# 스크립트로 직접 실행할 때를 위해 프로젝트 루트를 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.models import (  # noqa: E402
+    DURInteraction, InventoryItem, Medication, OCRResult, Prescription, PrescriptionItem, YOLODetection
+)
+from database.statistics import statistics_query  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+class QuerySample(NamedTuple):
+    """쿼리에 넣을 대표 파라미터 (실제 데이터에서 추출)"""
+    medication_ids: List[int]
+    patient_id: int
+    prescription_id: int
+    image_hash: str
+    today: date
+
+
+class HotQuery(NamedTuple):
+    """점검 대상 쿼리"""
+    name: str
+    description: str
+    build: Callable[[QuerySample], Executable]
+    allow_index_scan: bool = False      # 전체 집계처럼 커버링 인덱스 스캔이 불가피한 쿼리
+    known_issue: Optional[str] = None   # 알려진 문제 (위반이 있어도 실패로 집계하지 않음)
+
+
+class PlanCheck(NamedTuple):
+    """점검 결과"""
+    query: HotQuery
+    plan: List[str]
+    violations: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.violations) and self.query.known_issue is None
+
+
+# --- 핫 쿼리 목록 (호출하는 코드와 같은 형태로 유지) ----------------------
+
+def _fefo_batches(sample: QuerySample):
+    # modules.inventory.dispensing.DispensingAllocator._load_batches
+    return (
+        select(InventoryItem.id, InventoryItem.medication_id, InventoryItem.batch_number,
+               InventoryItem.expiry_date, InventoryItem.quantity)
+        .where(
+            InventoryItem.medication_id.in_(sample.medication_ids),
+            InventoryItem.is_active.is_(True),
+            InventoryItem.quantity > 0,
+            InventoryItem.expiry_date >= sample.today,
+        )
+        .order_by(InventoryItem.medication_id, InventoryItem.expiry_date, InventoryItem.id)
+    )
+
+
+def _prescription_items(sample: QuerySample):
+    # modules.inventory.dispensing.DispensingAllocator.dispense_prescription
+    return (
+        select(PrescriptionItem.id, PrescriptionItem.medication_id,
+               PrescriptionItem.quantity, PrescriptionItem.dispensed_quantity)
+        .where(PrescriptionItem.prescription_id == sample.prescription_id)
+        .order_by(PrescriptionItem.id)
+    )
+
+
+def _expiry_window(sample: QuerySample):
+    # modules.inventory.stock.StockTracker.scan
+    return (
+        select(InventoryItem.id, InventoryItem.medication_id, InventoryItem.quantity, InventoryItem.expiry_date)
+        .where(
+            InventoryItem.expiry_date >= sample.today,
+            InventoryItem.expiry_date <= sample.today + timedelta(days=30),
+            InventoryItem.is_active.is_(True),
+            InventoryItem.quantity > 0,
+        )
+        .order_by(InventoryItem.expiry_date)
+    )
+
+
+def _dur_by_medication(sample: QuerySample):
+    return (
+        select(DURInteraction.id, DURInteraction.interacting_medication, DURInteraction.severity_level)
+        .where(DURInteraction.medication_id.in_(sample.medication_ids), DURInteraction.is_active.is_(True))
+    )
+
+
+def _dur_refresh(sample: QuerySample):
+    # modules.dur.engine.DURIndex.refresh
+    return (
+        select(DURInteraction.id, DURInteraction.medication_id, DURInteraction.is_active, DURInteraction.updated_at)
+        .where(DURInteraction.updated_at >= datetime.combine(sample.today, datetime.min.time()))
+    )
+
+
+def _dur_active_prescriptions(sample: QuerySample):
+    # modules.dur.engine.DURIndex.check_prescription
+    return (
+        select(PrescriptionItem.prescription_id, PrescriptionItem.medication_id, PrescriptionItem.duration_days,
+               Prescription.prescribed_date, Medication.name, Medication.generic_name)
+        .join(Prescription, Prescription.id == PrescriptionItem.prescription_id)
+        .join(Medication, Medication.id == PrescriptionItem.medication_id)
+        .where(Prescription.patient_id == sample.patient_id, Prescription.status != 'cancelled')
+    )
+
+
+def _patient_history(sample: QuerySample):
+    return (
+        select(Prescription.id, Prescription.prescribed_date, Prescription.status,
+               PrescriptionItem.medication_id, PrescriptionItem.quantity, Medication.name)
+        .join(PrescriptionItem, PrescriptionItem.prescription_id == Prescription.id)
+        .join(Medication, Medication.id == PrescriptionItem.medication_id)
+        .where(Prescription.patient_id == sample.patient_id)
+        .order_by(Prescription.prescribed_date.desc(), Prescription.id.desc())
+        .limit(50)
+    )
+
+
+def _ocr_claim_pending(sample: QuerySample):
+    # modules.ocr.pipeline.OCRPipeline.claim_jobs
+    return (
+        select(OCRResult.id, OCRResult.image_path, OCRResult.image_hash)
+        .where(OCRResult.status == 'pending')
+        .order_by(OCRResult.id)
+        .limit(8)
+    )
+
+
+def _ocr_recover_stuck(sample: QuerySample):
+    # modules.ocr.pipeline.OCRPipeline.recover_stuck_jobs
+    return (
+        select(OCRResult.id)
+        .where(OCRResult.status == 'processing', OCRResult.processed_at < datetime.utcnow() - timedelta(minutes=5))
+    )
+
+
+def _image_hash_lookup(sample: QuerySample):
+    # modules.vision.image_hash.ImageResultCache._lookup_database
+    return (
+        select(OCRResult.__table__)
+        .where(OCRResult.image_hash == sample.image_hash, OCRResult.status == 'completed')
+        .order_by(OCRResult.id.desc())
+        .limit(1)
+    )
+
+
+def _image_hash_prefix(sample: QuerySample):
+    # modules.vision.image_hash.ImageResultCache._lookup_database (지각 해시 접두어 범위)
+    prefix = sample.image_hash[:16]
+    return (
+        select(OCRResult.__table__)
+        .where(OCRResult.image_hash >= prefix, OCRResult.image_hash < prefix + 'g', OCRResult.status == 'completed')
+        .limit(1)
+    )
+
+
+def _yolo_hash_lookup(sample: QuerySample):
+    # modules.vision.image_hash.ImageResultCache._lookup_database
+    return (
+        select(YOLODetection.__table__)
+        .where(YOLODetection.image_hash == sample.image_hash)
+        .order_by(YOLODetection.id.desc())
+        .limit(1)
+    )
+
+
+def _status_counts(sample: QuerySample):
+    # database.statistics.StatisticsService._refresh (main.CarePillApplication._show_database_status)
+    # 행 수 COUNT(*)(row_count_query)는 백그라운드에서만 실행되므로 대상이 아님
+    return statistics_query(datetime.combine(sample.today, datetime.min.time()))
+
+
+HOT_QUERIES: List[HotQuery] = [
+    HotQuery('fefo_batches', '조제 시 약품별 유효기간 순 배치 조회', _fefo_batches),
+    HotQuery('prescription_items', '조제할 처방 항목 조회', _prescription_items),
+    HotQuery('expiry_window', '유효기간 임박 배치 범위 조회', _expiry_window),
+    HotQuery('dur_by_medication', '약품별 DUR 상호작용 조회', _dur_by_medication),
+    HotQuery('dur_refresh', 'DUR 인덱스 증분 반영', _dur_refresh),
+    HotQuery('dur_active_prescriptions', '환자 복용 중 처방 DUR 점검', _dur_active_prescriptions),
+    HotQuery('patient_history', '환자 처방 이력', _patient_history),
+    HotQuery('ocr_claim_pending', '대기 중 OCR 작업 점유', _ocr_claim_pending),
+    HotQuery('ocr_recover_stuck', '중단된 OCR 작업 복구', _ocr_recover_stuck),
+    HotQuery('image_hash_lookup', '이미지 해시 중복 조회 (OCR)', _image_hash_lookup),
+    HotQuery('image_hash_prefix', '지각 해시 유사 이미지 조회 (OCR)', _image_hash_prefix),
+    HotQuery('yolo_hash_lookup', '이미지 해시 중복 조회 (YOLO)', _yolo_hash_lookup),
+    HotQuery('status_counts', '데이터베이스 상태 통계', _status_counts),
+]
+
+
+# --- 실행 계획 조회 ---------------------------------------------------------
+
+def _compile(connection, stmt: Executable):
+    compiled = stmt.compile(dialect=connection.dialect, compile_kwargs={'render_postcompile': True})
+    positions = compiled.positiontup or []
+    return str(compiled), tuple(compiled.params[name] for name in positions)
+
+
+def explain(connection, stmt: Executable) -> List[Dict[str, Any]]:
+    """EXPLAIN 결과 행 목록"""
+    sql, params = _compile(connection, stmt)
+    if connection.dialect.name == 'sqlite':
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+        return [{'detail': row[3]} for row in rows]
+    rows = connection.exec_driver_sql(f"EXPLAIN {sql}", params).all()
+    return [dict(row._mapping) for row in rows]
+
+
+def find_violations(dialect: str, plan: Sequence[Dict[str, Any]], allow_index_scan: bool = False) -> List[str]:
+    """실행 계획에서 전체 스캔/임시 정렬 찾기"""
+    violations = []
+    for step in plan:
+        if dialect == 'sqlite':
+            detail = step['detail']
+            if detail.startswith('SCAN ') and detail != 'SCAN CONSTANT ROW':
+                if not (allow_index_scan and 'COVERING INDEX' in detail):
+                    violations.append(f"전체 스캔: {detail}")
+            elif detail.startswith('USE TEMP B-TREE'):
+                violations.append(f"임시 B-tree 정렬: {detail}")
+        else:
+            access = (step.get('type') or '').upper()
+            extra = step.get('Extra') or ''
+            table = step.get('table')
+            if access == 'ALL' or (access == 'INDEX' and not allow_index_scan):
+                violations.append(f"전체 스캔: {table} (type={access})")
+            if 'Using temporary' in extra or 'Using filesort' in extra:
+                violations.append(f"임시 정렬: {table} ({extra})")
+    return violations
+
+
+def _describe(dialect: str, step: Dict[str, Any]) -> str:
+    if dialect == 'sqlite':
+        return step['detail']
+    return f"{step.get('table')}: type={step.get('type')} key={step.get('key')} {step.get('Extra') or ''}".strip()
+
+
+def load_sample(engine: Engine, today: Optional[date] = None) -> QuerySample:
+    """대표 파라미터 추출 (처방이 가장 많은 환자, 재고가 있는 약품 등)"""
+    with engine.connect() as connection:
+        medication_ids = list(connection.scalars(
+            select(InventoryItem.medication_id).where(InventoryItem.quantity > 0).limit(5)
+        ))
+        patient_id = connection.scalar(select(Prescription.patient_id).limit(1)) or 1
+        prescription_id = connection.scalar(select(func.max(Prescription.id))) or 1
+        image_hash = connection.scalar(select(OCRResult.image_hash).where(OCRResult.image_hash.isnot(None)).limit(1))
+    return QuerySample(medication_ids or [1], patient_id, prescription_id, image_hash or '0' * 64,
+                       today or date.today())
+
+
+def check_query_plans(engine: Engine, queries: Optional[List[HotQuery]] = None,
+                      sample: Optional[QuerySample] = None) -> List[PlanCheck]:
+    """
+    핫 쿼리 실행 계획 점검
+
+    Returns:
+        List[PlanCheck]: 쿼리별 실행 계획과 위반 사항
+    """
+    sample = sample or load_sample(engine)
+    dialect = engine.dialect.name
+    results = []
+    with engine.connect() as connection:
+        for query in queries or HOT_QUERIES:
+            plan = explain(connection, query.build(sample))
+            results.append(PlanCheck(
+                query,
+                [_describe(dialect, step) for step in plan],
+                find_violations(dialect, plan, query.allow_index_scan),
+            ))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """명령행 실행 (위반이 있으면 종료 코드 1)"""
+    from database.database import DatabaseManager
+    from database.synthetic import DatasetSize, SyntheticDataGenerator
+
+    parser = argparse.ArgumentParser(description="CarePill 핵심 쿼리 실행 계획 점검")
+    parser.add_argument('--database', help="데이터베이스 URL (기본값: 임시 SQLite 파일)")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="데이터 규모 배율 (1.0 = 약품 10만, 재고 100만, 처방 50만)")
+    parser.add_argument('--seed', type=int, default=42, help="난수 시드")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    database_url = args.database or f"sqlite:///{Path(tempfile.mkdtemp()) / 'carepill_plans.db'}"
+    db_manager = DatabaseManager(database_url)
+    db_manager.create_tables()
+    db_manager.migrate()
+
+    with db_manager.engine.connect() as connection:
+        seeded = connection.scalar(select(func.count()).select_from(select(Medication.id).limit(1).subquery()))
+    if not seeded:
+        SyntheticDataGenerator(db_manager.engine, seed=args.seed).generate(DatasetSize().scaled(args.scale))
+
+    results = check_query_plans(db_manager.engine)
+    failed = [result for result in results if result.failed]
+
+    print(f"\n쿼리 실행 계획 점검 ({db_manager.engine.dialect.name})")
+    for result in results:
+        status = 'OK' if result.ok else ('FAIL' if result.failed else 'KNOWN')
+        print(f"\n[{status}] {result.query.name} - {result.query.description}")
+        for line in result.plan:
+            print(f"    {line}")
+        for violation in result.violations:
+            print(f"    !! {violation}")
+        if result.violations and result.query.known_issue:
+            print(f"    (알려진 문제: {result.query.known_issue})")
+
+    known = sum(1 for result in results if result.violations and not result.failed)
+    print(f"\n통과 {len(results) - len(failed) - known}, 알려진 문제 {known}, 실패 {len(failed)} (전체 {len(results)}개)")
+    db_manager.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+CarePill 상태 통계
+약품/환자/처방 건수, 오늘 조제 건수, 대기 중 OCR 작업 수를 메모리에 유지
+(쓰기 이벤트로 증분 갱신, 범위 통계는 STATISTICS_TTL마다 단일 쿼리로 재조회)
+"""
+
+import logging
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from sqlalchemy import Engine, Insert, Select, event, func, select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.sql.dml import UpdateBase
+
+from config import settings
+from .database import DatabaseManager, get_db_manager
+from .models import DispensingRecord, Medication, OCRResult, Patient, Prescription
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseStatistics(NamedTuple):
+    """상태 화면용 통계"""
+    medications: Optional[int]          # 행 수는 처음 세는 동안 None
+    patients: Optional[int]
+    prescriptions: Optional[int]
+    dispensed_today: int
+    pending_ocr_jobs: int
+    low_stock_items: Optional[int]      # 재고 집계가 연결되지 않았으면 None
+    refreshed_at: datetime              # 마지막 전체 재조회 시각
+
+
+# 테이블별로 영향을 받는 통계 항목
+TRACKED_TABLES = {
+    'medications': 'medications',
+    'patients': 'patients',
+    'prescriptions': 'prescriptions',
+    'dispensing_records': 'dispensed_today',
+    'ocr_results': 'pending_ocr_jobs',
+}
+
+# 처음 한 번 COUNT(*)로 센 뒤 INSERT/DELETE 행 수로 유지하는 항목
+ROW_COUNT_FIELDS = ('medications', 'patients', 'prescriptions')
+# 인덱스 범위 카운트로 다시 세는 항목
+RANGE_COUNT_FIELDS = ('dispensed_today', 'pending_ocr_jobs')
+
+# INSERT 행 수를 그대로 더할 수 있는 항목 (나머지는 변경 시 해당 항목만 다시 셈)
+_INSERT_COUNTED = {'medications', 'patients', 'prescriptions', 'dispensed_today'}
+_ROW_COUNT_MODELS = {'medications': Medication, 'patients': Patient, 'prescriptions': Prescription}
+
+# 커밋 전까지 연결에 모아 두는 변경분 (connection.info 키)
+_PENDING_KEY = 'statistics_pending'
+
+
+def today_start_utc(today: Optional[date] = None) -> datetime:
+    """오늘 0시(현지 시간)를 UTC로 변환 (dispensed_at은 UTC로 저장됨)"""
+    local_now = datetime.now()
+    today = today or local_now.date()
+    return datetime.utcnow() - (local_now - datetime.combine(today, datetime.min.time()))
+
+
+def row_count_query(fields: Optional[Iterable[str]] = None) -> Select:
+    """
+    행 수 조회 쿼리 (정확한 COUNT(*))
+
+    테이블 또는 가장 작은 인덱스 전체를 읽으므로 상태 조회 경로에서는 실행하지 않고 최초 적재와
+    upsert 이후 재계산 때만 백그라운드에서 실행한다.
+
+    Args:
+        fields: 조회할 항목 (기본값: ROW_COUNT_FIELDS 전체)
+    """
+    return select(*(
+        select(func.count()).select_from(_ROW_COUNT_MODELS[name]).scalar_subquery().label(name)
+        for name in (fields or ROW_COUNT_FIELDS)
+    ))
+
+
+def statistics_query(today_start: datetime, fields: Optional[Iterable[str]] = None) -> Select:
+    """
+    범위 통계 조회 쿼리 (오늘 조제 건수, 대기 중 OCR 작업 수)
+
+    두 항목 모두 인덱스 범위 카운트이므로 테이블 전체를 읽지 않는다.
+
+    Args:
+        today_start: 오늘 조제 건수의 시작 시각 (UTC)
+        fields: 조회할 항목 (기본값: RANGE_COUNT_FIELDS 전체)
+    """
+    columns = {
+        'dispensed_today': select(func.count()).select_from(DispensingRecord)
+        .where(DispensingRecord.dispensed_at >= today_start).scalar_subquery(),
+        'pending_ocr_jobs': select(func.count()).select_from(OCRResult)
+        .where(OCRResult.status == 'pending').scalar_subquery(),
+    }
+    return select(*(columns[name].label(name) for name in (fields or columns)))
+
+
+class StatisticsService:
+    """상태 통계 캐시
+
+    약품/환자/처방 수는 처음 한 번 백그라운드 스레드에서 COUNT(*)로 정확히 센 뒤, 감시 중인 엔진의
+    after_execute 이벤트로 INSERT/DELETE된 행 수만큼 더하고 뺀다. 변경분은 연결별로 모아 두었다가
+    커밋될 때 반영하고 롤백되면 버린다. 새로 추가된 행 수를 알 수 없는 upsert가 실행되면 그 항목만
+    백그라운드에서 다시 센다.
+
+    오늘 조제 건수와 대기 중 OCR 작업 수는 변경된 항목만 다음 조회 때 인덱스 범위 카운트로 다시 세고,
+    TTL이 지나면 한 번의 쿼리로 함께 다시 센다. 재고 부족 약품 수는 StockTracker의 마지막 점검 결과를
+    그대로 쓴다.
+    """
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, ttl: Optional[int] = None):
+        """
+        Args:
+            db_manager: 데이터베이스 매니저 (기본값: 전역 매니저)
+            ttl: 범위 통계 전체 재조회 주기 (초, 기본값: settings.STATISTICS_TTL)
+        """
+        self.db_manager = db_manager or get_db_manager()
+        self.ttl = settings.STATISTICS_TTL if ttl is None else ttl
+        self._counts: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+        self._counting: Dict[str, int] = {}     # 다시 세는 중인 항목 → 그동안 커밋된 변경분
+        self._today: Optional[date] = None
+        self._refreshed_at: Optional[datetime] = None
+        self._expires_at = 0.0
+        self._stock_tracker = None
+        self._engines: List[Engine] = []
+        self._lock = threading.Lock()
+        self.watch(self.db_manager.engine)
+
+    def watch(self, engine: Engine):
+        """엔진의 쓰기 실행과 커밋/롤백 감시 (비동기 엔진은 sync_engine 전달)"""
+        if engine not in self._engines:
+            event.listen(engine, 'after_execute', self._after_execute)
+            event.listen(engine, 'commit', self._on_commit)
+            event.listen(engine, 'rollback', self._on_rollback)
+            self._engines.append(engine)
+
+    def attach_stock_tracker(self, stock_tracker):
+        """재고 부족 약품 수를 제공할 StockTracker 연결"""
+        self._stock_tracker = stock_tracker
+
+    def recount(self, wait: bool = False):
+        """
+        약품/환자/처방 수를 COUNT(*)로 다시 셈
+
+        Args:
+            wait: 완료될 때까지 기다림 (기본값: 백그라운드 스레드에서 실행)
+        """
+        if wait:
+            self._recount(ROW_COUNT_FIELDS)
+        else:
+            self._start_recount(ROW_COUNT_FIELDS)
+
+    def invalidate(self):
+        """다음 조회 때 범위 통계를 다시 세고 행 수는 백그라운드에서 다시 셈"""
+        with self._lock:
+            self._expires_at = 0.0
+            self._dirty.update(ROW_COUNT_FIELDS)
+
+    def get(self, force_refresh: bool = False) -> DatabaseStatistics:
+        """
+        통계 조회 (TTL 안에서는 변경된 범위 통계만 다시 셈)
+
+        Args:
+            force_refresh: 캐시와 관계없이 전체 재조회 (행 수 COUNT(*) 포함, 완료될 때까지 기다림)
+        """
+        today = date.today()
+        with self._lock:
+            if self._today != today:
+                self._dirty.add('dispensed_today')
+            full = force_refresh or self._refreshed_at is None or time.monotonic() >= self._expires_at
+            fields = list(RANGE_COUNT_FIELDS) if full else sorted(self._dirty.intersection(RANGE_COUNT_FIELDS))
+            stale = [name for name in ROW_COUNT_FIELDS
+                     if (name not in self._counts or name in self._dirty) and name not in self._counting]
+
+        if force_refresh:
+            self._recount(ROW_COUNT_FIELDS)
+        elif stale:
+            self._start_recount(stale)
+        if fields:
+            self._refresh(today, fields, full)
+
+        low_stock = self._stock_tracker.low_stock_count() if self._stock_tracker is not None else None
+        with self._lock:
+            return DatabaseStatistics(
+                low_stock_items=low_stock,
+                refreshed_at=self._refreshed_at,
+                **{name: self._counts.get(name) for name in ROW_COUNT_FIELDS},
+                **{name: max(0, self._counts.get(name, 0)) for name in RANGE_COUNT_FIELDS}
+            )
+
+    def close(self):
+        """이벤트 감시 해제"""
+        for engine in self._engines:
+            event.remove(engine, 'after_execute', self._after_execute)
+            event.remove(engine, 'commit', self._on_commit)
+            event.remove(engine, 'rollback', self._on_rollback)
+        self._engines.clear()
+
+    def _refresh(self, today: date, fields: List[str], full: bool):
+        with self.db_manager.engine.connect() as connection:
+            row = connection.execute(statistics_query(today_start_utc(today), fields)).one()
+
+        with self._lock:
+            self._counts.update({name: int(value or 0) for name, value in row._mapping.items()})
+            self._dirty.difference_update(row._mapping.keys())
+            self._today = today
+            if full:
+                self._refreshed_at = datetime.now()
+                self._expires_at = time.monotonic() + self.ttl
+
+        logger.debug(f"상태 통계 재조회 ({'전체' if full else ', '.join(fields)})")
+
+    def _start_recount(self, fields: Iterable[str]):
+        with self._lock:
+            fields = [name for name in fields if name not in self._counting]
+            for name in fields:
+                self._counting[name] = 0
+        if fields:
+            threading.Thread(target=self._background_recount, args=(fields,), name='StatisticsRecount',
+                             daemon=True).start()
+
+    def _background_recount(self, fields: List[str]):
+        try:
+            self._recount(fields)
+        except Exception as e:
+            logger.error(f"상태 통계 행 수 집계 실패: {e}")
+
+    def _recount(self, fields: Iterable[str]):
+        fields = list(fields)
+        with self._lock:
+            for name in fields:
+                self._counting.setdefault(name, 0)
+                self._dirty.discard(name)
+
+        try:
+            with self.db_manager.engine.connect() as connection:
+                row = connection.execute(row_count_query(fields)).one()
+        except Exception:
+            with self._lock:
+                for name in fields:
+                    self._counting.pop(name, None)
+                    self._dirty.add(name)
+            raise
+
+        with self._lock:
+            # 세는 동안 커밋된 변경분을 더함 (대부분 조회 스냅숏 이후에 커밋된 것)
+            for name, value in row._mapping.items():
+                self._counts[name] = int(value or 0) + self._counting.pop(name, 0)
+
+        logger.debug(f"상태 통계 행 수 집계 ({', '.join(fields)})")
+
+    def _after_execute(self, connection, clauseelement, multiparams, params, execution_options, result):
+        if not isinstance(clauseelement, UpdateBase):
+            return
+        field = TRACKED_TABLES.get(getattr(clauseelement.table, 'name', None))
+        if field is None:
+            return
+        if clauseelement.is_update and field in ROW_COUNT_FIELDS:
+            # UPDATE는 행 수를 바꾸지 않음
+            return
+
+        # 행 수를 알 수 없으면 -1 (해당 항목을 다시 셈)
+        count, sign = -1, 1
+        if isinstance(clauseelement, Insert):
+            # 일괄 INSERT는 파라미터 목록 길이가 행 수 (ORM의 RETURNING 일괄 삽입은 rowcount가 1로 보고됨).
+            # 방언별 Insert는 upsert(ON CONFLICT / ON DUPLICATE KEY)이므로 새 행 수를 알 수 없음
+            if field in _INSERT_COUNTED and not isinstance(clauseelement, (sqlite.Insert, mysql.Insert)):
+                count = len(multiparams) if multiparams else result.rowcount
+        elif clauseelement.is_delete and field in ROW_COUNT_FIELDS:
+            count, sign = result.rowcount, -1
+
+        deltas, dirty = connection.info.setdefault(_PENDING_KEY, ({}, set()))
+        if count >= 0:
+            deltas[field] = deltas.get(field, 0) + sign * count
+        else:
+            dirty.add(field)
+
+    def _on_commit(self, connection):
+        pending = connection.info.pop(_PENDING_KEY, None)
+        if pending is None:
+            return
+        deltas, dirty = pending
+        with self._lock:
+            for field, delta in deltas.items():
+                if field in self._counting:
+                    self._counting[field] += delta
+                if field in self._counts:
+                    self._counts[field] += delta
+            self._dirty.update(dirty)
+
+    def _on_rollback(self, connection):
+        connection.info.pop(_PENDING_KEY, None)
+
+
+# 전역 통계 서비스 인스턴스
+_statistics_service: Optional[StatisticsService] = None
+
+
+def get_statistics_service() -> StatisticsService:
+    """통계 서비스 인스턴스 반환 (최초 호출 시 전역 데이터베이스 매니저로 생성)"""
+    global _statistics_service
+
+    if _statistics_service is None:
+        _statistics_service = StatisticsService()
+
+    return _statistics_service
@@ -0,0 +1,349 @@
+"""
+CarePill 합성 데이터 생성
+용량 계획 및 쿼리 플랜 점검용 약국 데이터를 시드 고정 난수로 생성하여 Core 일괄 INSERT로 적재
+"""
+
+import logging
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import Engine, Table, func, select
+
+from .models import (
+    DispensingRecord, DURInteraction, InventoryItem, Medication, OCRResult, Patient, Prescription,
+    PrescriptionItem, YOLODetection
+)
+
+logger = logging.getLogger(__name__)
+
+SURNAMES = ['김', '이', '박', '최', '정', '강', '조', '윤', '장', '임', '한', '오', '서', '신', '권', '황']
+GIVEN_SYLLABLES = ['민', '서', '지', '현', '준', '우', '수', '영', '하', '은', '도', '윤', '진', '예', '성', '혜']
+INGREDIENTS = [
+    '아세트아미노펜', '이부프로펜', '나프록센', '아목시실린', '세파클러', '메트포르민', '글리메피리드',
+    '암로디핀', '로사르탄', '아토르바스타틴', '로수바스타틴', '오메프라졸', '란소프라졸', '레보세티리진',
+    '몬테루카스트', '와파린', '클로피도그렐', '아스피린', '레보티록신', '프레드니솔론', '트라마돌',
+    '세르트랄린', '에스시탈로프람', '졸피뎀', '리튬', '디곡신', '푸로세미드', '스피로노락톤',
+]
+DOSAGE_FORMS = ['정', '캡슐', '서방정', '시럽', '산']
+STRENGTHS = ['5mg', '10mg', '20mg', '50mg', '100mg', '250mg', '500mg']
+MANUFACTURERS = ['한국제약', '대한약품', '서울제약', '동방제약', '한빛바이오', '새한약품', '미래제약', '중앙제약']
+HOSPITALS = ['서울내과의원', '연세가정의학과', '한마음병원', '중앙정형외과', '푸른소아청소년과', '행복이비인후과']
+SUPPLIERS = ['지오영', '백제약품', '복산나이스', '동원약품']
+DOSAGES = ['1일 1회 1정', '1일 2회 1정', '1일 3회 1정', '1일 3회 식후 30분', '필요시 1정']
+SEVERITIES = ['high', 'medium', 'low']
+PHARMACISTS = ['김약사', '이약사', '박약사', '최약사']
+PILL_CLASSES = 12           # YOLO 알약 클래스 수
+YOLO_MODEL_VERSIONS = ['yolov8n-pill-1.2', 'yolov8n-pill-1.3']
+
+
+class DatasetSize(NamedTuple):
+    """테이블별 생성 규모 (기본값은 중형 약국 2년치의 약 10배)"""
+    medications: int = 100_000
+    inventory_items: int = 1_000_000
+    patients: int = 50_000
+    prescriptions: int = 500_000
+    dur_interactions: int = 50_000
+    ocr_results: int = 20_000
+    yolo_detections: int = 20_000
+
+    def scaled(self, factor: float) -> 'DatasetSize':
+        """모든 규모에 배율 적용 (테이블당 최소 1행)"""
+        return DatasetSize(*(max(1, int(count * factor)) for count in self))
+
+
+class GenerationResult(NamedTuple):
+    """테이블별 생성 행 수"""
+    counts: Dict[str, int]
+    elapsed: float
+
+
+class SyntheticDataGenerator:
+    """합성 약국 데이터 생성기
+
+    같은 seed와 규모로 실행하면 항상 같은 데이터를 만든다. 외래 키를 다시 조회하지 않도록 ID를
+    직접 부여하며(기존 최대 ID 다음부터), 행은 chunk_size 단위로 executemany한다. 재고 배치는 약품
+    순서대로 연속 ID를 받으므로 약품별 배치 범위를 계산만으로 알 수 있고, 조제 기록은 이를 이용해
+    처방 항목과 같은 약품의 배치를 가리킨다.
+    """
+
+    def __init__(self, engine: Engine, seed: int = 42, chunk_size: int = 10000,
+                 today: Optional[date] = None):
+        """
+        Args:
+            engine: SQLAlchemy 엔진
+            seed: 난수 시드
+            chunk_size: 한 번에 INSERT할 행 수
+            today: 날짜 생성 기준일 (기본값: 오늘)
+        """
+        self.engine = engine
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.today = today or date.today()
+        self.random = random.Random(seed)
+        # 생성 시각도 기준일에서 계산하여 실행 시점과 무관하게 같은 데이터를 만듦
+        self.now = datetime.combine(self.today, dt_time(18, 0))
+        self._ranges: Dict[str, range] = {}
+        self._dur_pairs: Set[Tuple[int, str]] = set()
+
+    def generate(self, size: Optional[DatasetSize] = None, **overrides: int) -> GenerationResult:
+        """
+        전체 데이터 생성
+
+        Args:
+            size: 테이블별 규모 (기본값: DatasetSize())
+            **overrides: size의 일부 항목만 바꿀 때 사용 (예: prescriptions=1000)
+
+        Returns:
+            GenerationResult: 테이블별 생성 행 수와 소요 시간
+        """
+        size = (size or DatasetSize())._replace(**overrides)
+        started = time.perf_counter()
+        counts = {
+            'medications': self._insert(Medication, size.medications, self._medication),
+            'inventory_items': self._insert(InventoryItem, size.inventory_items, self._inventory_item),
+            'patients': self._insert(Patient, size.patients, self._patient),
+        }
+        counts.update(self._insert_prescriptions(size.prescriptions))
+        # 약품·성분 쌍이 고유해야 하므로 가능한 쌍 수를 넘지 않도록 제한
+        dur_interactions = min(size.dur_interactions, size.medications * len(INGREDIENTS) // 2)
+        counts['dur_interactions'] = self._insert(DURInteraction, dur_interactions, self._dur_interaction)
+        counts['ocr_results'] = self._insert(OCRResult, size.ocr_results, self._ocr_result)
+        counts['yolo_detections'] = self._insert(YOLODetection, size.yolo_detections, self._yolo_detection)
+
+        if self.engine.dialect.name == 'sqlite':
+            # 플래너가 실제 분포를 보도록 통계 갱신
+            with self.engine.begin() as connection:
+                connection.exec_driver_sql('ANALYZE')
+
+        result = GenerationResult(counts, time.perf_counter() - started)
+        logger.info(f"합성 데이터 생성 완료 ({result.elapsed:.1f}초): {counts}")
+        return result
+
+    # --- 적재 -------------------------------------------------------------
+
+    def _insert(self, model, count: int, make_row: Callable[[int], Dict[str, Any]]) -> int:
+        table: Table = model.__table__
+        start = self._next_id(table)
+        ids = range(start, start + count)
+        self._ranges[table.name] = ids
+        self._write(table, (make_row(row_id) for row_id in ids))
+        return count
+
+    def _write(self, table: Table, rows: Iterator[Dict[str, Any]]):
+        chunk: List[Dict[str, Any]] = []
+        with self.engine.begin() as connection:
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= self.chunk_size:
+                    connection.execute(table.insert(), chunk)
+                    chunk = []
+            if chunk:
+                connection.execute(table.insert(), chunk)
+
+    def _next_id(self, table: Table) -> int:
+        with self.engine.connect() as connection:
+            return (connection.scalar(select(func.max(table.c.id))) or 0) + 1
+
+    def _pick_id(self, table_name: str) -> int:
+        ids = self._ranges[table_name]
+        return ids[self.random.randrange(len(ids))]
+
+    def _batch_medication(self, inventory_id: int) -> int:
+        """배치 ID에 해당하는 약품 ID (배치는 약품 순서대로 고르게 나뉨)"""
+        medications, batches = self._ranges['medications'], self._ranges['inventory_items']
+        return medications[(inventory_id - batches.start) * len(medications) // len(batches)]
+
+    def _pick_batch(self, medication_id: int) -> Optional[int]:
+        """약품의 배치 중 하나 (배치가 없는 약품이면 None)"""
+        medications, batches = self._ranges['medications'], self._ranges['inventory_items']
+        offset = medication_id - medications.start
+        # offset번째 약품의 배치 = (i * 약품 수 // 배치 수 == offset)인 i 구간
+        first = -(-offset * len(batches) // len(medications))
+        last = -(-(offset + 1) * len(batches) // len(medications))
+        if first >= last:
+            return None
+        return batches.start + self.random.randrange(first, last)
+
+    # --- 행 생성 ----------------------------------------------------------
+
+    def _medication(self, row_id: int) -> Dict[str, Any]:
+        rng = self.random
+        ingredient = rng.choice(INGREDIENTS)
+        form = rng.choice(DOSAGE_FORMS)
+        strength = rng.choice(STRENGTHS)
+        return {
+            'id': row_id,
+            'name': f"{ingredient[:3]}{rng.choice(MANUFACTURERS)[:2]}{form} {strength}",
+            'generic_name': ingredient,
+            'manufacturer': rng.choice(MANUFACTURERS),
+            'kfda_code': f"2{row_id:08d}",
+            'drug_code': f"6{rng.randrange(10 ** 8):08d}",
+            'dosage_form': form,
+            'strength': strength,
+            'unit': '정' if form.endswith('정') else '개',
+            'shelf_life_months': rng.choice((24, 36, 48)),
+            'prescription_required': rng.random() < 0.8,
+            'controlled_substance': rng.random() < 0.03,
+        }
+
+    def _inventory_item(self, row_id: int) -> Dict[str, Any]:
+        rng = self.random
+        initial = rng.randrange(50, 1000)
+        purchase = self.today - timedelta(days=rng.randrange(0, 720))
+        return {
+            'id': row_id,
+            'medication_id': self._batch_medication(row_id),
+            'batch_number': f"B{purchase:%y%m}{row_id % 100000:05d}",
+            'expiry_date': purchase + timedelta(days=rng.randrange(180, 1460)),
+            'quantity': rng.randrange(0, initial + 1),
+            'initial_quantity': initial,
+            'purchase_date': purchase,
+            'purchase_price': round(rng.uniform(1000, 50000), 2),
+            'supplier': rng.choice(SUPPLIERS),
+            'storage_location': f"{rng.choice('ABCDEF')}-{rng.randrange(1, 20):02d}",
+            'is_active': rng.random() < 0.97,
+        }
+
+    def _patient(self, row_id: int) -> Dict[str, Any]:
+        rng = self.random
+        return {
+            'id': row_id,
+            'name': rng.choice(SURNAMES) + rng.choice(GIVEN_SYLLABLES) + rng.choice(GIVEN_SYLLABLES),
+            'birth_date': date(1935, 1, 1) + timedelta(days=rng.randrange(0, 365 * 85)),
+            'gender': rng.choice(('M', 'F')),
+            'phone': f"010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}",
+        }
+
+    def _insert_prescriptions(self, count: int) -> Dict[str, int]:
+        """처방전, 처방 항목, 조제 기록을 함께 생성 (조제 완료 처방의 항목마다 조제 기록 1건)"""
+        tables = (Prescription.__table__, PrescriptionItem.__table__, DispensingRecord.__table__)
+        start = self._next_id(tables[0])
+        item_id = self._next_id(tables[1])
+        record_id = self._next_id(tables[2])
+        self._ranges['prescriptions'] = range(start, start + count)
+
+        rng = self.random
+        item_count = record_count = 0
+        chunks: Tuple[List[Dict[str, Any]], ...] = ([], [], [])
+
+        with self.engine.begin() as connection:
+            for prescription_id in range(start, start + count):
+                prescribed = self.today - timedelta(days=rng.randrange(0, 730))
+                status = 'pending' if prescribed >= self.today - timedelta(days=2) else \
+                    rng.choices(('dispensed', 'cancelled'), (97, 3))[0]
+                dispensed = status == 'dispensed'
+                dispensed_at = datetime.combine(prescribed, dt_time(rng.randrange(9, 19), rng.randrange(60)))
+                chunks[0].append({
+                    'id': prescription_id,
+                    'patient_id': self._pick_id('patients'),
+                    'prescription_number': f"RX{prescribed:%Y%m%d}-{prescription_id:08d}",
+                    'doctor_name': rng.choice(SURNAMES) + rng.choice(GIVEN_SYLLABLES) + rng.choice(GIVEN_SYLLABLES),
+                    'hospital_name': rng.choice(HOSPITALS),
+                    'prescribed_date': prescribed,
+                    'status': status,
+                })
+                pharmacist = rng.choice(PHARMACISTS)
+                for _ in range(rng.randrange(1, 5)):
+                    medication_id = self._pick_id('medications')
+                    quantity = rng.randrange(3, 90)
+                    chunks[1].append({
+                        'id': item_id,
+                        'prescription_id': prescription_id,
+                        'medication_id': medication_id,
+                        'quantity': quantity,
+                        'dosage': rng.choice(DOSAGES),
+                        'duration_days': rng.choice((3, 5, 7, 14, 30)),
+                        'dispensed_quantity': quantity if dispensed else 0,
+                        'dispensed_date': prescribed if dispensed else None,
+                    })
+                    batch_id = self._pick_batch(medication_id) if dispensed else None
+                    if batch_id is not None:
+                        chunks[2].append({
+                            'id': record_id,
+                            'prescription_item_id': item_id,
+                            'inventory_item_id': batch_id,
+                            'quantity_dispensed': quantity,
+                            'dispensed_by': pharmacist,
+                            'dispensed_at': dispensed_at,
+                        })
+                        record_id += 1
+                        record_count += 1
+                    item_id += 1
+                    item_count += 1
+
+                if len(chunks[0]) >= self.chunk_size:
+                    self._flush(connection, tables, chunks)
+
+            self._flush(connection, tables, chunks)
+
+        self._ranges['prescription_items'] = range(item_id - item_count, item_id)
+        self._ranges['dispensing_records'] = range(record_id - record_count, record_id)
+        return {'prescriptions': count, 'prescription_items': item_count, 'dispensing_records': record_count}
+
+    @staticmethod
+    def _flush(connection, tables: Tuple[Table, ...], chunks: Tuple[List[Dict[str, Any]], ...]):
+        """외래 키 순서대로 INSERT 후 버퍼 비우기"""
+        for table, chunk in zip(tables, chunks):
+            if chunk:
+                connection.execute(table.insert(), chunk)
+                chunk.clear()
+
+    def _dur_interaction(self, row_id: int) -> Dict[str, Any]:
+        rng = self.random
+        # 고유 키 (medication_id, interacting_medication, interaction_type) 충돌 시 다른 약품으로 재추첨
+        while True:
+            medication_id = self._pick_id('medications')
+            ingredient = rng.choice(INGREDIENTS)
+            if (medication_id, ingredient) not in self._dur_pairs:
+                self._dur_pairs.add((medication_id, ingredient))
+                break
+        return {
+            'id': row_id,
+            'medication_id': medication_id,
+            'interaction_type': 'drug-drug',
+            'severity_level': rng.choice(SEVERITIES),
+            # 실제 성분명을 넣어 DUR 점검 시 다른 처방 약품과 매칭되도록 함
+            'interacting_medication': ingredient,
+            'description': f"{ingredient} 병용 시 주의",
+            'source': 'KFDA',
+            'source_date': self.today - timedelta(days=rng.randrange(0, 365)),
+        }
+
+    def _ocr_result(self, row_id: int) -> Dict[str, Any]:
+        rng = self.random
+        status = rng.choices(('completed', 'low_confidence', 'failed', 'pending'), (90, 5, 3, 2))[0]
+        return {
+            'id': row_id,
+            'image_path': f"uploads/images/rx_{row_id:08d}.jpg",
+            'image_hash': f"{rng.getrandbits(64):016x}{rng.getrandbits(192):048x}",
+            'extracted_text': '' if status == 'pending' else '처방전 텍스트',
+            'confidence_score': None if status == 'pending' else round(rng.uniform(0.4, 0.99), 3),
+            'status': status,
+            'processed_at': None if status == 'pending' else self.now - timedelta(minutes=rng.randrange(0, 100000)),
+        }
+
+    def _yolo_detection(self, row_id: int) -> Dict[str, Any]:
+        from modules.yolo.storage import pack_detections
+
+        rng = self.random
+        count = rng.choices((0, 1, 2, 3, 4, 6), (5, 40, 25, 15, 10, 5))[0]
+        boxes = []
+        for _ in range(count):
+            x, y = rng.randrange(0, 560), rng.randrange(0, 400)
+            boxes.append((x, y, x + rng.randrange(30, 80), y + rng.randrange(30, 80)))
+        return {
+            'id': row_id,
+            'image_path': f"uploads/images/pill_{row_id:08d}.jpg",
+            'image_hash': f"{rng.getrandbits(64):016x}{rng.getrandbits(192):048x}",
+            'detections': pack_detections(
+                [rng.randrange(PILL_CLASSES) for _ in range(count)],
+                [rng.uniform(0.5, 0.99) for _ in range(count)],
+                boxes,
+            ),
+            'detection_count': count,
+            'model_version': rng.choice(YOLO_MODEL_VERSIONS),
+            'processing_time': round(rng.uniform(0.02, 0.12), 4),
+            'created_at': self.now - timedelta(minutes=rng.randrange(0, 100000)),
+        }
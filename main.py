@@ -1,19 +1,35 @@
 """
 CarePill 메인 애플리케이션
 약품 관리 시스템의 진입점
+
+사용법:
+    python main.py                      # 대화형 모드
+    python main.py --profile-startup    # 시작 단계별 import/초기화 시간 출력 후 종료
 """
 
+import time
+_import_marks = [('start', time.perf_counter())]
+
+import argparse
 import asyncio
 import sys
 from pathlib import Path
 
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent))
+_import_marks.append(('stdlib', time.perf_counter()))
 
 from config import settings
-from utils import get_logger, log_system_event, log_error
-from database import init_database, get_db_manager
-from voice_chat import VoiceChatGPT
+_import_marks.append(('config', time.perf_counter()))
+from utils import get_logger, log_system_event, log_error, enable_database_logging, disable_database_logging
+from utils import get_metrics_registry, get_startup_profiler
+_import_marks.append(('utils', time.perf_counter()))
+from database import init_async_database, init_database, get_config_service, get_statistics_service
+_import_marks.append(('database', time.perf_counter()))
+
+# 음성(openai/pyaudio/pygame), OCR/비전(numpy/OpenCV), 식약처 반영(requests) 모듈은 시작 경로에서
+# 불러오지 않고 백그라운드 초기화나 처음 사용할 때 불러옴
+get_startup_profiler().record_marks('import', _import_marks)
 
 
 class CarePillApplication:
@@ -22,52 +38,181 @@ class CarePillApplication:
     def __init__(self):
         self.logger = get_logger('carepill.main')
         self.db_manager = None
+        self.config_service = None
+        self.statistics = None
+        self.stock_tracker = None
+        self.inventory_task = None
+        self.ocr_pipeline = None
+        self.ocr_task = None
+        self.dur_index = None
+        self.dur_update_task = None
         self.voice_chat = None
+        self.startup_tasks = {}
+        self.startup_watcher = None
         self.is_running = False
 
     async def initialize(self):
-        """애플리케이션 초기화"""
+        """애플리케이션 초기화
+
+        데이터베이스와 런타임 설정까지만 시작 경로에서 처리하고, 재고 집계/DUR 반영/OCR/음성처럼
+        무거운 서브시스템은 백그라운드 작업으로 병렬 초기화하여 REPL을 바로 사용할 수 있게 한다.
+        """
+        startup = get_startup_profiler()
         try:
             log_system_event('info', 'main', "CarePill 시스템 초기화 시작")
 
-            # 설정 유효성 검사
-            if not settings.validate_settings():
-                raise RuntimeError("설정 유효성 검사 실패")
+            # 설정 유효성 검사 (작업 디렉토리 생성 포함)
+            with startup.phase('init', 'settings'):
+                if not settings.validate_settings():
+                    raise RuntimeError("설정 유효성 검사 실패")
 
-            # 데이터베이스 초기화
-            self.db_manager = init_database(settings.get_database_url())
-            log_system_event('info', 'main', "데이터베이스 초기화 완료")
+            # 데이터베이스 초기화 (비동기 엔진 사용으로 이벤트 루프를 막지 않음)
+            with startup.phase('init', 'database'):
+                self.db_manager = await init_async_database(settings.get_database_url())
+                log_system_event('info', 'main', "데이터베이스 초기화 완료")
 
-            # 데이터베이스 연결 테스트
-            if not self.db_manager.test_connection():
-                raise RuntimeError("데이터베이스 연결 실패")
+                # 데이터베이스 연결 테스트
+                if not await self.db_manager.test_connection():
+                    raise RuntimeError("데이터베이스 연결 실패")
 
-            # 음성 채팅 시스템 초기화
-            try:
-                self.voice_chat = VoiceChatGPT()
-                log_system_event('info', 'main', "음성 채팅 시스템 초기화 완료")
-            except Exception as e:
-                log_error("음성 채팅 시스템 초기화 실패", e, 'main')
-                self.voice_chat = None
+            # 시스템 로그 DB 저장 (전용 연결에서 일괄 삽입)
+            enable_database_logging(settings.get_database_url())
 
             # 기본 설정 데이터 삽입
-            await self._setup_default_configurations()
+            with startup.phase('init', 'default_configurations'):
+                await self._setup_default_configurations()
+
+            # 런타임 설정 캐시 (기능 플래그 조회 시 DB 접근 없음, 마이그레이션은 스레드에서 실행)
+            with startup.phase('init', 'config_service'):
+                await asyncio.get_running_loop().run_in_executor(None, self._init_config_service)
 
-            log_system_event('info', 'main', "CarePill 시스템 초기화 완료")
+            # 나머지 서브시스템은 백그라운드에서 병렬 초기화
+            self.startup_tasks = {
+                'inventory': asyncio.create_task(self._init_inventory()),
+                'dur': asyncio.create_task(self._init_dur_updates()),
+                'ocr': asyncio.create_task(self._init_ocr()),
+                'voice': asyncio.create_task(self._init_voice()),
+            }
+            self.startup_watcher = asyncio.create_task(self._report_subsystems_ready())
+
+            log_system_event('info', 'main', "CarePill 핵심 초기화 완료 (서브시스템은 백그라운드에서 초기화 중)")
 
         except Exception as e:
             log_error("시스템 초기화 실패", e, 'main')
             raise
 
+    def _init_config_service(self):
+        """동기 데이터베이스 매니저(마이그레이션 포함), 런타임 설정 캐시, 상태 통계 초기화"""
+        init_database(settings.get_database_url())
+        self.config_service = get_config_service()
+        self.config_service.reload()
+
+        # 상태 통계는 두 엔진의 쓰기를 모두 감시하여 증분 갱신 (행 수는 백그라운드에서 처음 한 번 셈)
+        self.statistics = get_statistics_service()
+        self.statistics.watch(self.db_manager.engine.sync_engine)
+        self.statistics.recount()
+
+    async def _run_startup_step(self, name: str, func):
+        """백그라운드 초기화 단계를 스레드에서 실행하고 소요 시간 기록"""
+        loop = asyncio.get_running_loop()
+        with get_startup_profiler().phase('init', name, background=True):
+            return await loop.run_in_executor(None, func)
+
+    async def _init_inventory(self):
+        """재고 집계 적재 후 주기적 경보 점검 시작"""
+        def load():
+            inventory = get_startup_profiler().import_module('modules.inventory', background=True)
+            tracker = inventory.get_stock_tracker()
+            tracker.rebuild()
+            return tracker
+
+        try:
+            self.stock_tracker = await self._run_startup_step('inventory', load)
+            if self.statistics:
+                self.statistics.attach_stock_tracker(self.stock_tracker)
+            self.inventory_task = asyncio.create_task(self._inventory_alert_loop())
+        except Exception as e:
+            log_error("재고 집계 초기화 실패", e, 'inventory')
+
+    async def _init_dur_updates(self):
+        """DUR 인덱스 적재 후 식약처 약품/DUR 데이터 주기 반영 시작"""
+        if not self.config_service.get_bool('dur_check_enabled', True):
+            return
+
+        def load():
+            dur = get_startup_profiler().import_module('modules.dur', background=True)
+            importer = dur.get_kfda_importer()
+            # 전역 인덱스를 적재해 두어야 반영기가 변경분을 인덱스에 반영함
+            index = dur.get_dur_index()
+            with importer.db_manager.session_scope() as session:
+                index.rebuild(session)
+            return importer, index
+
+        try:
+            importer, self.dur_index = await self._run_startup_step('dur', load)
+            self.dur_update_task = asyncio.create_task(self._dur_update_loop(importer))
+        except Exception as e:
+            log_error("식약처 데이터 반영 초기화 실패", e, 'dur')
+
+    async def _init_ocr(self):
+        """OCR 작업 처리 시작 (Tesseract가 설치된 경우에만)"""
+        if not self.config_service.get_bool('ocr_enabled', True):
+            return
+
+        def load():
+            startup = get_startup_profiler()
+            ocr = startup.import_module('modules.ocr', background=True)
+            if not ocr.is_available(settings.TESSERACT_PATH):
+                return None
+            vision = startup.import_module('modules.vision', background=True)
+            return ocr.OCRPipeline(image_cache=vision.get_image_cache())
+
+        try:
+            self.ocr_pipeline = await self._run_startup_step('ocr', load)
+        except Exception as e:
+            log_error("OCR 초기화 실패", e, 'ocr')
+            return
+
+        if self.ocr_pipeline:
+            self.ocr_task = asyncio.create_task(self._ocr_worker_loop())
+        else:
+            log_system_event('warning', 'main', "Tesseract를 찾을 수 없어 OCR 작업 처리를 시작하지 않습니다")
+
+    async def _init_voice(self):
+        """음성 채팅 시스템 초기화"""
+        def load():
+            voice_chat = get_startup_profiler().import_module('voice_chat', background=True)
+            chat = voice_chat.VoiceChatGPT()
+            chat.prewarm_tts_cache()
+            return chat
+
+        try:
+            self.voice_chat = await self._run_startup_step('voice', load)
+            log_system_event('info', 'main', "음성 채팅 시스템 초기화 완료")
+        except Exception as e:
+            log_error("음성 채팅 시스템 초기화 실패", e, 'main')
+            self.voice_chat = None
+
+    async def wait_for_subsystems(self):
+        """백그라운드 초기화 완료 대기"""
+        if self.startup_tasks:
+            await asyncio.gather(*self.startup_tasks.values(), return_exceptions=True)
+        get_startup_profiler().mark('subsystems_ready')
+
+    async def _report_subsystems_ready(self):
+        await self.wait_for_subsystems()
+        log_system_event('info', 'main', "CarePill 시스템 초기화 완료")
+
     async def _setup_default_configurations(self):
         """기본 설정 데이터 삽입"""
         try:
+            from sqlalchemy import select
             from database.models import Configuration
 
-            with self.db_manager.session_scope() as session:
+            async with self.db_manager.async_session_scope() as session:
                 # 기본 설정이 없을 경우에만 삽입
-                existing_config = session.query(Configuration).first()
-                if existing_config:
+                result = await session.execute(select(Configuration.id).limit(1))
+                if result.first() is not None:
                     return
 
                 default_configs = [
@@ -132,21 +277,74 @@ class CarePillApplication:
                     config = Configuration(**config_data)
                     session.add(config)
 
-                session.commit()
+                await session.commit()
                 log_system_event('info', 'main', "기본 설정 데이터 삽입 완료")
 
         except Exception as e:
             log_error("기본 설정 데이터 삽입 실패", e, 'main')
 
+    async def _inventory_alert_loop(self):
+        """재고 부족/유효기간 임박 경보 주기 점검"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                alerts = await loop.run_in_executor(None, self.stock_tracker.scan)
+                for alert in alerts:
+                    log_system_event('warning', 'inventory', alert.message,
+                                     alert_type=alert.kind, medication_id=alert.medication_id)
+            except Exception as e:
+                log_error("재고 경보 점검 실패", e, 'inventory')
+            await asyncio.sleep(settings.INVENTORY_SCAN_INTERVAL)
+
+    async def _dur_update_loop(self, importer):
+        """DUR_UPDATE_INTERVAL마다 식약처 약품/DUR 데이터 변경분 반영"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                results = await loop.run_in_executor(None, importer.refresh_if_due)
+                for result in results:
+                    log_system_event('info', 'dur', f"식약처 데이터 반영 완료 ({result.dataset})",
+                                     processed=result.processed, changed=result.changed,
+                                     deactivated=result.deactivated)
+            except Exception as e:
+                log_error("식약처 데이터 반영 실패", e, 'dur')
+            await asyncio.sleep(3600)
+
+    async def _ocr_worker_loop(self):
+        """대기 중인 OCR 작업 처리 (프로세스 풀에서 실행되어 이벤트 루프를 막지 않음)"""
+        loop = asyncio.get_running_loop()
+        last_recovery = 0.0
+        while True:
+            try:
+                if loop.time() - last_recovery >= settings.OCR_JOB_TIMEOUT:
+                    last_recovery = loop.time()
+                    await loop.run_in_executor(None, self.ocr_pipeline.recover_stuck_jobs)
+
+                processed = await loop.run_in_executor(None, self.ocr_pipeline.process_batch)
+                if processed:
+                    continue
+            except Exception as e:
+                log_error("OCR 작업 처리 실패", e, 'ocr')
+            await asyncio.sleep(settings.OCR_POLL_INTERVAL)
+
     async def start_voice_interface(self):
         """음성 인터페이스 시작"""
+        voice_task = self.startup_tasks.get('voice')
+        if voice_task and not voice_task.done():
+            print("⏳ 음성 채팅 시스템을 불러오는 중입니다...")
+            await voice_task
+
         if not self.voice_chat:
             log_error("음성 채팅 시스템이 초기화되지 않았습니다", module='main')
             return
 
+        if self.config_service and not self.config_service.get_bool('voice_enabled', True):
+            print("❌ 음성 인터페이스가 비활성화되어 있습니다. (voice_enabled)")
+            return
+
         try:
             log_system_event('info', 'main', "음성 인터페이스 시작")
-            self.voice_chat.start_conversation()
+            self.voice_chat.start_conversation(streaming=settings.VOICE_STREAMING)
         except Exception as e:
             log_error("음성 인터페이스 실행 실패", e, 'main')
 
@@ -159,14 +357,18 @@ class CarePillApplication:
         print("1. voice    - 음성 인터페이스 시작")
         print("2. status   - 시스템 상태 확인")
         print("3. db       - 데이터베이스 상태 확인")
-        print("4. exit     - 시스템 종료")
+        print("4. perf     - 성능 지표 확인")
+        print("5. dur <ID> - 처방전 DUR 점검")
+        print("6. exit     - 시스템 종료")
         print("-"*50)
 
         self.is_running = True
 
         while self.is_running:
             try:
-                command = input("\nCarePill> ").strip().lower()
+                # 입력 대기 중에도 다른 비동기 작업이 진행되도록 스레드에서 읽기
+                loop = asyncio.get_running_loop()
+                command = (await loop.run_in_executor(None, input, "\nCarePill> ")).strip().lower()
 
                 if command == 'voice':
                     await self.start_voice_interface()
@@ -177,6 +379,12 @@ class CarePillApplication:
                 elif command == 'db':
                     await self._show_database_status()
 
+                elif command == 'perf':
+                    await self._show_performance_metrics()
+
+                elif command.split()[:1] == ['dur']:
+                    await self._show_dur_check(command.split()[1:])
+
                 elif command in ['exit', 'quit', '종료']:
                     await self.shutdown()
                     break
@@ -186,6 +394,8 @@ class CarePillApplication:
                     print("- voice: 음성 인터페이스 시작")
                     print("- status: 시스템 상태 확인")
                     print("- db: 데이터베이스 상태 확인")
+                    print("- perf: 성능 지표 확인")
+                    print("- dur <처방전 ID>: 처방전과 환자의 복용 중 처방 DUR 점검")
                     print("- exit: 시스템 종료")
 
                 elif command == '':
@@ -206,35 +416,107 @@ class CarePillApplication:
     async def _show_system_status(self):
         """시스템 상태 표시"""
         print("\n📊 시스템 상태:")
-        print(f"  - 데이터베이스: {'✅ 연결됨' if self.db_manager and self.db_manager.test_connection() else '❌ 연결 실패'}")
-        print(f"  - 음성 인터페이스: {'✅ 활성화' if self.voice_chat else '❌ 비활성화'}")
+        db_connected = bool(self.db_manager) and await self.db_manager.test_connection()
+        print(f"  - 데이터베이스: {'✅ 연결됨' if db_connected else '❌ 연결 실패'}")
+        loading = [name for name, task in self.startup_tasks.items() if not task.done()]
+        if 'voice' in loading:
+            print("  - 음성 인터페이스: ⏳ 초기화 중")
+        else:
+            print(f"  - 음성 인터페이스: {'✅ 활성화' if self.voice_chat else '❌ 비활성화'}")
+        if self.voice_chat and self.voice_chat.tts_cache:
+            cache_stats = self.voice_chat.tts_cache.stats()
+            print(f"  - TTS 캐시: 적중 {cache_stats['hits']}회 / 미스 {cache_stats['misses']}회 "
+                  f"(적중률 {cache_stats['hit_rate']:.0%})")
         print(f"  - 디버그 모드: {'✅ 활성화' if settings.DEBUG else '❌ 비활성화'}")
         print(f"  - 로그 레벨: {settings.LOG_LEVEL}")
+        if loading:
+            print(f"  - 초기화 중인 서브시스템: {', '.join(loading)}")
 
     async def _show_database_status(self):
-        """데이터베이스 상태 표시"""
-        if not self.db_manager:
+        """데이터베이스 상태 표시 (캐시된 통계 사용, 테이블 스캔 없음)"""
+        if not self.db_manager or not self.statistics:
             print("❌ 데이터베이스가 초기화되지 않았습니다.")
             return
 
         try:
-            from database.models import Medication, Patient, Prescription
-
-            with self.db_manager.session_scope() as session:
-                medication_count = session.query(Medication).count()
-                patient_count = session.query(Patient).count()
-                prescription_count = session.query(Prescription).count()
-
-                print("\n🗄️ 데이터베이스 상태:")
-                print(f"  - 등록된 약품: {medication_count}개")
-                print(f"  - 등록된 환자: {patient_count}명")
-                print(f"  - 처방전: {prescription_count}건")
-                print(f"  - 데이터베이스 타입: {settings.DB_TYPE}")
+            stats = await asyncio.get_running_loop().run_in_executor(None, self.statistics.get)
+
+            print("\n🗄️ 데이터베이스 상태:")
+            for label, count, unit in (('등록된 약품', stats.medications, '개'), ('등록된 환자', stats.patients, '명'),
+                                       ('처방전', stats.prescriptions, '건')):
+                print(f"  - {label}: {'⏳ 집계 중' if count is None else f'{count}{unit}'}")
+            print(f"  - 오늘 조제: {stats.dispensed_today}건")
+            print(f"  - 대기 중인 OCR 작업: {stats.pending_ocr_jobs}건")
+            if stats.low_stock_items is None:
+                print("  - 재고 부족 약품: ⏳ 집계 중")
+            else:
+                print(f"  - 재고 부족 약품: {stats.low_stock_items}종")
+            print(f"  - 데이터베이스 타입: {settings.DB_TYPE}")
+            print(f"  - 통계 갱신: {stats.refreshed_at:%H:%M:%S}")
 
         except Exception as e:
             log_error("데이터베이스 상태 확인 실패", e, 'main')
             print(f"❌ 데이터베이스 상태 확인 실패: {e}")
 
+    async def _show_dur_check(self, args):
+        """처방전 DUR 점검 결과 표시 (메모리 인덱스 조회)"""
+        if len(args) != 1 or not args[0].isdigit():
+            print("사용법: dur <처방전 ID>")
+            return
+        if self.dur_index is None:
+            loading = 'dur' in self.startup_tasks and not self.startup_tasks['dur'].done()
+            print("⏳ DUR 인덱스를 불러오는 중입니다." if loading else "❌ DUR 점검이 비활성화되어 있습니다.")
+            return
+
+        def check():
+            from database import Prescription
+            from database.database import get_db_manager
+            with get_db_manager().session_scope() as session:
+                prescription = session.get(Prescription, int(args[0]))
+                if prescription is None:
+                    return None
+                return self.dur_index.check_prescription(session, prescription)
+
+        try:
+            alerts = await asyncio.get_running_loop().run_in_executor(None, check)
+        except Exception as e:
+            log_error("DUR 점검 실패", e, 'dur')
+            print(f"❌ DUR 점검 실패: {e}")
+            return
+
+        if alerts is None:
+            print(f"❌ 처방전을 찾을 수 없습니다: {args[0]}")
+        elif not alerts:
+            print(f"\n✅ 처방전 {args[0]}: DUR 경고 없음")
+        else:
+            print(f"\n⚠️ 처방전 {args[0]}: DUR 경고 {len(alerts)}건")
+            for alert in alerts:
+                where = '' if alert.from_current_prescription else ' (복용 중 처방)'
+                print(f"  - [{alert.severity_level}] {alert.medication_name} + "
+                      f"{alert.interacting_medication_name}{where}: {alert.description}")
+
+    async def _show_performance_metrics(self):
+        """성능 지표 표시 및 Prometheus 파일 저장"""
+        registry = get_metrics_registry()
+        snapshot = registry.snapshot()
+
+        if not snapshot:
+            print("\n📈 수집된 성능 지표가 없습니다.")
+            return
+
+        print("\n📈 성능 지표 (단위: ms):")
+        print(f"  {'작업':<30} {'횟수':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'최대':>9}")
+        for operation, stats in snapshot.items():
+            print(f"  {operation:<30} {stats['count']:>6} "
+                  f"{stats['p50'] * 1000:>9.1f} {stats['p95'] * 1000:>9.1f} "
+                  f"{stats['p99'] * 1000:>9.1f} {stats['max'] * 1000:>9.1f}")
+
+        try:
+            path = registry.write_prometheus()
+            print(f"  - Prometheus 지표 파일: {path}")
+        except Exception as e:
+            log_error("성능 지표 파일 저장 실패", e, 'main')
+
     async def shutdown(self):
         """애플리케이션 종료"""
         log_system_event('info', 'main', "CarePill 시스템 종료 시작")
@@ -242,23 +524,46 @@ class CarePillApplication:
         try:
             self.is_running = False
 
+            for task in (*self.startup_tasks.values(), self.startup_watcher,
+                         self.inventory_task, self.dur_update_task, self.ocr_task):
+                if task:
+                    task.cancel()
+            if self.ocr_pipeline:
+                self.ocr_pipeline.close()
+
             # 데이터베이스 연결 종료
             if self.db_manager:
-                self.db_manager.close()
+                await self.db_manager.close()
 
             log_system_event('info', 'main', "CarePill 시스템 종료 완료")
 
+            # 남은 시스템 로그 저장
+            disable_database_logging()
+
         except Exception as e:
             log_error("시스템 종료 중 오류", e, 'main')
 
 
-async def main():
-    """메인 함수"""
+async def main(profile_startup: bool = False):
+    """
+    메인 함수
+
+    Args:
+        profile_startup: 백그라운드 초기화까지 기다린 뒤 시작 단계별 소요 시간을 출력하고 종료
+    """
     app = CarePillApplication()
+    startup = get_startup_profiler()
 
     try:
         # 애플리케이션 초기화
         await app.initialize()
+        startup.mark('repl_ready')
+
+        if profile_startup:
+            await app.wait_for_subsystems()
+            print("\n⏱️ 시작 시간 분석:")
+            print(startup.report())
+            return
 
         # 대화형 모드 실행
         await app.run_interactive_mode()
@@ -272,14 +577,23 @@ async def main():
         await app.shutdown()
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """명령행 인자 해석"""
+    parser = argparse.ArgumentParser(description="CarePill 약품 관리 시스템")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="시작 단계별 import/초기화 시간을 출력하고 종료")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args()
     # Python 3.7 이상에서 asyncio.run() 사용
     if sys.version_info >= (3, 7):
-        asyncio.run(main())
+        asyncio.run(main(args.profile_startup))
     else:
         # 이전 버전 호환성
         loop = asyncio.get_event_loop()
         try:
-            loop.run_until_complete(main())
+            loop.run_until_complete(main(args.profile_startup))
         finally:
             loop.close()
\ No newline at end of file
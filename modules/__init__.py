@@ -0,0 +1,3 @@
+"""
+CarePill 기능별 모듈 패키지
+"""
@@ -0,0 +1,33 @@
+"""
+CarePill DUR 점검 모듈
+"""
+
+from .engine import (
+    DURIndex,
+    DUREntry,
+    DURAlert,
+    normalize_ingredient,
+    get_dur_index
+)
+from .importer import (
+    KFDAImporter,
+    ImportResult,
+    iter_records,
+    iter_api_records,
+    upsert_rows,
+    get_kfda_importer
+)
+
+__all__ = [
+    'DURIndex',
+    'DUREntry',
+    'DURAlert',
+    'normalize_ingredient',
+    'get_dur_index',
+    'KFDAImporter',
+    'ImportResult',
+    'iter_records',
+    'iter_api_records',
+    'upsert_rows',
+    'get_kfda_importer'
+]
@@ -0,0 +1,337 @@
+"""
+CarePill DUR 점검 엔진
+활성 DUR 상호작용 데이터를 메모리 인덱스로 유지하고 처방 단위로 점검
+"""
+
+import re
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database.models import DURInteraction, Medication, Prescription, PrescriptionItem
+
+logger = logging.getLogger(__name__)
+
+# 심각도 정렬 순서 (낮을수록 먼저 보고)
+SEVERITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+_NORMALIZE_PATTERN = re.compile(r'[\s\-_/·,.()\[\]]+')
+
+
+def normalize_ingredient(name: Optional[str]) -> str:
+    """성분명/약품명을 비교용 키로 정규화 (소문자, 공백 및 구두점 제거)"""
+    if not name:
+        return ''
+    return _NORMALIZE_PATTERN.sub('', name).lower()
+
+
+class DUREntry(NamedTuple):
+    """인덱스에 저장되는 DUR 상호작용 항목"""
+    id: int
+    medication_id: int
+    interacting_key: str
+    interacting_medication: str
+    interaction_type: str
+    severity_level: str
+    description: str
+    management: Optional[str]
+
+
+class DURAlert(NamedTuple):
+    """처방 점검 결과 경고"""
+    medication_id: int
+    medication_name: str
+    interacting_medication_id: int
+    interacting_medication_name: str
+    interaction_type: str
+    severity_level: str
+    description: str
+    management: Optional[str]
+    interaction_id: int
+    from_current_prescription: bool
+
+
+class _MedicationKeys(NamedTuple):
+    """점검 대상 약품과 정규화된 성분 키"""
+    medication_id: int
+    name: str
+    keys: Tuple[str, ...]
+    prescription_id: int
+
+
+class DURIndex:
+    """DUR 상호작용 메모리 인덱스
+
+    (medication_id, 정규화된 상호작용 성분) 쌍을 키로 활성 DUR 데이터를 보관하며,
+    `updated_at` 워터마크를 이용해 변경된 행만 증분 반영한다.
+    """
+
+    def __init__(self):
+        self._index: Dict[int, Dict[str, List[DUREntry]]] = {}
+        self._entries: Dict[int, DUREntry] = {}
+        self._watermark: Optional[datetime] = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def loaded(self) -> bool:
+        """rebuild()로 적재되었는지 여부 (DUR 데이터가 없어도 적재 후에는 True)"""
+        return self._loaded
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """마지막으로 반영된 `updated_at` 값"""
+        return self._watermark
+
+    def rebuild(self, session: Session) -> int:
+        """활성 DUR 데이터 전체를 다시 적재
+
+        Returns:
+            int: 적재된 상호작용 수
+        """
+        index: Dict[int, Dict[str, List[DUREntry]]] = {}
+        entries: Dict[int, DUREntry] = {}
+        watermark: Optional[datetime] = None
+
+        for row in session.execute(self._select_rows().where(DURInteraction.is_active.is_(True))):
+            entry = self._make_entry(row)
+            if entry is None:
+                continue
+            entries[entry.id] = entry
+            index.setdefault(entry.medication_id, {}).setdefault(entry.interacting_key, []).append(entry)
+            if row.updated_at and (watermark is None or row.updated_at > watermark):
+                watermark = row.updated_at
+
+        with self._lock:
+            self._index = index
+            self._entries = entries
+            self._watermark = watermark
+            self._loaded = True
+
+        logger.info(f"DUR 인덱스 적재 완료: {len(entries)}건")
+        return len(entries)
+
+    def refresh(self, session: Session) -> int:
+        """워터마크 이후 변경된 행만 인덱스에 반영
+
+        비활성화된 행은 인덱스에서 제거된다. 물리적으로 삭제된 행은 감지할 수 없으므로
+        주기적으로 `rebuild()`를 호출해야 한다.
+
+        Returns:
+            int: 반영된 행 수
+        """
+        if self._watermark is None:
+            return self.rebuild(session)
+
+        stmt = self._select_rows().where(DURInteraction.updated_at >= self._watermark)
+        rows = session.execute(stmt).all()
+
+        with self._lock:
+            for row in rows:
+                self._remove(row.id)
+                if row.is_active:
+                    entry = self._make_entry(row)
+                    if entry is not None:
+                        self._add(entry)
+                if row.updated_at and row.updated_at > self._watermark:
+                    self._watermark = row.updated_at
+
+        if rows:
+            logger.debug(f"DUR 인덱스 증분 반영: {len(rows)}건")
+        return len(rows)
+
+    def lookup(self, medication_id: int, ingredient: str) -> List[DUREntry]:
+        """약품과 상호작용 성분 쌍에 해당하는 DUR 항목 조회"""
+        key = normalize_ingredient(ingredient)
+        with self._lock:
+            return list(self._index.get(medication_id, {}).get(key, ()))
+
+    def check_medications(self, medications: Iterable[Tuple[int, str, Iterable[str]]]) -> List[DURAlert]:
+        """약품 목록 내 상호작용 점검
+
+        Args:
+            medications: (medication_id, 표시명, 성분/약품명 목록) 튜플
+
+        Returns:
+            List[DURAlert]: 심각도 순으로 정렬된 경고 목록
+        """
+        candidates = [
+            _MedicationKeys(med_id, name, self._keys_for(names), 0)
+            for med_id, name, names in medications
+        ]
+        return self._check(candidates, current_prescription_id=0)
+
+    def check_prescription(self, session: Session, prescription: Prescription,
+                           include_active: bool = True, today: Optional[date] = None) -> List[DURAlert]:
+        """처방전과 환자의 다른 복용 중 처방을 한 번에 점검
+
+        Args:
+            session: 데이터베이스 세션
+            prescription: 점검할 처방전
+            include_active: 환자의 다른 활성 처방 포함 여부
+            today: 복용 기간 판단 기준일
+
+        Returns:
+            List[DURAlert]: 심각도 순으로 정렬된 경고 목록
+        """
+        today = today or date.today()
+
+        stmt = (
+            select(
+                PrescriptionItem.prescription_id,
+                PrescriptionItem.medication_id,
+                PrescriptionItem.duration_days,
+                Prescription.prescribed_date,
+                Medication.name,
+                Medication.generic_name,
+            )
+            .join(Prescription, Prescription.id == PrescriptionItem.prescription_id)
+            .join(Medication, Medication.id == PrescriptionItem.medication_id)
+        )
+        if include_active:
+            stmt = stmt.where(
+                Prescription.patient_id == prescription.patient_id,
+                Prescription.status != 'cancelled',
+            )
+        else:
+            stmt = stmt.where(Prescription.id == prescription.id)
+
+        candidates: List[_MedicationKeys] = []
+        seen: Set[Tuple[int, int]] = set()
+        for row in session.execute(stmt):
+            is_current = row.prescription_id == prescription.id
+            if not is_current:
+                end_date = row.prescribed_date + timedelta(days=row.duration_days or 0)
+                if end_date < today:
+                    continue
+            marker = (row.medication_id, 1 if is_current else 0)
+            if marker in seen:
+                continue
+            seen.add(marker)
+            candidates.append(_MedicationKeys(
+                row.medication_id,
+                row.name,
+                self._keys_for((row.name, row.generic_name)),
+                row.prescription_id,
+            ))
+
+        return self._check(candidates, current_prescription_id=prescription.id)
+
+    def _check(self, candidates: List[_MedicationKeys], current_prescription_id: int) -> List[DURAlert]:
+        """후보 약품 쌍에 대해 인덱스 조회"""
+        alerts: List[DURAlert] = []
+        reported: Set[Tuple[int, int]] = set()
+
+        with self._lock:
+            for source in candidates:
+                by_key = self._index.get(source.medication_id)
+                if not by_key:
+                    continue
+                for target in candidates:
+                    if target.medication_id == source.medication_id:
+                        continue
+                    # 기존 처방끼리의 상호작용은 이미 점검된 것으로 간주
+                    is_current = (source.prescription_id == current_prescription_id
+                                  or target.prescription_id == current_prescription_id)
+                    if not is_current:
+                        continue
+                    for key in target.keys:
+                        for entry in by_key.get(key, ()):
+                            if (entry.id, target.medication_id) in reported:
+                                continue
+                            reported.add((entry.id, target.medication_id))
+                            alerts.append(DURAlert(
+                                medication_id=source.medication_id,
+                                medication_name=source.name,
+                                interacting_medication_id=target.medication_id,
+                                interacting_medication_name=target.name,
+                                interaction_type=entry.interaction_type,
+                                severity_level=entry.severity_level,
+                                description=entry.description,
+                                management=entry.management,
+                                interaction_id=entry.id,
+                                from_current_prescription=(source.prescription_id == current_prescription_id
+                                                           and target.prescription_id == current_prescription_id),
+                            ))
+
+        alerts.sort(key=lambda alert: SEVERITY_ORDER.get(alert.severity_level, len(SEVERITY_ORDER)))
+        return alerts
+
+    def _add(self, entry: DUREntry):
+        self._entries[entry.id] = entry
+        self._index.setdefault(entry.medication_id, {}).setdefault(entry.interacting_key, []).append(entry)
+
+    def _remove(self, interaction_id: int):
+        entry = self._entries.pop(interaction_id, None)
+        if entry is None:
+            return
+        by_key = self._index.get(entry.medication_id)
+        if not by_key:
+            return
+        bucket = [e for e in by_key.get(entry.interacting_key, ()) if e.id != interaction_id]
+        if bucket:
+            by_key[entry.interacting_key] = bucket
+        else:
+            by_key.pop(entry.interacting_key, None)
+            if not by_key:
+                self._index.pop(entry.medication_id, None)
+
+    @staticmethod
+    def _keys_for(names: Iterable[Optional[str]]) -> Tuple[str, ...]:
+        keys = []
+        for name in names:
+            key = normalize_ingredient(name)
+            if key and key not in keys:
+                keys.append(key)
+        return tuple(keys)
+
+    @staticmethod
+    def _select_rows():
+        return select(
+            DURInteraction.id,
+            DURInteraction.medication_id,
+            DURInteraction.interacting_medication,
+            DURInteraction.interaction_type,
+            DURInteraction.severity_level,
+            DURInteraction.description,
+            DURInteraction.management,
+            DURInteraction.is_active,
+            DURInteraction.updated_at,
+        )
+
+    @staticmethod
+    def _make_entry(row) -> Optional[DUREntry]:
+        key = normalize_ingredient(row.interacting_medication)
+        if not key:
+            return None
+        return DUREntry(
+            id=row.id,
+            medication_id=row.medication_id,
+            interacting_key=key,
+            interacting_medication=row.interacting_medication,
+            interaction_type=row.interaction_type,
+            severity_level=(row.severity_level or '').lower(),
+            description=row.description,
+            management=row.management,
+        )
+
+
+# 전역 DUR 인덱스 인스턴스
+_dur_index: Optional[DURIndex] = None
+
+
+def get_dur_index() -> DURIndex:
+    """DUR 인덱스 인스턴스 반환"""
+    global _dur_index
+
+    if _dur_index is None:
+        _dur_index = DURIndex()
+
+    return _dur_index
@@ -0,0 +1,630 @@
+"""
+CarePill 식약처 약품/DUR 데이터 일괄 반영
+대용량 CSV/XML/JSON 덤프(또는 API 페이지)를 한 건씩 읽어 일정 크기 묶음으로 upsert
+"""
+
+import codecs
+import csv
+import gzip
+import io
+import json
+import logging
+import re
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from xml.etree import ElementTree
+
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, case, exists, func, or_, select, tuple_, update
+
+from config import settings
+from database.config_service import ConfigService, get_config_service
+from database.database import DatabaseManager, get_db_manager
+from database.models import DURInteraction, Medication
+from utils.metrics import timed
+from .engine import get_dur_index
+
+logger = logging.getLogger(__name__)
+
+Record = Dict[str, Any]
+Source = Union[str, Path, Callable[[], Iterable[Record]]]
+
+LAST_IMPORT_KEY = 'kfda_last_import'
+SOURCE_NAME = 'KFDA'
+
+# 모델 필드 ← 원본 필드 (식약처 공공데이터 필드명, 모델 필드명 순, 대소문자 무시)
+MEDICATION_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'kfda_code': ('ITEM_SEQ', 'KFDA_CODE'),
+    'name': ('ITEM_NAME', 'NAME'),
+    'generic_name': ('MAIN_ITEM_INGR', 'ITEM_INGR_NAME', 'GENERIC_NAME'),
+    'manufacturer': ('ENTP_NAME', 'MANUFACTURER'),
+    'drug_code': ('EDI_CODE', 'DRUG_CODE'),
+    'dosage_form': ('FORM_CODE_NAME', 'DOSAGE_FORM'),
+    'storage_condition': ('STORAGE_METHOD', 'STORAGE_CONDITION'),
+    'shelf_life_months': ('VALID_TERM', 'SHELF_LIFE_MONTHS'),
+    'prescription_required': ('ETC_OTC_CODE', 'ETC_OTC_NAME', 'PRESCRIPTION_REQUIRED'),
+    'is_active': ('CANCEL_NAME', 'IS_ACTIVE'),
+}
+
+DUR_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'kfda_code': ('ITEM_SEQ', 'KFDA_CODE'),
+    'interacting_medication': ('MIXTURE_INGR_KOR_NAME', 'MIXTURE_ITEM_NAME', 'INTERACTING_MEDICATION'),
+    'interaction_type': ('TYPE_NAME', 'DUR_TYPE', 'INTERACTION_TYPE'),
+    'severity_level': ('SEVERITY_LEVEL',),
+    'description': ('PROHBT_CONTENT', 'DESCRIPTION'),
+    'clinical_effect': ('CLINICAL_EFFECT',),
+    'management': ('REMARK', 'MANAGEMENT'),
+    'source_date': ('NOTIFICATION_DATE', 'CHANGE_DATE', 'SOURCE_DATE'),
+}
+
+# DUR 유형명 → (interaction_type, 기본 심각도)
+DUR_TYPES = {
+    '병용금기': ('drug-drug', 'high'),
+    '효능군중복': ('duplicate-therapy', 'medium'),
+}
+
+DUR_KEY_COLUMNS = ('medication_id', 'interacting_medication', 'interaction_type')
+
+_INGREDIENT_CODE = re.compile(r'\[[^\]]*\]')
+_SHELF_LIFE = re.compile(r'(\d+)\s*(개월|년|month|year)?', re.IGNORECASE)
+
+
+class ImportResult(NamedTuple):
+    """데이터 반영 결과"""
+    dataset: str
+    processed: int                  # 읽은 레코드 수
+    changed: int                    # 새로 추가되거나 값이 바뀐 행 수
+    skipped: int                    # 필수 값 누락 등으로 건너뛴 레코드 수
+    deactivated: int                # 전체 덤프에서 빠져 비활성화된 행 수
+    elapsed: float
+
+
+# --- 스트리밍 읽기 ----------------------------------------------------------
+
+def _open_binary(path: Path):
+    if path.suffix.lower() == '.gz':
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def _data_suffix(path: Path) -> str:
+    suffixes = [s.lower() for s in path.suffixes]
+    if suffixes and suffixes[-1] == '.gz':
+        suffixes = suffixes[:-1]
+    return suffixes[-1] if suffixes else ''
+
+
+def _detect_encoding(path: Path) -> str:
+    """앞부분만 읽어 UTF-8 여부 판단 (식약처 CSV는 CP949인 경우가 많음)"""
+    with _open_binary(path) as stream:
+        head = stream.read(65536)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def iter_csv_records(path: Path) -> Iterator[Record]:
+    """CSV 레코드 스트리밍"""
+    with _open_binary(path) as raw:
+        text = io.TextIOWrapper(raw, encoding=_detect_encoding(path), newline='')
+        yield from csv.DictReader(text)
+
+
+def iter_xml_records(stream, record_tag: str = 'item') -> Iterator[Record]:
+    """
+    XML 레코드 스트리밍 (처리한 요소는 즉시 해제)
+
+    Args:
+        stream: 바이너리 스트림
+        record_tag: 레코드 요소 이름 (식약처 API 응답은 'item')
+    """
+    context = ElementTree.iterparse(stream, events=('start', 'end'))
+    _, root = next(context)
+    for event, element in context:
+        if event == 'end' and element.tag == record_tag:
+            yield {child.tag: (child.text or '').strip() for child in element}
+            element.clear()
+            root.clear()
+
+
+def iter_json_records(path: Path, chunk_size: int = 65536) -> Iterator[Record]:
+    """
+    JSON 레코드 스트리밍
+
+    최상위가 배열이면 원소를 하나씩 디코딩하고, 그 외에는 한 줄에 객체 하나인 JSON Lines로 읽는다.
+    """
+    decoder = json.JSONDecoder()
+    with _open_binary(path) as raw:
+        text = io.TextIOWrapper(raw, encoding='utf-8-sig')
+        buffer = text.read(chunk_size)
+        position = len(buffer) - len(buffer.lstrip())
+
+        if not buffer[position:position + 1] == '[':
+            for line in io.StringIO(buffer[position:] + text.readline()):
+                if line.strip():
+                    yield json.loads(line)
+            for line in text:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        position += 1
+        while True:
+            # 원소 사이의 공백과 쉼표 건너뛰기
+            while True:
+                while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                    position += 1
+                if position < len(buffer):
+                    break
+                more = text.read(chunk_size)
+                if not more:
+                    return
+                buffer, position = more, 0
+
+            if buffer[position] == ']':
+                return
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                more = text.read(chunk_size)
+                if not more:
+                    raise
+                buffer, position = buffer[position:] + more, 0
+                continue
+
+            yield record
+            if position > chunk_size:
+                buffer, position = buffer[position:], 0
+
+
+def iter_records(path: Union[str, Path]) -> Iterator[Record]:
+    """파일 확장자(.csv, .xml, .json, .jsonl, .gz 압축 포함)에 맞는 레코드 스트리밍"""
+    path = Path(path)
+    suffix = _data_suffix(path)
+    if suffix == '.csv':
+        return iter_csv_records(path)
+    if suffix == '.xml':
+        return _iter_xml_file(path)
+    if suffix in ('.json', '.jsonl', '.ndjson'):
+        return iter_json_records(path)
+    raise ValueError(f"지원하지 않는 데이터 파일 형식입니다: {path.name}")
+
+
+def _iter_xml_file(path: Path) -> Iterator[Record]:
+    with _open_binary(path) as stream:
+        yield from iter_xml_records(stream)
+
+
+def iter_api_records(url: str, service_key: str, page_size: int = 100,
+                     params: Optional[Dict[str, Any]] = None) -> Iterator[Record]:
+    """
+    공공데이터 API 페이지 순회 (XML 응답을 페이지 단위로 스트리밍)
+
+    Args:
+        url: API 주소
+        service_key: 인증키
+        page_size: 페이지당 레코드 수
+        params: 추가 요청 파라미터
+    """
+    import requests
+
+    page = 1
+    while True:
+        query = {'serviceKey': service_key, 'pageNo': page, 'numOfRows': page_size, 'type': 'xml', **(params or {})}
+        with requests.get(url, params=query, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            count = 0
+            for record in iter_xml_records(response.raw):
+                count += 1
+                yield record
+
+        if count < page_size:
+            return
+        page += 1
+
+
+# --- 레코드 변환 ------------------------------------------------------------
+
+def _pick(record: Record, aliases: Tuple[str, ...]) -> Optional[str]:
+    for alias in aliases:
+        value = record.get(alias)
+        if value is None:
+            continue
+        value = str(value).strip()
+        if value:
+            return value
+    return None
+
+
+def _upper_keys(record: Record) -> Record:
+    return {str(key).strip().upper(): value for key, value in record.items()}
+
+
+def _truncate(table: Table, row: Dict[str, Any]) -> Dict[str, Any]:
+    """문자열 컬럼 길이 초과분 잘라내기 (MySQL strict 모드 오류 방지)"""
+    for key, value in row.items():
+        if key not in table.c:
+            continue
+        length = getattr(table.c[key].type, 'length', None)
+        if length and isinstance(value, str) and len(value) > length:
+            row[key] = value[:length]
+    return row
+
+
+def parse_shelf_life(value: Optional[str]) -> Optional[int]:
+    """'제조일로부터 36 개월', '3년' 등을 개월 수로 변환"""
+    if not value:
+        return None
+    match = _SHELF_LIFE.search(value)
+    if not match:
+        return None
+    months = int(match.group(1))
+    unit = (match.group(2) or '').lower()
+    return months * 12 if unit in ('년', 'year') else months
+
+
+def parse_date(value: Optional[str]) -> Optional[date]:
+    """YYYYMMDD 또는 YYYY-MM-DD 날짜 변환"""
+    if not value:
+        return None
+    digits = re.sub(r'\D', '', value)[:8]
+    if len(digits) != 8:
+        return None
+    try:
+        return date(int(digits[:4]), int(digits[4:6]), int(digits[6:]))
+    except ValueError:
+        return None
+
+
+def _parse_flag(value: str, true_words: Tuple[str, ...], false_words: Tuple[str, ...]) -> Optional[bool]:
+    lowered = value.lower()
+    if lowered in ('true', '1', 'y', 'yes') or any(word in value for word in true_words):
+        return True
+    if lowered in ('false', '0', 'n', 'no') or any(word in value for word in false_words):
+        return False
+    return None
+
+
+def medication_row(record: Record) -> Optional[Dict[str, Any]]:
+    """약품 허가정보 레코드 → medications 행 (비어 있는 필드는 생략하여 기존 값 유지)"""
+    record = _upper_keys(record)
+    values = {field: _pick(record, aliases) for field, aliases in MEDICATION_FIELDS.items()}
+    if not values['kfda_code'] or not values['name']:
+        return None
+
+    row: Dict[str, Any] = {}
+    for field, value in values.items():
+        if value is None:
+            continue
+        if field == 'generic_name':
+            value = ', '.join(part.strip() for part in _INGREDIENT_CODE.sub('', value).split('|') if part.strip())
+        elif field == 'shelf_life_months':
+            value = parse_shelf_life(value)
+        elif field == 'prescription_required':
+            value = _parse_flag(value, ('전문',), ('일반',))
+        elif field == 'is_active':
+            # 허가 취소/취하 품목은 비활성화
+            value = _parse_flag(value, ('정상',), ('취소', '취하'))
+        if value is not None and value != '':
+            row[field] = value
+    return _truncate(Medication.__table__, row)
+
+
+def dur_row(record: Record) -> Optional[Dict[str, Any]]:
+    """DUR 레코드 → dur_interactions 행 (medication_id 대신 kfda_code 포함)"""
+    record = _upper_keys(record)
+    values = {field: _pick(record, aliases) for field, aliases in DUR_FIELDS.items()}
+    if not values['kfda_code'] or not values['interacting_medication'] or not values['interaction_type']:
+        return None
+
+    type_name = values['interaction_type']
+    interaction_type, default_severity = DUR_TYPES.get(type_name, (type_name, 'medium'))
+    row = {
+        'kfda_code': values['kfda_code'],
+        'interacting_medication': values['interacting_medication'],
+        'interaction_type': interaction_type,
+        'severity_level': (values['severity_level'] or default_severity).lower(),
+        'description': values['description'] or f"{type_name}: {values['interacting_medication']}",
+        'clinical_effect': values['clinical_effect'],
+        'management': values['management'],
+        'source': SOURCE_NAME,
+        'source_date': parse_date(values['source_date']),
+        'is_active': True,
+    }
+    return _truncate(DURInteraction.__table__, row)
+
+
+def _chunks(rows: Iterable[Optional[Dict[str, Any]]], size: int, counter: Dict[str, int]) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        counter['processed'] += 1
+        if row is None:
+            counter['skipped'] += 1
+            continue
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# --- 일괄 반영 --------------------------------------------------------------
+
+def _dialect_insert(connection):
+    name = connection.dialect.name
+    if name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif name in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        raise RuntimeError(f"upsert를 지원하지 않는 데이터베이스입니다: {name}")
+    return insert
+
+
+def upsert_rows(connection, table: Table, rows: List[Dict[str, Any]], key_columns: Tuple[str, ...]) -> int:
+    """
+    INSERT ... ON CONFLICT DO UPDATE (SQLite) / ON DUPLICATE KEY UPDATE (MySQL) 일괄 실행
+
+    값이 실제로 바뀐 행만 갱신하고 updated_at을 올리므로 updated_at 워터마크로 변경분만 추적할 수
+    있다(DURIndex.refresh). 행마다 제공된 컬럼이 다를 수 있어 컬럼 구성별로 나눠 executemany한다.
+
+    Returns:
+        int: 새로 추가되거나 값이 바뀐 행 수 (실행 결과의 rowcount 기준)
+    """
+    insert = _dialect_insert(connection)
+    is_sqlite = connection.dialect.name == 'sqlite'
+    now = datetime.utcnow()
+    changed_rows = 0
+
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    for columns, group in groups.items():
+        stmt = insert(table)
+        incoming = stmt.excluded if is_sqlite else stmt.inserted
+        update_columns = [c for c in columns if c not in key_columns]
+        changed = or_(*(incoming[c].is_distinct_from(table.c[c]) for c in update_columns))
+        values = {c: incoming[c] for c in update_columns}
+        if is_sqlite:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(key_columns), set_={**values, 'updated_at': now}, where=changed
+            )
+        else:
+            # MySQL은 할당을 왼쪽부터 적용하므로 값을 바꾸기 전에 updated_at부터 판단
+            stmt = stmt.on_duplicate_key_update(
+                [('updated_at', case((changed, now), else_=table.c.updated_at))] + list(values.items())
+            )
+
+        if is_sqlite:
+            # 추가 1, 갱신 1, where 조건으로 건너뛴 행 0
+            changed_rows += connection.execute(stmt, group).rowcount
+        else:
+            # SQLAlchemy의 MySQL 드라이버는 CLIENT_FOUND_ROWS를 켜므로 추가 1, 갱신 2, 값이 같은 행 1.
+            # 이미 있던 키 수를 빼면 (추가 + 갱신) 행 수가 됨
+            keys = [tuple(row[c] for c in key_columns) for row in group]
+            existing = connection.scalar(
+                select(func.count()).select_from(table)
+                .where(tuple_(*(table.c[c] for c in key_columns)).in_(keys))
+            ) or 0
+            changed_rows += connection.execute(stmt, group).rowcount - existing
+    return changed_rows
+
+
+class KFDAImporter:
+    """식약처 약품 허가정보/DUR 데이터 반영기
+
+    레코드는 스트리밍으로 읽고 chunk_size 단위로 upsert 후 커밋하므로 메모리 사용량과 쓰기 잠금
+    유지 시간이 덤프 크기와 무관하다. 값이 바뀌지 않은 행은 갱신하지 않으므로 같은 덤프를 다시
+    반영해도 실제 변경분만 기록된다.
+    """
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None,
+                 config_service: Optional[ConfigService] = None, chunk_size: Optional[int] = None):
+        """
+        Args:
+            db_manager: 데이터베이스 매니저 (기본값: 전역 매니저)
+            config_service: 마지막 반영 시각을 기록할 설정 서비스 (기본값: 전역 설정 서비스)
+            chunk_size: upsert 묶음 크기 (기본값: settings.KFDA_IMPORT_CHUNK_SIZE)
+        """
+        self.db_manager = db_manager or get_db_manager()
+        self._config_service = config_service
+        self.chunk_size = max(1, chunk_size or settings.KFDA_IMPORT_CHUNK_SIZE)
+
+    @property
+    def config_service(self) -> ConfigService:
+        if self._config_service is None:
+            self._config_service = get_config_service()
+        return self._config_service
+
+    @timed('dur.import_medications', module='dur')
+    def import_medications(self, source: Source) -> ImportResult:
+        """
+        약품 허가정보 반영 (kfda_code 기준 upsert)
+
+        Args:
+            source: 덤프 파일 경로 또는 레코드를 내는 함수
+        """
+        started = time.perf_counter()
+        counter = {'processed': 0, 'skipped': 0}
+        table = Medication.__table__
+        changed = 0
+
+        with self.db_manager.engine.connect() as connection:
+            rows = (medication_row(record) for record in self._records(source))
+            for chunk in _chunks(rows, self.chunk_size, counter):
+                unique = {row['kfda_code']: row for row in chunk}
+                changed += upsert_rows(connection, table, list(unique.values()), ('kfda_code',))
+                connection.commit()
+
+        result = ImportResult('medications', counter['processed'], changed, counter['skipped'], 0,
+                              time.perf_counter() - started)
+        logger.info(f"약품 허가정보 반영 완료: {result.processed}건 중 {result.changed}건 변경, "
+                    f"{result.skipped}건 제외 ({result.elapsed:.1f}초)")
+        return result
+
+    @timed('dur.import_interactions', module='dur')
+    def import_dur_interactions(self, source: Source, full_snapshot: bool = False) -> ImportResult:
+        """
+        DUR 상호작용 반영 ((medication_id, interacting_medication, interaction_type) 기준 upsert)
+
+        Args:
+            source: 덤프 파일 경로 또는 레코드를 내는 함수
+            full_snapshot: 전체 덤프 여부 (True면 덤프에 없는 식약처 출처 활성 행을 비활성화)
+        """
+        started = time.perf_counter()
+        counter = {'processed': 0, 'skipped': 0}
+        table = DURInteraction.__table__
+        changed = deactivated = 0
+
+        with self.db_manager.engine.connect() as connection:
+            seen = self._create_seen_table(connection) if full_snapshot else None
+
+            rows = (dur_row(record) for record in self._records(source))
+            for chunk in _chunks(rows, self.chunk_size, counter):
+                resolved = self._resolve_medications(connection, chunk, counter)
+                if resolved:
+                    changed += upsert_rows(connection, table, resolved, DUR_KEY_COLUMNS)
+                    if seen is not None:
+                        connection.execute(seen.insert(), [{c: row[c] for c in DUR_KEY_COLUMNS} for row in resolved])
+                connection.commit()
+
+            if seen is not None:
+                # 읽은 레코드가 없으면(빈 파일, 다운로드 실패) 전체 비활성화를 막음
+                if counter['processed'] > counter['skipped']:
+                    deactivated = self._deactivate_missing(connection, table, seen)
+                seen.drop(connection)
+                connection.commit()
+
+        self._refresh_dur_index()
+        result = ImportResult('dur_interactions', counter['processed'], changed, counter['skipped'], deactivated,
+                              time.perf_counter() - started)
+        logger.info(f"DUR 데이터 반영 완료: {result.processed}건 중 {result.changed}건 변경, "
+                    f"{result.skipped}건 제외, {result.deactivated}건 비활성화 ({result.elapsed:.1f}초)")
+        return result
+
+    def refresh_if_due(self, force: bool = False) -> List[ImportResult]:
+        """
+        DUR_UPDATE_INTERVAL이 지났으면 설정된 소스에서 약품/DUR 데이터 반영
+
+        Returns:
+            List[ImportResult]: 반영 결과 (주기가 아니거나 소스가 없으면 빈 목록)
+        """
+        if not force and not self.is_due():
+            return []
+
+        drug_source = self._configured_source(settings.KFDA_DRUG_DATA_PATH, settings.DRUG_INFO_API_URL)
+        dur_source = self._configured_source(settings.KFDA_DUR_DATA_PATH, settings.DUR_INFO_API_URL)
+        if drug_source is None and dur_source is None:
+            return []
+
+        results = []
+        if drug_source is not None:
+            results.append(self.import_medications(drug_source))
+        if dur_source is not None:
+            results.append(self.import_dur_interactions(dur_source, full_snapshot=True))
+
+        self.config_service.set(LAST_IMPORT_KEY, datetime.utcnow().isoformat(timespec='seconds'),
+                                category='dur', description='식약처 데이터 마지막 반영 시각 (UTC)')
+        return results
+
+    def is_due(self, now: Optional[datetime] = None) -> bool:
+        """마지막 반영 후 DUR_UPDATE_INTERVAL 경과 여부"""
+        last = self.config_service.get(LAST_IMPORT_KEY)
+        if not last:
+            return True
+        try:
+            last_import = datetime.fromisoformat(str(last))
+        except ValueError:
+            return True
+        return (now or datetime.utcnow()) - last_import >= timedelta(hours=settings.DUR_UPDATE_INTERVAL)
+
+    @staticmethod
+    def _configured_source(path: str, api_url: str) -> Optional[Source]:
+        if path:
+            if Path(path).exists():
+                return path
+            logger.warning(f"식약처 데이터 파일을 찾을 수 없습니다: {path}")
+            return None
+        if settings.KFDA_API_KEY and api_url:
+            return lambda: iter_api_records(api_url, settings.KFDA_API_KEY)
+        return None
+
+    @staticmethod
+    def _records(source: Source) -> Iterable[Record]:
+        if callable(source):
+            return source()
+        return iter_records(source)
+
+    @staticmethod
+    def _resolve_medications(connection, chunk: List[Dict[str, Any]], counter: Dict[str, int]) -> List[Dict[str, Any]]:
+        """kfda_code → medication_id 변환 (묶음당 조회 1회, 등록되지 않은 약품은 제외)"""
+        codes = {row['kfda_code'] for row in chunk}
+        ids = dict(connection.execute(
+            select(Medication.kfda_code, Medication.id).where(Medication.kfda_code.in_(codes))
+        ).all())
+
+        resolved: Dict[Tuple, Dict[str, Any]] = {}
+        for row in chunk:
+            medication_id = ids.get(row.pop('kfda_code'))
+            if medication_id is None:
+                counter['skipped'] += 1
+                continue
+            row['medication_id'] = medication_id
+            resolved[tuple(row[c] for c in DUR_KEY_COLUMNS)] = row
+        return list(resolved.values())
+
+    @staticmethod
+    def _create_seen_table(connection) -> Table:
+        """이번 덤프에 포함된 DUR 키를 담을 임시 테이블 (메모리 대신 DB에 누적)"""
+        seen = Table(
+            'dur_import_seen', MetaData(),
+            Column('medication_id', Integer, nullable=False),
+            Column('interacting_medication', String(200), nullable=False),
+            Column('interaction_type', String(50), nullable=False),
+            Index('idx_dur_import_seen_pair', 'medication_id', 'interacting_medication', 'interaction_type'),
+            prefixes=['TEMPORARY'],
+        )
+        seen.drop(connection, checkfirst=True)
+        seen.create(connection)
+        return seen
+
+    @staticmethod
+    def _deactivate_missing(connection, table: Table, seen: Table) -> int:
+        result = connection.execute(
+            update(table)
+            .where(
+                table.c.is_active.is_(True),
+                table.c.source == SOURCE_NAME,
+                ~exists().where(*(seen.c[c] == table.c[c] for c in DUR_KEY_COLUMNS)),
+            )
+            .values(is_active=False, updated_at=datetime.utcnow())
+        )
+        return result.rowcount or 0
+
+    def _refresh_dur_index(self):
+        """적재된 DUR 인덱스가 있으면 변경분만 반영"""
+        index = get_dur_index()
+        if not index.loaded:
+            return
+        with self.db_manager.session_scope() as session:
+            index.refresh(session)
+
+
+# 전역 반영기 인스턴스
+_importer: Optional[KFDAImporter] = None
+
+
+def get_kfda_importer() -> KFDAImporter:
+    """식약처 데이터 반영기 인스턴스 반환"""
+    global _importer
+
+    if _importer is None:
+        _importer = KFDAImporter()
+
+    return _importer
@@ -0,0 +1,27 @@
+"""
+CarePill 재고 관리 모듈
+"""
+
+from .dispensing import (
+    DispensingAllocator,
+    Allocation,
+    DispensingResult,
+    InsufficientStockError,
+    get_dispensing_allocator
+)
+from .stock import (
+    StockTracker,
+    StockAlert,
+    get_stock_tracker
+)
+
+__all__ = [
+    'DispensingAllocator',
+    'Allocation',
+    'DispensingResult',
+    'InsufficientStockError',
+    'get_dispensing_allocator',
+    'StockTracker',
+    'StockAlert',
+    'get_stock_tracker'
+]
@@ -0,0 +1,250 @@
+"""
+CarePill 조제 배치 할당 엔진
+처방 항목 수량을 유효기간이 빠른 배치부터(FEFO) 할당하고 단일 트랜잭션으로 재고를 차감
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import Connection, bindparam, func, select, update
+
+from database.database import DatabaseManager, get_db_manager
+from database.models import DispensingRecord, InventoryItem, Prescription, PrescriptionItem
+from utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientStockError(RuntimeError):
+    """유효한 재고가 처방 수량보다 부족할 때 발생"""
+
+    def __init__(self, shortages: Dict[int, int]):
+        self.shortages = shortages
+        details = ', '.join(f"약품 {med_id}: {qty}개 부족" for med_id, qty in shortages.items())
+        super().__init__(f"재고 부족으로 조제할 수 없습니다 ({details})")
+
+
+class Allocation(NamedTuple):
+    """배치 할당 결과"""
+    prescription_item_id: int
+    medication_id: int
+    inventory_item_id: int
+    batch_number: str
+    expiry_date: date
+    quantity: int
+
+
+class DispensingResult(NamedTuple):
+    """처방전 조제 결과"""
+    prescription_id: int
+    allocations: List[Allocation]
+    shortages: Dict[int, int]
+    fully_dispensed: bool
+
+
+class DispensingAllocator:
+    """FEFO(First-Expiry-First-Out) 조제 할당기
+
+    처방 항목 조회, 배치 조회(약품 집합당 1회), 재고 차감/조제 기록 삽입을 하나의 트랜잭션에서
+    수행한다. SQLite는 `BEGIN IMMEDIATE`로 쓰기 잠금을 먼저 잡고, MySQL은 `SELECT ... FOR UPDATE`로
+    배치 행을 잠가 동시 조제 시 같은 재고가 중복 할당되지 않도록 한다.
+    """
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, stock_tracker=None):
+        """
+        Args:
+            db_manager: 데이터베이스 매니저 (기본값: 전역 매니저)
+            stock_tracker: 조제 결과를 반영할 재고 집계 (StockTracker)
+        """
+        self.db_manager = db_manager or get_db_manager()
+        self.stock_tracker = stock_tracker
+
+    @timed('inventory.dispense_prescription', module='inventory')
+    def dispense_prescription(self, prescription_id: int, dispensed_by: str,
+                              allow_partial: bool = False, today: Optional[date] = None) -> DispensingResult:
+        """
+        처방전 전체를 조제
+
+        Args:
+            prescription_id: 처방전 ID
+            dispensed_by: 조제자
+            allow_partial: 재고 부족 시 가능한 만큼만 조제할지 여부
+            today: 유효기간 판단 기준일
+
+        Returns:
+            DispensingResult: 조제 결과
+
+        Raises:
+            InsufficientStockError: allow_partial=False이고 재고가 부족한 경우
+        """
+        today = today or date.today()
+        now = datetime.utcnow()
+
+        with self.db_manager.write_transaction() as connection:
+            items = connection.execute(
+                select(
+                    PrescriptionItem.id,
+                    PrescriptionItem.medication_id,
+                    PrescriptionItem.quantity,
+                    PrescriptionItem.dispensed_quantity,
+                )
+                .where(PrescriptionItem.prescription_id == prescription_id)
+                .order_by(PrescriptionItem.id)
+            ).all()
+
+            if not items:
+                raise ValueError(f"처방 항목이 없는 처방전입니다: {prescription_id}")
+
+            remaining = {
+                item.id: item.quantity - (item.dispensed_quantity or 0)
+                for item in items
+                if item.quantity - (item.dispensed_quantity or 0) > 0
+            }
+            medication_ids = sorted({item.medication_id for item in items if item.id in remaining})
+
+            batches_by_medication = self._load_batches(connection, medication_ids, today)
+            allocations, shortages = self._allocate(items, remaining, batches_by_medication)
+
+            if shortages and not allow_partial:
+                raise InsufficientStockError(shortages)
+
+            if allocations:
+                self._apply(connection, prescription_id, allocations, dispensed_by, now, today)
+
+            fully_dispensed = not shortages
+            if fully_dispensed:
+                connection.execute(
+                    update(Prescription)
+                    .where(Prescription.id == prescription_id)
+                    .values(status='dispensed', updated_at=now)
+                )
+
+        if self.stock_tracker is not None and allocations:
+            self.stock_tracker.record_dispense(allocations)
+
+        logger.info(f"처방전 {prescription_id} 조제 완료: {len(allocations)}개 배치 할당"
+                    + (f", 부족 {shortages}" if shortages else ""))
+        return DispensingResult(prescription_id, allocations, shortages, fully_dispensed)
+
+    def _load_batches(self, connection: Connection, medication_ids: List[int], today: date) -> Dict[int, List[list]]:
+        """약품 집합의 사용 가능한 배치를 유효기간 순으로 한 번에 조회"""
+        if not medication_ids:
+            return {}
+
+        stmt = (
+            select(
+                InventoryItem.id,
+                InventoryItem.medication_id,
+                InventoryItem.batch_number,
+                InventoryItem.expiry_date,
+                InventoryItem.quantity,
+            )
+            .where(
+                InventoryItem.medication_id.in_(medication_ids),
+                InventoryItem.is_active.is_(True),
+                InventoryItem.quantity > 0,
+                InventoryItem.expiry_date >= today,
+            )
+            .order_by(InventoryItem.medication_id, InventoryItem.expiry_date, InventoryItem.id)
+        )
+        if connection.dialect.name != 'sqlite':
+            stmt = stmt.with_for_update()
+
+        batches: Dict[int, List[list]] = {}
+        for row in connection.execute(stmt):
+            # [id, batch_number, expiry_date, 남은 수량]
+            batches.setdefault(row.medication_id, []).append(
+                [row.id, row.batch_number, row.expiry_date, row.quantity]
+            )
+        return batches
+
+    @staticmethod
+    def _allocate(items, remaining: Dict[int, int],
+                  batches_by_medication: Dict[int, List[list]]):
+        """처방 항목 순서대로 FEFO 할당"""
+        allocations: List[Allocation] = []
+        shortages: Dict[int, int] = {}
+
+        for item in items:
+            needed = remaining.get(item.id, 0)
+            if needed <= 0:
+                continue
+            for batch in batches_by_medication.get(item.medication_id, ()):
+                if needed == 0:
+                    break
+                available = batch[3]
+                if available <= 0:
+                    continue
+                taken = min(available, needed)
+                batch[3] -= taken
+                needed -= taken
+                allocations.append(Allocation(item.id, item.medication_id, batch[0], batch[1], batch[2], taken))
+            if needed > 0:
+                shortages[item.medication_id] = shortages.get(item.medication_id, 0) + needed
+
+        return allocations, shortages
+
+    @staticmethod
+    def _apply(connection: Connection, prescription_id: int, allocations: List[Allocation],
+               dispensed_by: str, now: datetime, today: date):
+        """재고 차감, 조제 기록 삽입, 처방 항목 갱신을 일괄 실행"""
+        inventory_table = InventoryItem.__table__
+        result = connection.execute(
+            update(inventory_table)
+            .where(
+                inventory_table.c.id == bindparam('b_id'),
+                inventory_table.c.quantity >= bindparam('b_quantity'),
+            )
+            .values(
+                quantity=inventory_table.c.quantity - bindparam('b_quantity'),
+                updated_at=now,
+            ),
+            [{'b_id': a.inventory_item_id, 'b_quantity': a.quantity} for a in allocations],
+        )
+        if result.rowcount is not None and 0 <= result.rowcount < len(allocations):
+            raise RuntimeError(f"처방전 {prescription_id} 조제 중 재고가 변경되었습니다. 다시 시도하세요.")
+
+        connection.execute(
+            DispensingRecord.__table__.insert(),
+            [
+                {
+                    'prescription_item_id': a.prescription_item_id,
+                    'inventory_item_id': a.inventory_item_id,
+                    'quantity_dispensed': a.quantity,
+                    'dispensed_by': dispensed_by,
+                    'dispensed_at': now,
+                }
+                for a in allocations
+            ],
+        )
+
+        dispensed: Dict[int, int] = {}
+        for a in allocations:
+            dispensed[a.prescription_item_id] = dispensed.get(a.prescription_item_id, 0) + a.quantity
+
+        item_table = PrescriptionItem.__table__
+        connection.execute(
+            update(item_table)
+            .where(item_table.c.id == bindparam('b_id'))
+            .values(
+                dispensed_quantity=func.coalesce(item_table.c.dispensed_quantity, 0) + bindparam('b_quantity'),
+                dispensed_date=today,
+            ),
+            [{'b_id': item_id, 'b_quantity': quantity} for item_id, quantity in dispensed.items()],
+        )
+
+
+# 전역 조제 할당기 인스턴스
+_allocator: Optional[DispensingAllocator] = None
+
+
+def get_dispensing_allocator() -> DispensingAllocator:
+    """조제 할당기 인스턴스 반환"""
+    global _allocator
+
+    if _allocator is None:
+        from .stock import get_stock_tracker
+        _allocator = DispensingAllocator(stock_tracker=get_stock_tracker())
+
+    return _allocator
@@ -0,0 +1,300 @@
+"""
+CarePill 재고 집계 및 경보
+약품별 사용 가능 재고를 메모리에 유지하고 입고/조제 시 증분 갱신, 변경분만 점검하여 재고 부족·유효기간 임박 경보 생성
+"""
+
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from sqlalchemy import func, select
+
+from database.config_service import ConfigService, get_config_service
+from database.database import DatabaseManager, get_db_manager
+from database.models import InventoryItem, Medication
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOW_THRESHOLD = 10
+DEFAULT_EXPIRY_WARNING_DAYS = 30
+
+
+class StockAlert(NamedTuple):
+    """재고 경보"""
+    kind: str                       # 'low_stock' | 'expiring_soon'
+    medication_id: int
+    quantity: int
+    message: str
+    inventory_item_id: Optional[int] = None
+    expiry_date: Optional[date] = None
+
+
+class StockTracker:
+    """약품별 재고 집계
+
+    시작 시 GROUP BY 한 번으로 집계를 적재한 뒤에는 입고(record_intake)와 조제(record_dispense)로
+    증분 갱신한다. 재고 부족 점검은 변경된 약품만, 유효기간 점검은 지난 점검 이후 경고 구간에 새로
+    들어온 유효기간 범위만 idx_inventory_expiry_date 순서로 조회하므로 점검 비용은 변경량에 비례한다.
+    """
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None,
+                 config_service: Optional[ConfigService] = None):
+        """
+        Args:
+            db_manager: 데이터베이스 매니저 (기본값: 전역 매니저)
+            config_service: 임계값을 읽을 설정 서비스 (기본값: 전역 설정 서비스)
+        """
+        self.db_manager = db_manager or get_db_manager()
+        self.config_service = config_service or get_config_service()
+
+        self._totals: Dict[int, int] = {}
+        self._dirty: Set[int] = set()
+        self._low: Set[int] = set()
+        self._pending_alerts: List[StockAlert] = []
+        self._scanned_date: Optional[date] = None
+        self._expiry_horizon: Optional[date] = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+        self.config_service.subscribe(self._on_threshold_changed, 'inventory_low_threshold')
+        self.config_service.subscribe(self._on_expiry_days_changed, 'expiry_warning_days')
+
+    @property
+    def low_threshold(self) -> int:
+        return self.config_service.get_int('inventory_low_threshold', DEFAULT_LOW_THRESHOLD)
+
+    @property
+    def expiry_warning_days(self) -> int:
+        return self.config_service.get_int('expiry_warning_days', DEFAULT_EXPIRY_WARNING_DAYS)
+
+    def rebuild(self, today: Optional[date] = None):
+        """사용 가능 재고(활성, 유효기간 내) 집계를 단일 쿼리로 다시 적재"""
+        today = today or date.today()
+
+        with self.db_manager.session_scope() as session:
+            rows = session.execute(
+                select(InventoryItem.medication_id, func.sum(InventoryItem.quantity))
+                .where(
+                    InventoryItem.is_active.is_(True),
+                    InventoryItem.quantity > 0,
+                    InventoryItem.expiry_date >= today,
+                )
+                .group_by(InventoryItem.medication_id)
+            ).all()
+            medication_ids = session.execute(
+                select(Medication.id).where(Medication.is_active.is_(True))
+            ).scalars().all()
+
+        with self._lock:
+            self._totals = {medication_id: 0 for medication_id in medication_ids}
+            self._totals.update({medication_id: int(total or 0) for medication_id, total in rows})
+            self._dirty = set(self._totals)
+            self._low.clear()
+            self._scanned_date = today
+            self._expiry_horizon = None
+            self._loaded = True
+
+        logger.info(f"재고 집계 적재 완료: 약품 {len(self._totals)}종")
+
+    def get_quantity(self, medication_id: int) -> int:
+        """약품의 사용 가능 재고 수량"""
+        self._ensure_loaded()
+        return self._totals.get(medication_id, 0)
+
+    def summary(self) -> Dict[int, int]:
+        """약품별 사용 가능 재고 수량"""
+        self._ensure_loaded()
+        with self._lock:
+            return dict(self._totals)
+
+    def low_stock_count(self) -> int:
+        """마지막 scan() 기준 재고 부족 약품 수"""
+        with self._lock:
+            return len(self._low)
+
+    def record_intake(self, medication_id: int, quantity: int, expiry_date: date,
+                      inventory_item_id: Optional[int] = None, today: Optional[date] = None):
+        """입고 반영"""
+        today = today or date.today()
+        self._ensure_loaded()
+        if quantity <= 0 or expiry_date < today:
+            return
+
+        with self._lock:
+            self._totals[medication_id] = self._totals.get(medication_id, 0) + quantity
+            self._dirty.add(medication_id)
+            # 이미 점검한 경고 구간 안으로 입고된 배치는 다음 범위 조회에 잡히지 않으므로 바로 경보
+            if self._expiry_horizon is not None and expiry_date <= self._expiry_horizon:
+                self._pending_alerts.append(
+                    self._expiring_alert(medication_id, quantity, inventory_item_id, expiry_date, today)
+                )
+
+    def record_dispense(self, allocations: Iterable):
+        """조제 반영 (DispensingAllocator의 Allocation 목록)"""
+        self._ensure_loaded()
+        with self._lock:
+            for allocation in allocations:
+                medication_id = allocation.medication_id
+                self._totals[medication_id] = max(0, self._totals.get(medication_id, 0) - allocation.quantity)
+                self._dirty.add(medication_id)
+
+    def receive_stock(self, medication_id: int, batch_number: str, expiry_date: date, quantity: int,
+                      **fields) -> int:
+        """
+        배치 입고 후 집계 반영
+
+        Args:
+            medication_id: 약품 ID
+            batch_number: 배치번호
+            expiry_date: 유효기간
+            quantity: 입고 수량
+            **fields: InventoryItem의 기타 컬럼 (supplier, storage_location 등)
+
+        Returns:
+            int: 생성된 재고 항목 ID
+        """
+        with self.db_manager.session_scope() as session:
+            item = InventoryItem(
+                medication_id=medication_id,
+                batch_number=batch_number,
+                expiry_date=expiry_date,
+                quantity=quantity,
+                initial_quantity=fields.pop('initial_quantity', quantity),
+                **fields
+            )
+            session.add(item)
+            session.flush()
+            item_id = item.id
+
+        self.record_intake(medication_id, quantity, expiry_date, item_id)
+        return item_id
+
+    def scan(self, today: Optional[date] = None) -> List[StockAlert]:
+        """
+        변경분에 대한 재고 경보 점검
+
+        Args:
+            today: 기준일
+
+        Returns:
+            List[StockAlert]: 새로 발생한 경보
+        """
+        today = today or date.today()
+        self._ensure_loaded()
+
+        alerts: List[StockAlert] = []
+        with self._lock:
+            alerts.extend(self._pending_alerts)
+            self._pending_alerts.clear()
+
+        alerts.extend(self._scan_expiry_window(today))
+
+        threshold = self.low_threshold
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            for medication_id in sorted(dirty):
+                quantity = self._totals.get(medication_id, 0)
+                if quantity <= threshold:
+                    # 부족 상태로 들어설 때 한 번만 경보
+                    if medication_id not in self._low:
+                        self._low.add(medication_id)
+                        alerts.append(StockAlert(
+                            'low_stock', medication_id, quantity,
+                            f"약품 {medication_id} 재고 부족: {quantity}개 (기준 {threshold}개)"
+                        ))
+                else:
+                    self._low.discard(medication_id)
+
+        if alerts:
+            logger.info(f"재고 경보 {len(alerts)}건 발생")
+        return alerts
+
+    def _scan_expiry_window(self, today: date) -> List[StockAlert]:
+        """지난 점검 이후 만료된 배치와 새로 경고 구간에 들어온 배치만 범위 조회"""
+        horizon = today + timedelta(days=self.expiry_warning_days)
+
+        with self._lock:
+            scanned_date = self._scanned_date or today
+            previous_horizon = self._expiry_horizon
+
+        with self.db_manager.session_scope() as session:
+            expired = []
+            if scanned_date < today:
+                expired = session.execute(
+                    select(InventoryItem.medication_id, InventoryItem.quantity)
+                    .where(
+                        InventoryItem.expiry_date >= scanned_date,
+                        InventoryItem.expiry_date < today,
+                        InventoryItem.is_active.is_(True),
+                        InventoryItem.quantity > 0,
+                    )
+                    .order_by(InventoryItem.expiry_date)
+                ).all()
+
+            lower = today if previous_horizon is None else max(today, previous_horizon + timedelta(days=1))
+            expiring = []
+            if lower <= horizon:
+                expiring = session.execute(
+                    select(InventoryItem.id, InventoryItem.medication_id,
+                           InventoryItem.quantity, InventoryItem.expiry_date)
+                    .where(
+                        InventoryItem.expiry_date >= lower,
+                        InventoryItem.expiry_date <= horizon,
+                        InventoryItem.is_active.is_(True),
+                        InventoryItem.quantity > 0,
+                    )
+                    .order_by(InventoryItem.expiry_date)
+                ).all()
+
+        with self._lock:
+            # 유효기간이 지난 배치는 사용 가능 재고에서 제외
+            for medication_id, quantity in expired:
+                self._totals[medication_id] = max(0, self._totals.get(medication_id, 0) - quantity)
+                self._dirty.add(medication_id)
+            self._scanned_date = today
+            self._expiry_horizon = horizon
+
+        return [
+            self._expiring_alert(row.medication_id, row.quantity, row.id, row.expiry_date, today)
+            for row in expiring
+        ]
+
+    @staticmethod
+    def _expiring_alert(medication_id: int, quantity: int, inventory_item_id: Optional[int],
+                        expiry_date: date, today: date) -> StockAlert:
+        days_left = (expiry_date - today).days
+        return StockAlert(
+            'expiring_soon', medication_id, quantity,
+            f"약품 {medication_id} 배치 {inventory_item_id} 유효기간 임박: {expiry_date} ({days_left}일 남음, {quantity}개)",
+            inventory_item_id, expiry_date
+        )
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self.rebuild()
+
+    def _on_threshold_changed(self, key, old_value, new_value):
+        with self._lock:
+            self._dirty = set(self._totals)
+            self._low.clear()
+
+    def _on_expiry_days_changed(self, key, old_value, new_value):
+        with self._lock:
+            self._expiry_horizon = None
+
+
+# 전역 재고 집계 인스턴스
+_stock_tracker: Optional[StockTracker] = None
+
+
+def get_stock_tracker() -> StockTracker:
+    """재고 집계 인스턴스 반환"""
+    global _stock_tracker
+
+    if _stock_tracker is None:
+        _stock_tracker = StockTracker()
+
+    return _stock_tracker
@@ -0,0 +1,28 @@
+"""
+CarePill OCR 처리 모듈
+"""
+
+from .engine import run_ocr, is_available
+from .preprocess import OCRPreprocessor, PreprocessResult, preprocess_for_ocr
+from .pipeline import (
+    OCRPipeline,
+    STATUS_PENDING,
+    STATUS_PROCESSING,
+    STATUS_COMPLETED,
+    STATUS_LOW_CONFIDENCE,
+    STATUS_FAILED
+)
+
+__all__ = [
+    'run_ocr',
+    'is_available',
+    'OCRPreprocessor',
+    'PreprocessResult',
+    'preprocess_for_ocr',
+    'OCRPipeline',
+    'STATUS_PENDING',
+    'STATUS_PROCESSING',
+    'STATUS_COMPLETED',
+    'STATUS_LOW_CONFIDENCE',
+    'STATUS_FAILED'
+]
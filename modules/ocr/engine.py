@@ -0,0 +1,117 @@
+"""
+CarePill OCR 엔진
+Tesseract 호출을 담당하며 작업 프로세스(ProcessPoolExecutor)에서 실행되는 함수만 포함
+"""
+
+import os
+import shutil
+import time
+from typing import Any, Dict, Optional
+
+# 작업 프로세스별 Tesseract 설정 (initialize_worker에서 지정)
+_worker_config: Dict[str, Any] = {}
+
+
+def is_available(tesseract_path: Optional[str] = None) -> bool:
+    """pytesseract와 Tesseract 실행 파일 사용 가능 여부"""
+    try:
+        import pytesseract  # noqa: F401
+    except ImportError:
+        return False
+    return bool((tesseract_path and os.path.exists(tesseract_path)) or shutil.which('tesseract'))
+
+
+def initialize_worker(tesseract_path: Optional[str], languages: str, tessdata_path: Optional[str] = None,
+                      preprocess: bool = False):
+    """
+    작업 프로세스 초기화
+
+    프로세스 수만큼 코어를 나눠 쓰므로 Tesseract 내부 OpenMP 스레드는 1개로 제한한다.
+    전처리기는 프로세스마다 하나를 만들어 버퍼를 작업 간에 재사용한다.
+    """
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    if tessdata_path and os.path.isdir(tessdata_path):
+        os.environ.setdefault('TESSDATA_PREFIX', tessdata_path)
+
+    import pytesseract
+    if tesseract_path:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+
+    _worker_config['languages'] = languages
+    _worker_config['preprocessor'] = None
+    if preprocess:
+        try:
+            from .preprocess import OCRPreprocessor
+            _worker_config['preprocessor'] = OCRPreprocessor()
+        except ImportError:
+            # OpenCV가 없으면 원본 이미지로 OCR
+            pass
+
+
+def load_image(image_path: str):
+    """OCR 입력 이미지 로드 (OpenCV가 없으면 Pillow 사용)"""
+    try:
+        import cv2
+        image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            raise ValueError(f"이미지를 읽을 수 없습니다: {image_path}")
+        return image
+    except ImportError:
+        from PIL import Image
+        with Image.open(image_path) as image:
+            return image.convert('L').copy()
+
+
+def run_ocr(job_id: int, image_path: str, languages: Optional[str] = None) -> Dict[str, Any]:
+    """
+    이미지 한 장에 대해 OCR 실행 (작업 프로세스에서 호출)
+
+    Args:
+        job_id: OCRResult ID
+        image_path: 이미지 파일 경로
+        languages: Tesseract 언어 (기본값: 초기화 시 지정한 언어)
+
+    Returns:
+        Dict: id, extracted_text, confidence_score(0~1), processing_time, error_message
+    """
+    import pytesseract
+
+    start = time.perf_counter()
+    try:
+        image = load_image(image_path)
+        preprocessor = _worker_config.get('preprocessor')
+        if preprocessor is not None:
+            image = preprocessor.process(image).image
+        data = pytesseract.image_to_data(
+            image,
+            lang=languages or _worker_config.get('languages', 'kor+eng'),
+            output_type=pytesseract.Output.DICT
+        )
+
+        lines: Dict[tuple, list] = {}
+        confidences = []
+        for word, confidence, block, paragraph, line in zip(
+                data['text'], data['conf'], data['block_num'], data['par_num'], data['line_num']):
+            word = word.strip()
+            confidence = float(confidence)
+            if not word or confidence < 0:
+                continue
+            lines.setdefault((block, paragraph, line), []).append(word)
+            confidences.append(confidence)
+
+        text = '\n'.join(' '.join(words) for _, words in sorted(lines.items()))
+        return {
+            'id': job_id,
+            'extracted_text': text,
+            'confidence_score': sum(confidences) / len(confidences) / 100 if confidences else 0.0,
+            'processing_time': time.perf_counter() - start,
+            'error_message': None,
+        }
+    except Exception as e:
+        return {
+            'id': job_id,
+            'extracted_text': '',
+            'confidence_score': None,
+            'processing_time': time.perf_counter() - start,
+            'error_message': f"{type(e).__name__}: {e}",
+        }
@@ -0,0 +1,352 @@
+"""
+CarePill OCR 작업 파이프라인
+pending 상태의 OCRResult를 일괄 점유하여 프로세스 풀에서 처리하고 결과를 일괄 저장
+"""
+
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam, select, update
+
+from config import settings
+from database.database import DatabaseManager, get_db_manager
+from database.models import OCRResult
+from utils.metrics import get_metrics_registry
+from .engine import initialize_worker, run_ocr
+
+logger = logging.getLogger(__name__)
+
+# OCRResult.status 값
+STATUS_PENDING = 'pending'
+STATUS_PROCESSING = 'processing'
+STATUS_COMPLETED = 'completed'
+STATUS_LOW_CONFIDENCE = 'low_confidence'
+STATUS_FAILED = 'failed'
+
+
+class OCRPipeline:
+    """OCR 작업 처리기
+
+    작업 상태는 ocr_results.status로 관리한다 (pending → processing → completed/low_confidence/failed).
+    processing 상태인 동안 processed_at에는 점유 시각을 기록하며, OCR_JOB_TIMEOUT이 지나도
+    끝나지 않은 작업(프로세스 비정상 종료 등)은 recover_stuck_jobs()가 pending으로 되돌린다.
+    작업 프로세스가 죽어 끝나지 못한 작업은 바로 pending으로 되돌리되, 점유 횟수(attempts)가
+    OCR_MAX_ATTEMPTS에 이르면 failed로 남긴다. 재시도 작업은 원인 이미지를 가려내도록 하나씩 실행한다.
+    """
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, max_workers: Optional[int] = None,
+                 batch_size: Optional[int] = None, image_cache=None):
+        """
+        Args:
+            db_manager: 데이터베이스 매니저 (기본값: 전역 매니저)
+            max_workers: OCR 작업 프로세스 수 (기본값: settings.MAX_WORKERS)
+            batch_size: 한 번에 점유할 작업 수 (기본값: 작업 프로세스 수의 2배)
+            image_cache: 중복 이미지 결과 캐시 (ImageResultCache, None이면 사용 안 함)
+        """
+        self.db_manager = db_manager or get_db_manager()
+        self.max_workers = max_workers or settings.MAX_WORKERS
+        self.batch_size = batch_size or settings.OCR_BATCH_SIZE or self.max_workers * 2
+        self.image_cache = image_cache
+        self.confidence_threshold = settings.OCR_CONFIDENCE_THRESHOLD
+        self.max_attempts = settings.OCR_MAX_ATTEMPTS
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit_image(self, image_path: str, image_hash: Optional[str] = None) -> int:
+        """
+        OCR 작업 등록
+
+        Args:
+            image_path: 처방전 이미지 경로
+            image_hash: 미리 계산한 image_hash 값 (ImageHash.key 형식, 대소문자 무관)
+
+        Returns:
+            int: 생성된 OCRResult ID
+
+        Raises:
+            ValueError: image_hash 형식이 올바르지 않은 경우
+        """
+        if image_hash is not None:
+            from modules.vision.image_hash import ImageHash
+            image_hash = ImageHash.from_key(image_hash.lower()).key
+        with self.db_manager.session_scope() as session:
+            job = OCRResult(image_path=image_path, image_hash=image_hash,
+                            extracted_text='', status=STATUS_PENDING)
+            session.add(job)
+            session.flush()
+            return job.id
+
+    def claim_jobs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        pending 작업을 processing으로 일괄 점유
+
+        Returns:
+            List[Dict]: 점유한 작업 (id, image_path, image_hash, attempts: 이번 점유 이전의 시도 횟수)
+        """
+        limit = limit or self.batch_size
+        now = datetime.utcnow()
+
+        with self.db_manager.write_transaction() as connection:
+            stmt = (
+                select(OCRResult.id, OCRResult.image_path, OCRResult.image_hash, OCRResult.attempts)
+                .where(OCRResult.status == STATUS_PENDING)
+                .order_by(OCRResult.id)
+                .limit(limit)
+            )
+            if connection.dialect.name != 'sqlite':
+                stmt = stmt.with_for_update(skip_locked=True)
+            jobs = [dict(row._mapping) for row in connection.execute(stmt)]
+
+            if jobs:
+                connection.execute(
+                    update(OCRResult)
+                    .where(OCRResult.id.in_([job['id'] for job in jobs]))
+                    .values(status=STATUS_PROCESSING, processed_at=now, attempts=OCRResult.attempts + 1)
+                )
+
+        return jobs
+
+    def recover_stuck_jobs(self, timeout: Optional[int] = None) -> int:
+        """
+        제한 시간 안에 끝나지 않은 processing 작업을 pending으로 복구
+
+        Returns:
+            int: 복구된 작업 수
+        """
+        timeout = settings.OCR_JOB_TIMEOUT if timeout is None else timeout
+        cutoff = datetime.utcnow() - timedelta(seconds=timeout)
+
+        with self.db_manager.engine.begin() as connection:
+            result = connection.execute(
+                update(OCRResult)
+                .where(OCRResult.status == STATUS_PROCESSING, OCRResult.processed_at < cutoff)
+                .values(status=STATUS_PENDING, processed_at=None,
+                        error_message='처리 시간 초과로 재시도')
+            )
+
+        if result.rowcount:
+            logger.warning(f"중단된 OCR 작업 {result.rowcount}건을 대기 상태로 복구했습니다")
+        return result.rowcount
+
+    def process_batch(self) -> int:
+        """
+        작업 한 묶음을 점유, 처리, 저장
+
+        Returns:
+            int: 처리한 작업 수
+        """
+        jobs = self.claim_jobs()
+        if not jobs:
+            return 0
+
+        results: List[Dict[str, Any]] = []
+        pending: List[Dict[str, Any]] = []
+        for job in jobs:
+            cached = self._lookup_cache(job)
+            if cached is not None:
+                results.append(cached)
+            else:
+                pending.append(job)
+
+        crashed: List[Dict[str, Any]] = []
+        if pending:
+            # 이전 점유에서 끝나지 못한 작업은 하나씩 실행해 프로세스를 죽이는 이미지만 시도 횟수를 소진
+            fresh = [job for job in pending if not job['attempts']]
+            groups = ([fresh] if fresh else []) + [[job] for job in pending if job['attempts']]
+            for group in groups:
+                crashed.extend(self._run_jobs(group, results))
+
+        if results:
+            self._save_results(results)
+        if crashed:
+            self._requeue_crashed(crashed)
+        return len(results) + len(crashed)
+
+    def run_until_empty(self) -> int:
+        """대기 작업이 없을 때까지 반복 처리"""
+        total = 0
+        while True:
+            processed = self.process_batch()
+            if not processed:
+                return total
+            total += processed
+
+    def close(self):
+        """작업 프로세스 종료"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=initialize_worker,
+                    initargs=(settings.TESSERACT_PATH, settings.OCR_LANGUAGES, settings.TESSERACT_DATA_PATH,
+                              settings.OCR_PREPROCESS),
+                )
+            return self._executor
+
+    def _run_jobs(self, jobs: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        작업 프로세스 풀에서 OCR 실행 후 결과를 results에 추가
+
+        Returns:
+            List[Dict]: 작업 프로세스 비정상 종료로 끝나지 못한 작업
+        """
+        executor = self._get_executor()
+        futures = {
+            executor.submit(run_ocr, job['id'], job['image_path']): job
+            for job in jobs
+        }
+        crashed = []
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # 어느 이미지가 프로세스를 죽였는지 알 수 없으므로 실행 중이던 작업 모두 재시도 대상
+                crashed.append(job)
+                continue
+            except Exception as e:
+                result = {'id': job['id'], 'extracted_text': '', 'confidence_score': None,
+                          'processing_time': None, 'error_message': f"{type(e).__name__}: {e}"}
+            result['image_hash'] = job.get('image_hash')
+            results.append(result)
+
+        if crashed:
+            self._reset_executor()
+        return crashed
+
+    def _requeue_crashed(self, jobs: List[Dict[str, Any]]):
+        """작업 프로세스 비정상 종료로 끝나지 못한 작업을 pending으로 복구 (시도 횟수 한도에 이르면 failed)"""
+        ids = [job['id'] for job in jobs]
+        with self.db_manager.engine.begin() as connection:
+            requeued = connection.execute(
+                update(OCRResult)
+                .where(OCRResult.id.in_(ids), OCRResult.status == STATUS_PROCESSING,
+                       OCRResult.attempts < self.max_attempts)
+                .values(status=STATUS_PENDING, processed_at=None,
+                        error_message='작업 프로세스 비정상 종료로 재시도')
+            ).rowcount
+            failed = connection.execute(
+                update(OCRResult)
+                .where(OCRResult.id.in_(ids), OCRResult.status == STATUS_PROCESSING)
+                .values(status=STATUS_FAILED, processed_at=datetime.utcnow(),
+                        error_message=f'작업 프로세스 비정상 종료 ({self.max_attempts}회 시도)')
+            ).rowcount
+
+        logger.warning(f"작업 프로세스 비정상 종료: OCR 작업 {requeued}건 재시도 대기, {failed}건 실패 처리")
+
+    def _reset_executor(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _lookup_cache(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """같은 이미지를 이미 처리했다면 저장된 결과 재사용"""
+        if self.image_cache is None:
+            return None
+
+        from modules.vision.image_hash import compute_image_hash
+
+        try:
+            image_hash = compute_image_hash(job['image_path'])
+        except Exception as e:
+            logger.debug(f"이미지 해시 계산 실패 ({job['image_path']}): {e}")
+            return None
+
+        job['image_hash'] = image_hash.key
+        cached = self.image_cache.lookup_ocr(image_hash)
+        if cached is None:
+            return None
+
+        return {
+            'id': job['id'],
+            'image_hash': image_hash.key,
+            'extracted_text': cached['extracted_text'],
+            'confidence_score': cached['confidence_score'],
+            'recognized_medications': cached['recognized_medications'],
+            'prescription_data': cached['prescription_data'],
+            'processing_time': 0.0,
+            'error_message': None,
+        }
+
+    def _save_results(self, results: List[Dict[str, Any]]):
+        """처리 결과를 executemany 한 번으로 저장"""
+        now = datetime.utcnow()
+        registry = get_metrics_registry()
+        rows = []
+
+        for result in results:
+            if result['error_message'] and not result['extracted_text']:
+                status = STATUS_FAILED
+            elif (result['confidence_score'] or 0.0) < self.confidence_threshold:
+                status = STATUS_LOW_CONFIDENCE
+            else:
+                status = STATUS_COMPLETED
+
+            if result.get('processing_time'):
+                registry.observe('ocr.run', result['processing_time'], 'ocr', error=status == STATUS_FAILED)
+
+            rows.append({
+                'b_id': result['id'],
+                'image_hash': result.get('image_hash'),
+                'extracted_text': result['extracted_text'],
+                'confidence_score': result['confidence_score'],
+                'processing_time': result['processing_time'],
+                'recognized_medications': result.get('recognized_medications'),
+                'prescription_data': result.get('prescription_data'),
+                'status': status,
+                'error_message': result['error_message'],
+                'processed_at': now,
+            })
+
+        table = OCRResult.__table__
+        with self.db_manager.engine.begin() as connection:
+            connection.execute(
+                update(table)
+                .where(table.c.id == bindparam('b_id'), table.c.status == STATUS_PROCESSING)
+                .values(
+                    image_hash=bindparam('image_hash'),
+                    extracted_text=bindparam('extracted_text'),
+                    confidence_score=bindparam('confidence_score'),
+                    processing_time=bindparam('processing_time'),
+                    recognized_medications=bindparam('recognized_medications'),
+                    prescription_data=bindparam('prescription_data'),
+                    status=bindparam('status'),
+                    error_message=bindparam('error_message'),
+                    processed_at=bindparam('processed_at'),
+                ),
+                rows,
+            )
+
+        if self.image_cache is not None:
+            from modules.vision.image_hash import ImageHash
+            for row in rows:
+                if row['status'] != STATUS_COMPLETED or not row['image_hash']:
+                    continue
+                try:
+                    image_hash = ImageHash.from_key(row['image_hash'])
+                except ValueError as e:
+                    # 형식 검증 이전에 등록된 작업
+                    logger.debug(f"OCR 결과를 캐시에 등록하지 않음 (작업 {row['b_id']}): {e}")
+                    continue
+                self.image_cache.remember_ocr(image_hash, {
+                    'source_id': row['b_id'],
+                    'extracted_text': row['extracted_text'],
+                    'confidence_score': row['confidence_score'],
+                    'recognized_medications': row['recognized_medications'],
+                    'prescription_data': row['prescription_data'],
+                })
+
+        failed = sum(1 for row in rows if row['status'] == STATUS_FAILED)
+        logger.info(f"OCR 작업 {len(rows)}건 저장 (실패 {failed}건)")
@@ -0,0 +1,201 @@
+"""
+CarePill OCR 전처리
+회색조 변환, 적응형 이진화, 기울기 보정, 텍스트 영역 검출 후 필요한 영역만 잘라 OCR 해상도로 축소
+"""
+
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+Box = Tuple[int, int, int, int]  # x, y, width, height
+
+
+class PreprocessResult(NamedTuple):
+    """전처리 결과"""
+    image: np.ndarray               # OCR에 넘길 이진화 이미지
+    regions: List[Box]              # 원본 좌표계의 텍스트 영역
+    angle: float                    # 보정한 기울기 (도)
+    scale: float                    # 잘라낸 영역 대비 출력 배율
+
+
+class OCRPreprocessor:
+    """OCR 입력 전처리기
+
+    텍스트 영역 검출은 DETECT_WIDTH로 줄인 이미지에서 수행하고, 잘라내기와 최종 이진화만 원본
+    해상도에서 수행한다. 중간 버퍼는 입력 크기가 같으면 프레임마다 재사용하므로 카메라 프레임을
+    연속 처리할 때 할당이 발생하지 않는다. 인스턴스는 스레드 간에 공유하지 않는다.
+    """
+
+    DETECT_WIDTH = 960
+
+    def __init__(self, target_width: Optional[int] = None, max_skew: float = 15.0,
+                 block_size: int = 31, threshold_offset: int = 15, padding: int = 12,
+                 min_region_area: int = 150):
+        """
+        Args:
+            target_width: OCR 입력 최대 너비 (기본값: settings.OCR_TARGET_WIDTH)
+            max_skew: 보정할 최대 기울기 (도, 이보다 크면 검출 오류로 보고 무시)
+            block_size: 적응형 이진화 블록 크기 (홀수)
+            threshold_offset: 적응형 이진화 상수
+            padding: 텍스트 영역 여백 (검출 해상도 기준 픽셀)
+            min_region_area: 텍스트 영역으로 인정할 최소 면적 (검출 해상도 기준 픽셀)
+        """
+        import cv2
+        self._cv2 = cv2
+
+        self.target_width = target_width or settings.OCR_TARGET_WIDTH
+        self.max_skew = max_skew
+        self.block_size = block_size | 1
+        self.threshold_offset = threshold_offset
+        self.padding = padding
+        self.min_region_area = min_region_area
+
+        self._buffers: Dict[str, np.ndarray] = {}
+        # 글자를 가로로 이어 줄 단위 영역을 만드는 커널
+        self._line_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 5))
+
+    def process(self, image: np.ndarray) -> PreprocessResult:
+        """
+        이미지 전처리
+
+        Args:
+            image: BGR 또는 회색조 이미지
+
+        Returns:
+            PreprocessResult: OCR 입력과 검출 정보
+        """
+        cv2 = self._cv2
+        gray = self._grayscale(image)
+        height, width = gray.shape
+
+        # 1. 축소 이미지에서 텍스트 영역 검출
+        detect_scale = min(1.0, self.DETECT_WIDTH / width)
+        if detect_scale < 1.0:
+            detect_size = (int(width * detect_scale), int(height * detect_scale))
+            small = cv2.resize(gray, detect_size,
+                               dst=self._buffer('small', (detect_size[1], detect_size[0])),
+                               interpolation=cv2.INTER_AREA)
+        else:
+            small = gray
+
+        binary = cv2.adaptiveThreshold(
+            small, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV,
+            self.block_size, self.threshold_offset, dst=self._buffer('binary', small.shape)
+        )
+        lines = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, self._line_kernel,
+                                 dst=self._buffer('lines', small.shape))
+        boxes = self._find_text_boxes(lines)
+
+        if not boxes:
+            # 텍스트 영역을 찾지 못하면 전체 이미지를 사용
+            boxes = [(0, 0, small.shape[1], small.shape[0])]
+
+        # 2. 텍스트 영역을 감싸는 ROI를 원본 해상도로 잘라냄
+        x0 = min(x for x, _, _, _ in boxes)
+        y0 = min(y for _, y, _, _ in boxes)
+        x1 = max(x + w for x, _, w, _ in boxes)
+        y1 = max(y + h for _, y, _, h in boxes)
+        angle = self._estimate_skew(binary[y0:y1, x0:x1])
+
+        inverse = 1.0 / detect_scale
+        roi = (
+            int(x0 * inverse), int(y0 * inverse),
+            int(min(width, x1 * inverse)), int(min(height, y1 * inverse))
+        )
+        crop = gray[roi[1]:roi[3], roi[0]:roi[2]]
+
+        # 3. 기울기 보정
+        if angle:
+            center = (crop.shape[1] / 2, crop.shape[0] / 2)
+            matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
+            crop = cv2.warpAffine(crop, matrix, (crop.shape[1], crop.shape[0]),
+                                  dst=self._buffer('rotated', crop.shape),
+                                  flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+        # 4. OCR 해상도로 축소 후 최종 이진화
+        scale = min(1.0, self.target_width / crop.shape[1])
+        if scale < 1.0:
+            output_size = (int(crop.shape[1] * scale), int(crop.shape[0] * scale))
+            crop = cv2.resize(crop, output_size,
+                              dst=self._buffer('output', (output_size[1], output_size[0])),
+                              interpolation=cv2.INTER_AREA)
+
+        output = cv2.adaptiveThreshold(
+            crop, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY,
+            self.block_size, self.threshold_offset, dst=self._buffer('final', crop.shape)
+        )
+
+        regions = [
+            (int(x * inverse), int(y * inverse), int(w * inverse), int(h * inverse))
+            for x, y, w, h in boxes
+        ]
+        # 버퍼는 다음 프레임에서 덮어쓰므로 결과는 복사본으로 반환
+        return PreprocessResult(output.copy(), regions, angle, scale)
+
+    def _grayscale(self, image: np.ndarray) -> np.ndarray:
+        cv2 = self._cv2
+        if image.ndim == 2:
+            return image
+        code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        return cv2.cvtColor(image, code, dst=self._buffer('gray', image.shape[:2]))
+
+    def _find_text_boxes(self, lines: np.ndarray) -> List[Box]:
+        """줄 단위로 이어진 글자 덩어리의 외곽 상자"""
+        cv2 = self._cv2
+        count, _, stats, _ = cv2.connectedComponentsWithStats(lines, connectivity=8)
+        if count <= 1:
+            return []
+
+        # 0번은 배경
+        stats = stats[1:]
+        x, y, w, h, area = stats[:, 0], stats[:, 1], stats[:, 2], stats[:, 3], stats[:, 4]
+        # 충분히 크고 가로로 긴(글자 줄) 영역만, 화면 전체를 덮는 테두리는 제외
+        keep = (
+            (area >= self.min_region_area)
+            & (w >= h * 1.5)
+            & (h >= 6)
+            & (w < lines.shape[1] * 0.98)
+        )
+        if not keep.any():
+            return []
+
+        pad = self.padding
+        x0 = np.clip(x[keep] - pad, 0, lines.shape[1])
+        y0 = np.clip(y[keep] - pad, 0, lines.shape[0])
+        x1 = np.clip(x[keep] + w[keep] + pad, 0, lines.shape[1])
+        y1 = np.clip(y[keep] + h[keep] + pad, 0, lines.shape[0])
+        return [(int(a), int(b), int(c - a), int(d - b)) for a, b, c, d in zip(x0, y0, x1, y1)]
+
+    def _estimate_skew(self, binary: np.ndarray) -> float:
+        """텍스트 픽셀 분포의 최소 외접 사각형으로 기울기 추정"""
+        cv2 = self._cv2
+        points = cv2.findNonZero(binary)
+        if points is None or len(points) < 50:
+            return 0.0
+
+        angle = cv2.minAreaRect(points)[-1]
+        # OpenCV 버전에 따라 각도 범위가 [-90, 0) 또는 (0, 90]이므로 [-45, 45]로 정규화
+        if angle < -45:
+            angle += 90
+        elif angle > 45:
+            angle -= 90
+
+        if abs(angle) < 0.5 or abs(angle) > self.max_skew:
+            return 0.0
+        return float(angle)
+
+    def _buffer(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape):
+            buffer = self._buffers[name] = np.empty(shape, dtype=dtype)
+        return buffer
+
+
+def preprocess_for_ocr(image: np.ndarray) -> np.ndarray:
+    """OCR 입력 전처리 (일회성 호출용)"""
+    return OCRPreprocessor().process(image).image
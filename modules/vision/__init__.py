@@ -0,0 +1,21 @@
+"""
+CarePill 영상 처리 공통 모듈
+"""
+
+from .image_hash import (
+    ImageHash,
+    ImageResultCache,
+    compute_image_hash,
+    perceptual_hash,
+    hamming_distance,
+    get_image_cache
+)
+
+__all__ = [
+    'ImageHash',
+    'ImageResultCache',
+    'compute_image_hash',
+    'perceptual_hash',
+    'hamming_distance',
+    'get_image_cache'
+]
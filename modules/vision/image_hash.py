@@ -0,0 +1,300 @@
+"""
+CarePill 이미지 해시 및 중복 결과 캐시
+동일한 이미지의 OCR 결과와 동일하거나 거의 같은 이미지의 YOLO 결과를 메모리 LRU와 image_hash 인덱스로 재사용
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+from sqlalchemy import select
+
+from config import settings
+from database.database import DatabaseManager, get_db_manager
+from database.models import OCRResult, YOLODetection
+
+logger = logging.getLogger(__name__)
+
+ImageInput = Union[bytes, bytearray, np.ndarray, str, Path]
+
+# image_hash 컬럼 구성: 지각 해시 16자리 + 내용 해시(SHA-256) 앞 48자리 = 64자
+PERCEPTUAL_HEX_LENGTH = 16
+CONTENT_HEX_LENGTH = 48
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+
+class ImageHash(NamedTuple):
+    """이미지 해시"""
+    perceptual: int     # 64비트 dHash
+    content: str        # SHA-256 hex
+
+    @property
+    def key(self) -> str:
+        """image_hash 컬럼 저장 값"""
+        return f"{self.perceptual:0{PERCEPTUAL_HEX_LENGTH}x}{self.content[:CONTENT_HEX_LENGTH]}"
+
+    @property
+    def perceptual_prefix(self) -> str:
+        return self.key[:PERCEPTUAL_HEX_LENGTH]
+
+    @classmethod
+    def from_key(cls, key: str) -> "ImageHash":
+        """
+        image_hash 컬럼 값으로부터 복원
+
+        Raises:
+            ValueError: 64자 16진수 문자열이 아닌 경우
+        """
+        if len(key) != PERCEPTUAL_HEX_LENGTH + CONTENT_HEX_LENGTH or not _HEX_DIGITS.issuperset(key):
+            raise ValueError(f"image_hash 형식이 올바르지 않습니다: {key!r}")
+        return cls(int(key[:PERCEPTUAL_HEX_LENGTH], 16), key[PERCEPTUAL_HEX_LENGTH:])
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """두 64비트 해시의 해밍 거리"""
+    return bin(a ^ b).count('1')
+
+
+def _to_grayscale(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return image.astype(np.float32, copy=False)
+    if image.ndim == 3 and image.shape[2] >= 3:
+        # OpenCV 프레임(BGR) 기준 휘도
+        b, g, r = image[..., 0], image[..., 1], image[..., 2]
+        return 0.114 * b + 0.587 * g + 0.299 * r
+    return image[..., 0].astype(np.float32, copy=False)
+
+
+def _area_resize(gray: np.ndarray, width: int, height: int) -> np.ndarray:
+    """영역 평균 축소 (cv2.INTER_AREA와 같은 방식, OpenCV 없이 동작)"""
+    rows = np.linspace(0, gray.shape[0], height + 1).astype(int)[:-1]
+    cols = np.linspace(0, gray.shape[1], width + 1).astype(int)[:-1]
+    row_counts = np.diff(np.append(rows, gray.shape[0]))
+    col_counts = np.diff(np.append(cols, gray.shape[1]))
+    sums = np.add.reduceat(np.add.reduceat(gray, rows, axis=0), cols, axis=1)
+    return sums / np.outer(row_counts, col_counts)
+
+
+def decode_image(data: bytes) -> np.ndarray:
+    """인코딩된 이미지(JPEG/PNG 등)를 배열로 디코딩"""
+    try:
+        import cv2
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            raise ValueError("이미지를 디코딩할 수 없습니다")
+        return image
+    except ImportError:
+        from io import BytesIO
+        from PIL import Image
+        with Image.open(BytesIO(data)) as image:
+            return np.asarray(image.convert('L'))
+
+
+def perceptual_hash(image: np.ndarray) -> int:
+    """
+    64비트 차이 해시(dHash) 계산
+
+    9x8로 축소한 회색조 이미지에서 가로로 인접한 픽셀의 밝기 비교 결과를 비트로 사용하므로
+    재압축, 밝기 변화, 해상도 차이에 강하다.
+    """
+    if image.shape[0] < 8 or image.shape[1] < 9:
+        raise ValueError(f"해시를 계산하기에 이미지가 너무 작습니다: {image.shape}")
+    small = _area_resize(_to_grayscale(image), 9, 8)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view('>u8')[0])
+
+
+def array_content_hash(image: np.ndarray) -> str:
+    """디코딩된 배열의 내용 해시 (SHA-256 hex, 배열 크기 포함)"""
+    digest = hashlib.sha256(str(image.shape).encode('ascii'))
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+def compute_image_hash(image: ImageInput) -> ImageHash:
+    """
+    이미지의 지각 해시와 내용 해시 계산
+
+    Args:
+        image: 인코딩된 이미지 바이트, 이미지 파일 경로 또는 디코딩된 배열
+
+    Returns:
+        ImageHash: 계산된 해시
+    """
+    if isinstance(image, (str, Path)):
+        image = Path(image).read_bytes()
+
+    if isinstance(image, np.ndarray):
+        return ImageHash(perceptual_hash(image), array_content_hash(image))
+
+    data = bytes(image)
+    return ImageHash(perceptual_hash(decode_image(data)), hashlib.sha256(data).hexdigest())
+
+
+class ImageResultCache:
+    """OCR/YOLO 결과 중복 제거 캐시
+
+    조회 순서는 메모리 LRU(정확히 일치 → 해밍 거리 이내) → DB image_hash 일치 → 같은 지각 해시를
+    가진 행(인덱스 범위 조회)이다. DB에서 찾은 결과는 메모리에 적재한다.
+
+    OCR 결과는 image_hash가 정확히 같을 때만 재사용한다. 같은 양식의 처방전은 환자와 약품이 달라도
+    지각 해시가 같거나 가까울 수 있어, 다른 환자의 처방 내용이 저장될 수 있기 때문이다.
+    """
+
+    KINDS = ('ocr', 'yolo')
+    # 지각 해시로 거의 같은 이미지의 결과를 재사용할 종류
+    NEAR_MATCH_KINDS = ('yolo',)
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None,
+                 max_entries: Optional[int] = None, max_distance: Optional[int] = None):
+        """
+        Args:
+            db_manager: 데이터베이스 매니저 (기본값: 전역 매니저)
+            max_entries: 종류별 메모리 캐시 최대 항목 수
+            max_distance: 거의 같은 이미지로 볼 최대 해밍 거리 (비트, YOLO 결과에만 적용)
+        """
+        self.db_manager = db_manager or get_db_manager()
+        self.max_entries = max_entries or settings.IMAGE_HASH_CACHE_SIZE
+        self.max_distance = settings.IMAGE_HASH_MAX_DISTANCE if max_distance is None else max_distance
+
+        self._entries: Dict[str, "OrderedDict[str, Tuple[int, Dict[str, Any]]]"] = {
+            kind: OrderedDict() for kind in self.KINDS
+        }
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'near_hits': 0, 'db_hits': 0, 'misses': 0}
+
+    def lookup_ocr(self, image_hash: ImageHash) -> Optional[Dict[str, Any]]:
+        """이미 처리한 이미지의 OCR 결과 조회"""
+        return self._lookup('ocr', image_hash)
+
+    def lookup_yolo(self, image_hash: ImageHash) -> Optional[Dict[str, Any]]:
+        """이미 처리한 이미지의 YOLO 검출 결과 조회"""
+        return self._lookup('yolo', image_hash)
+
+    def remember_ocr(self, image_hash: ImageHash, result: Dict[str, Any]):
+        """새로 처리한 OCR 결과를 메모리 캐시에 등록"""
+        self._remember('ocr', image_hash, result)
+
+    def remember_yolo(self, image_hash: ImageHash, result: Dict[str, Any]):
+        """새로 처리한 YOLO 결과를 메모리 캐시에 등록"""
+        self._remember('yolo', image_hash, result)
+
+    def stats(self) -> Dict[str, float]:
+        """캐시 적중률 통계 반환"""
+        with self._lock:
+            hits = self._stats['memory_hits'] + self._stats['near_hits'] + self._stats['db_hits']
+            total = hits + self._stats['misses']
+            return {
+                **self._stats,
+                'hits': hits,
+                'hit_rate': hits / total if total else 0.0,
+                'memory_items': sum(len(entries) for entries in self._entries.values()),
+            }
+
+    def clear(self):
+        """메모리 캐시 삭제"""
+        with self._lock:
+            for entries in self._entries.values():
+                entries.clear()
+
+    def _lookup(self, kind: str, image_hash: ImageHash) -> Optional[Dict[str, Any]]:
+        key = image_hash.key
+
+        with self._lock:
+            entries = self._entries[kind]
+            entry = entries.get(key)
+            if entry is not None:
+                entries.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return entry[1]
+
+            if kind in self.NEAR_MATCH_KINDS and self.max_distance > 0:
+                nearest = self._nearest(entries, image_hash.perceptual)
+                if nearest is not None:
+                    entries.move_to_end(nearest)
+                    self._stats['near_hits'] += 1
+                    return entries[nearest][1]
+
+        result = self._lookup_database(kind, image_hash)
+
+        with self._lock:
+            if result is None:
+                self._stats['misses'] += 1
+                return None
+            self._stats['db_hits'] += 1
+            self._put(kind, key, image_hash.perceptual, result)
+        return result
+
+    def _nearest(self, entries, perceptual: int) -> Optional[str]:
+        best_key, best_distance = None, self.max_distance + 1
+        for key, (candidate, _) in entries.items():
+            distance = hamming_distance(perceptual, candidate)
+            if distance < best_distance:
+                best_key, best_distance = key, distance
+        return best_key
+
+    def _lookup_database(self, kind: str, image_hash: ImageHash) -> Optional[Dict[str, Any]]:
+        model = OCRResult if kind == 'ocr' else YOLODetection
+        filters = [OCRResult.status == 'completed'] if kind == 'ocr' else []
+        prefix = image_hash.perceptual_prefix
+
+        with self.db_manager.session_scope() as session:
+            row = session.execute(
+                select(model).where(model.image_hash == image_hash.key, *filters)
+                .order_by(model.id.desc()).limit(1)
+            ).scalar_one_or_none()
+            if row is None and kind in self.NEAR_MATCH_KINDS:
+                # 같은 지각 해시를 가진 행은 image_hash 인덱스의 연속 구간에 모여 있음
+                row = session.execute(
+                    select(model).where(model.image_hash >= prefix, model.image_hash < prefix + 'g', *filters)
+                    .limit(1)
+                ).scalar_one_or_none()
+            if row is None:
+                return None
+            return self._to_result(kind, row)
+
+    @staticmethod
+    def _to_result(kind: str, row) -> Dict[str, Any]:
+        if kind == 'ocr':
+            return {
+                'source_id': row.id,
+                'extracted_text': row.extracted_text,
+                'confidence_score': row.confidence_score,
+                'recognized_medications': row.recognized_medications,
+                'prescription_data': row.prescription_data,
+            }
+        from modules.yolo.storage import detection_arrays
+        return {
+            'source_id': row.id,
+            'detections': detection_arrays(row),
+            'model_version': row.model_version,
+        }
+
+    def _remember(self, kind: str, image_hash: ImageHash, result: Dict[str, Any]):
+        with self._lock:
+            self._put(kind, image_hash.key, image_hash.perceptual, result)
+
+    def _put(self, kind: str, key: str, perceptual: int, result: Dict[str, Any]):
+        entries = self._entries[kind]
+        entries[key] = (perceptual, result)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+
+# 전역 이미지 결과 캐시 인스턴스
+_image_cache: Optional[ImageResultCache] = None
+
+
+def get_image_cache() -> ImageResultCache:
+    """이미지 결과 캐시 인스턴스 반환"""
+    global _image_cache
+
+    if _image_cache is None:
+        _image_cache = ImageResultCache()
+
+    return _image_cache
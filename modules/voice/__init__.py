@@ -0,0 +1,18 @@
+"""
+CarePill 음성 처리 모듈
+"""
+
+from .vad import VoiceActivityDetector, frame_rms
+from .tts_cache import TTSCache, DEFAULT_PREWARM_PHRASES, make_cache_key
+from .history import ConversationHistory, estimate_tokens, summarize_locally
+
+__all__ = [
+    'VoiceActivityDetector',
+    'frame_rms',
+    'TTSCache',
+    'DEFAULT_PREWARM_PHRASES',
+    'make_cache_key',
+    'ConversationHistory',
+    'estimate_tokens',
+    'summarize_locally'
+]
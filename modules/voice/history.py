@@ -0,0 +1,135 @@
+"""
+CarePill 대화 히스토리 관리
+시스템 프롬프트 + 요약 + 최근 대화만 토큰 예산 안에서 유지
+"""
+
+import re
+import logging
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 메시지당 역할/구분자 오버헤드 (대략값)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_WIDE_CHAR_PATTERN = re.compile(r'[ᄀ-ᇿ㄰-㆏가-힣぀-ヿ一-鿿]')
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    텍스트 토큰 수를 로컬에서 추정
+
+    한글/한자/가나는 글자당 약 1토큰, 그 외 문자는 약 4글자당 1토큰으로 계산한다.
+    """
+    if not text:
+        return 0
+    wide = len(_WIDE_CHAR_PATTERN.findall(text))
+    narrow = len(text) - wide
+    return wide + (narrow + 3) // 4
+
+
+def summarize_locally(previous: str, messages: List[Dict[str, str]], max_tokens: int) -> str:
+    """
+    네트워크 호출 없이 오래된 대화를 요약 (사용자 발화 위주로 압축)
+
+    Args:
+        previous: 기존 요약
+        messages: 새로 요약에 포함할 메시지
+        max_tokens: 요약 최대 토큰 수
+    """
+    lines = [line for line in previous.split('\n') if line] if previous else []
+    for message in messages:
+        if message['role'] != 'user':
+            continue
+        content = ' '.join(message['content'].split())
+        if len(content) > 60:
+            content = content[:60] + '…'
+        lines.append(f"- 사용자: {content}")
+
+    # 예산을 넘으면 가장 오래된 줄부터 제거
+    while lines and estimate_tokens('\n'.join(lines)) > max_tokens:
+        lines.pop(0)
+    return '\n'.join(lines)
+
+
+class ConversationHistory:
+    """토큰 예산 기반 대화 히스토리"""
+
+    def __init__(self, system_prompt: str, max_tokens: Optional[int] = None,
+                 response_tokens: int = 500, summary_tokens: int = 200,
+                 summarizer: Optional[Callable[[str, List[Dict[str, str]], int], str]] = None):
+        """
+        Args:
+            system_prompt: 시스템 프롬프트
+            max_tokens: 요청 + 응답 전체 토큰 예산 (기본값: settings.OPENAI_MAX_TOKENS)
+            response_tokens: 응답용으로 남겨둘 토큰 수
+            summary_tokens: 요약 최대 토큰 수
+            summarizer: (기존 요약, 제거된 메시지, 최대 토큰) -> 새 요약 함수
+        """
+        self.system_prompt = system_prompt
+        self.max_tokens = max_tokens or settings.OPENAI_MAX_TOKENS
+        self.response_tokens = response_tokens
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer or summarize_locally
+
+        self.summary = ''
+        self._turns: Deque[Tuple[Dict[str, str], int]] = deque()
+        self._turn_tokens = 0
+        self._fixed_tokens = estimate_tokens(system_prompt) + MESSAGE_OVERHEAD_TOKENS
+
+    @property
+    def prompt_budget(self) -> int:
+        """요청 메시지에 사용할 수 있는 토큰 수"""
+        return max(0, self.max_tokens - self.response_tokens)
+
+    @property
+    def token_count(self) -> int:
+        """현재 요청 메시지의 추정 토큰 수"""
+        summary = estimate_tokens(self.summary) + MESSAGE_OVERHEAD_TOKENS if self.summary else 0
+        return self._fixed_tokens + summary + self._turn_tokens
+
+    def add(self, role: str, content: str):
+        """메시지 추가 후 예산 초과 시 오래된 대화를 요약으로 이동"""
+        message = {"role": role, "content": content}
+        tokens = estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+        self._turns.append((message, tokens))
+        self._turn_tokens += tokens
+        self._trim()
+
+    def messages(self) -> List[Dict[str, str]]:
+        """API 요청용 메시지 목록 반환"""
+        messages = [{"role": "system", "content": self.system_prompt}]
+        if self.summary:
+            messages.append({"role": "system", "content": f"이전 대화 요약:\n{self.summary}"})
+        messages.extend(message for message, _ in self._turns)
+        return messages
+
+    def clear(self):
+        """대화 내용 초기화 (시스템 프롬프트는 유지)"""
+        self.summary = ''
+        self._turns.clear()
+        self._turn_tokens = 0
+
+    def _trim(self):
+        if self.token_count <= self.prompt_budget:
+            return
+
+        # 요약이 들어갈 자리를 확보할 때까지 오래된 메시지 제거 (최신 메시지는 항상 유지)
+        target = self.prompt_budget - self.summary_tokens - MESSAGE_OVERHEAD_TOKENS
+        dropped: List[Dict[str, str]] = []
+        while len(self._turns) > 1 and self._fixed_tokens + self._turn_tokens > target:
+            message, tokens = self._turns.popleft()
+            self._turn_tokens -= tokens
+            dropped.append(message)
+
+        if not dropped:
+            return
+
+        try:
+            self.summary = self.summarizer(self.summary, dropped, self.summary_tokens)
+        except Exception as e:
+            logger.warning(f"대화 요약 실패, 로컬 요약으로 대체: {e}")
+            self.summary = summarize_locally(self.summary, dropped, self.summary_tokens)
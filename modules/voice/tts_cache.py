@@ -0,0 +1,227 @@
+"""
+CarePill TTS 응답 캐시
+(텍스트, TTS 모델, 음성) 해시를 키로 메모리 LRU와 디스크 2단계로 음성 데이터를 보관
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 시작 시 미리 생성해 둘 자주 쓰는 문구
+DEFAULT_PREWARM_PHRASES = [
+    "안녕하세요. 케어필입니다. 무엇을 도와드릴까요?",
+    "약 드실 시간입니다. 잊지 말고 복용해 주세요.",
+    "음성을 인식하지 못했습니다. 다시 한 번 말씀해 주세요.",
+    "죄송합니다. 응답을 생성하는 중 오류가 발생했습니다.",
+    "대화를 종료합니다. 건강한 하루 보내세요.",
+]
+
+
+def make_cache_key(text: str, model: str, voice: str) -> str:
+    """TTS 캐시 키 생성 (SHA-256)"""
+    payload = f"{model}\x00{voice}\x00{text.strip()}".encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+class TTSCache:
+    """TTS 음성 데이터 2단계 캐시 (메모리 LRU + 디스크)"""
+
+    def __init__(self, cache_dir: Optional[Path] = None,
+                 max_memory_bytes: Optional[int] = None,
+                 max_disk_bytes: Optional[int] = None,
+                 extension: str = 'mp3'):
+        """
+        Args:
+            cache_dir: 디스크 캐시 디렉토리
+            max_memory_bytes: 메모리 캐시 최대 크기 (바이트)
+            max_disk_bytes: 디스크 캐시 최대 크기 (바이트, 0이면 디스크 캐시 비활성화)
+            extension: 저장 파일 확장자
+        """
+        self.cache_dir = Path(cache_dir or settings.TTS_CACHE_DIR)
+        self.max_memory_bytes = settings.TTS_CACHE_MEMORY_BYTES if max_memory_bytes is None else max_memory_bytes
+        self.max_disk_bytes = settings.TTS_CACHE_DISK_BYTES if max_disk_bytes is None else max_disk_bytes
+        self.extension = extension
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+        if self.max_disk_bytes > 0:
+            self._load_disk_index()
+
+    def get(self, text: str, model: str, voice: str) -> Optional[bytes]:
+        """캐시된 음성 데이터 조회 (없으면 None)"""
+        key = make_cache_key(text, model, voice)
+
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return audio
+
+            audio = self._read_disk(key)
+            if audio is not None:
+                self._stats['disk_hits'] += 1
+                self._put_memory(key, audio)
+                return audio
+
+            self._stats['misses'] += 1
+            return None
+
+    def put(self, text: str, model: str, voice: str, audio: bytes):
+        """음성 데이터 저장"""
+        key = make_cache_key(text, model, voice)
+
+        with self._lock:
+            self._put_memory(key, audio)
+            self._write_disk(key, audio)
+
+    def get_or_create(self, text: str, model: str, voice: str,
+                      synthesize: Callable[[str], bytes]) -> bytes:
+        """
+        캐시 조회 후 없으면 생성하여 저장
+
+        Args:
+            text: 변환할 텍스트
+            model: TTS 모델
+            voice: TTS 음성
+            synthesize: 캐시 미스 시 호출할 TTS 함수
+
+        Returns:
+            bytes: 음성 데이터
+        """
+        audio = self.get(text, model, voice)
+        if audio is None:
+            audio = synthesize(text)
+            self.put(text, model, voice, audio)
+        return audio
+
+    def prewarm(self, phrases: Iterable[str], model: str, voice: str,
+                synthesize: Callable[[str], bytes]) -> int:
+        """
+        자주 쓰는 문구를 미리 캐시에 적재
+
+        Returns:
+            int: 새로 생성된 문구 수
+        """
+        created = 0
+        for phrase in phrases:
+            key = make_cache_key(phrase, model, voice)
+            with self._lock:
+                if key in self._memory or key in self._disk_sizes:
+                    continue
+            try:
+                self.put(phrase, model, voice, synthesize(phrase))
+                created += 1
+            except Exception as e:
+                logger.warning(f"TTS 캐시 사전 생성 실패 ({phrase}): {e}")
+        logger.info(f"TTS 캐시 사전 생성 완료: {created}건")
+        return created
+
+    def stats(self) -> Dict[str, float]:
+        """캐시 적중률 통계 반환"""
+        with self._lock:
+            hits = self._stats['memory_hits'] + self._stats['disk_hits']
+            total = hits + self._stats['misses']
+            return {
+                **self._stats,
+                'hits': hits,
+                'hit_rate': hits / total if total else 0.0,
+                'memory_items': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'disk_items': len(self._disk_sizes),
+                'disk_bytes': self._disk_bytes,
+            }
+
+    def clear(self):
+        """메모리 및 디스크 캐시 삭제"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for key in list(self._disk_sizes):
+                self._remove_disk(key)
+
+    def _put_memory(self, key: str, audio: bytes):
+        if len(audio) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.{self.extension}"
+
+    def _load_disk_index(self):
+        """디스크 캐시 파일 목록을 최근 사용 순으로 적재"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entries = []
+            for path in self.cache_dir.glob(f"*.{self.extension}"):
+                stat = path.stat()
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+        except OSError as e:
+            logger.warning(f"TTS 디스크 캐시 적재 실패: {e}")
+            return
+
+        for _, key, size in sorted(entries):
+            self._disk_sizes[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if key not in self._disk_sizes:
+            return None
+        path = self._path_for(key)
+        try:
+            audio = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            self._disk_bytes -= self._disk_sizes.pop(key, 0)
+            return None
+        self._disk_sizes.move_to_end(key)
+        return audio
+
+    def _write_disk(self, key: str, audio: bytes):
+        if self.max_disk_bytes <= 0 or len(audio) > self.max_disk_bytes:
+            return
+        path = self._path_for(key)
+        temp_path = path.with_suffix('.tmp')
+        try:
+            temp_path.write_bytes(audio)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"TTS 디스크 캐시 저장 실패: {e}")
+            return
+        self._disk_bytes += len(audio) - self._disk_sizes.pop(key, 0)
+        self._disk_sizes[key] = len(audio)
+        self._evict_disk()
+
+    def _evict_disk(self):
+        while self._disk_bytes > self.max_disk_bytes and self._disk_sizes:
+            key = next(iter(self._disk_sizes))
+            self._remove_disk(key)
+            self._stats['evictions'] += 1
+
+    def _remove_disk(self, key: str):
+        self._disk_bytes -= self._disk_sizes.pop(key, 0)
+        try:
+            self._path_for(key).unlink()
+        except OSError:
+            pass
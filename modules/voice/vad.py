@@ -0,0 +1,162 @@
+"""
+CarePill 음성 구간 검출 (VAD)
+int16 PCM 프레임의 RMS 에너지와 적응형 잡음 기준으로 발화 시작/종료를 판단
+"""
+
+from collections import deque
+from typing import Deque, List, Optional
+
+import numpy as np
+
+
+def frame_rms(chunk: bytes) -> float:
+    """int16 PCM 청크의 RMS 에너지 계산"""
+    samples = np.frombuffer(chunk, dtype=np.int16)
+    if samples.size == 0:
+        return 0.0
+    samples = samples.astype(np.float32)
+    return float(np.sqrt(np.mean(samples * samples)))
+
+
+class VoiceActivityDetector:
+    """에너지 기반 음성 구간 검출기
+
+    - 잡음 기준(noise floor)은 발화가 아닌 프레임에서 지수이동평균으로 갱신
+    - 발화 종료 후 `hangover` 동안 침묵이 이어져야 녹음을 종료
+    - 발화 시작 직전 `pre_roll` 구간을 보관하여 첫 음절이 잘리지 않도록 함
+    """
+
+    def __init__(self, sample_rate: int = 16000, chunk_size: int = 1024,
+                 min_energy: float = 500.0, speech_ratio: float = 3.0,
+                 hangover: float = 0.8, pre_roll: float = 0.3,
+                 noise_adapt_rate: float = 0.05, calibration: float = 0.2,
+                 min_speech: float = 0.2, max_wait: float = 10.0, max_duration: float = 30.0):
+        """
+        Args:
+            sample_rate: 샘플링 레이트 (Hz)
+            chunk_size: 청크당 샘플 수
+            min_energy: 발화로 간주할 최소 RMS
+            speech_ratio: 잡음 기준 대비 발화 판단 배수
+            hangover: 발화 종료로 판단할 침묵 지속 시간 (초)
+            pre_roll: 발화 시작 전 보관할 오디오 길이 (초)
+            noise_adapt_rate: 잡음 기준 갱신 비율 (0~1)
+            calibration: 시작 직후 잡음 기준만 측정하는 구간 (초)
+            min_speech: 발화로 인정할 최소 길이 (초)
+            max_wait: 발화가 없을 때 최대 대기 시간 (초)
+            max_duration: 최대 녹음 길이 (초)
+        """
+        frame_seconds = chunk_size / float(sample_rate)
+        self.min_energy = min_energy
+        self.speech_ratio = speech_ratio
+        self.noise_adapt_rate = noise_adapt_rate
+        self.hangover_frames = max(1, int(round(hangover / frame_seconds)))
+        self.calibration_frames = max(1, int(round(calibration / frame_seconds)))
+        self.min_speech_frames = max(1, int(round(min_speech / frame_seconds)))
+        self.max_wait_frames = max(1, int(max_wait / frame_seconds))
+        self.max_frames = max(1, int(max_duration / frame_seconds))
+        self._pre_roll_frames = max(0, int(round(pre_roll / frame_seconds)))
+        self.reset()
+
+    def reset(self):
+        """검출 상태 초기화"""
+        self.noise_floor: Optional[float] = None
+        self.triggered = False
+        self.finished = False
+        self.speech_frames = 0
+        self._silence_run = 0
+        self._frame_count = 0
+        self._pre_roll: Deque[bytes] = deque(maxlen=self._pre_roll_frames or None)
+        self.frames: List[bytes] = []
+
+    @property
+    def threshold(self) -> float:
+        """현재 발화 판단 임계값"""
+        if self.noise_floor is None:
+            return self.min_energy
+        return max(self.min_energy, self.noise_floor * self.speech_ratio)
+
+    @property
+    def has_speech(self) -> bool:
+        """최소 길이 이상의 발화가 검출되었는지 여부"""
+        return self.speech_frames >= self.min_speech_frames
+
+    def process(self, chunk: bytes) -> bool:
+        """
+        오디오 청크 처리
+
+        Args:
+            chunk: int16 PCM 청크
+
+        Returns:
+            bool: 녹음을 종료해야 하면 True
+        """
+        if self.finished:
+            return True
+
+        self._frame_count += 1
+        energy = frame_rms(chunk)
+
+        if self._frame_count <= self.calibration_frames:
+            # 초기 구간은 주변 소음 측정에만 사용 (평균으로 누적)
+            if self.noise_floor is None:
+                self.noise_floor = energy
+            else:
+                self.noise_floor += (energy - self.noise_floor) / self._frame_count
+            if self._pre_roll_frames:
+                self._pre_roll.append(chunk)
+            return False
+
+        is_speech = energy > self.threshold
+
+        if not is_speech:
+            self._update_noise_floor(energy)
+
+        if not self.triggered:
+            if is_speech:
+                self.triggered = True
+                self.frames.extend(self._pre_roll)
+                self._pre_roll.clear()
+                self.frames.append(chunk)
+                self.speech_frames = 1
+            else:
+                if self._pre_roll_frames:
+                    self._pre_roll.append(chunk)
+                if self._frame_count >= self.max_wait_frames:
+                    self.finished = True
+        else:
+            self.frames.append(chunk)
+            if is_speech:
+                self.speech_frames += 1
+                self._silence_run = 0
+            else:
+                self._silence_run += 1
+                if self._silence_run >= self.hangover_frames:
+                    if self.has_speech:
+                        self.finished = True
+                    else:
+                        # 짧은 잡음은 발화로 보지 않고 대기 상태로 복귀
+                        self._retract()
+
+        if len(self.frames) >= self.max_frames:
+            self.finished = True
+
+        return self.finished
+
+    def audio(self) -> bytes:
+        """녹음된 오디오 데이터 반환"""
+        return b''.join(self.frames)
+
+    def _update_noise_floor(self, energy: float):
+        if self.noise_floor is None:
+            self.noise_floor = energy
+        else:
+            self.noise_floor += self.noise_adapt_rate * (energy - self.noise_floor)
+
+    def _retract(self):
+        tail = self.frames[-self._pre_roll_frames:] if self._pre_roll_frames else []
+        self.frames = []
+        self._pre_roll.clear()
+        self._pre_roll.extend(tail)
+        self.triggered = False
+        self.speech_frames = 0
+        self._silence_run = 0
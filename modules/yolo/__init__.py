@@ -0,0 +1,42 @@
+"""
+CarePill YOLO 객체 인식 모듈
+"""
+
+from .frame_buffer import Frame, FrameRingBuffer
+from .backends import (
+    Detection,
+    InferenceBackend,
+    UltralyticsBackend,
+    OnnxBackend,
+    OpenVINOBackend,
+    create_backend,
+    non_max_suppression
+)
+from .storage import (
+    DETECTION_DTYPE,
+    DetectionArrays,
+    pack_detections,
+    unpack_detections,
+    load_detections,
+    migrate_json_detections
+)
+from .service import YOLOInferenceService
+
+__all__ = [
+    'Frame',
+    'FrameRingBuffer',
+    'Detection',
+    'InferenceBackend',
+    'UltralyticsBackend',
+    'OnnxBackend',
+    'OpenVINOBackend',
+    'create_backend',
+    'non_max_suppression',
+    'DETECTION_DTYPE',
+    'DetectionArrays',
+    'pack_detections',
+    'unpack_detections',
+    'load_detections',
+    'migrate_json_detections',
+    'YOLOInferenceService'
+]
@@ -0,0 +1,281 @@
+"""
+CarePill YOLO 추론 백엔드
+Ultralytics(PyTorch) 또는 CPU 전용 ONNX Runtime / OpenVINO 모델을 같은 인터페이스로 사용
+"""
+
+import ast
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Detection(NamedTuple):
+    """검출 객체"""
+    class_id: int
+    class_name: str
+    confidence: float
+    box: tuple          # (x1, y1, x2, y2) 원본 이미지 좌표
+
+
+class InferenceBackend(ABC):
+    """추론 백엔드 기본 클래스 (모델은 생성 시 한 번만 로드)"""
+
+    name = 'base'
+
+    def __init__(self, model_path: str, confidence: float, iou: float, max_detections: int,
+                 input_size: int = 640):
+        self.model_path = model_path
+        self.confidence = confidence
+        self.iou = iou
+        self.max_detections = max_detections
+        self.input_size = input_size
+        self.class_names: Dict[int, str] = {}
+
+    @property
+    def model_version(self) -> str:
+        return f"{self.name}:{Path(self.model_path).name}"
+
+    @abstractmethod
+    def predict(self, images: Sequence[np.ndarray]) -> List[List[Detection]]:
+        """이미지 묶음 추론 (이미지별 검출 목록 반환)"""
+
+    def _class_name(self, class_id: int) -> str:
+        return self.class_names.get(class_id, str(class_id))
+
+
+class UltralyticsBackend(InferenceBackend):
+    """Ultralytics YOLO (PyTorch CPU)"""
+
+    name = 'ultralytics'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        from ultralytics import YOLO
+
+        self.model = YOLO(self.model_path)
+        self.class_names = dict(getattr(self.model, 'names', {}) or {})
+
+    def predict(self, images: Sequence[np.ndarray]) -> List[List[Detection]]:
+        results = self.model.predict(
+            list(images),
+            conf=self.confidence,
+            iou=self.iou,
+            max_det=self.max_detections,
+            imgsz=self.input_size,
+            device='cpu',
+            verbose=False,
+        )
+
+        batch: List[List[Detection]] = []
+        for result in results:
+            boxes = result.boxes
+            xyxy = boxes.xyxy.cpu().numpy()
+            scores = boxes.conf.cpu().numpy()
+            classes = boxes.cls.cpu().numpy().astype(int)
+            batch.append([
+                Detection(int(class_id), self._class_name(int(class_id)), float(score), tuple(map(float, box)))
+                for box, score, class_id in zip(xyxy, scores, classes)
+            ])
+        return batch
+
+
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime CPU 백엔드 (Ultralytics export 형식: [batch, 4 + 클래스 수, 후보 수])"""
+
+    name = 'onnx'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._load()
+        self._letterbox = np.empty((0,), dtype=np.float32)
+
+    def _load(self):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        available = ort.get_available_providers()
+        providers = [p for p in ('OpenVINOExecutionProvider', 'CPUExecutionProvider') if p in available]
+
+        self.session = ort.InferenceSession(self.model_path, sess_options=options, providers=providers)
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # 배치 차원이 고정(1)으로 export된 모델은 한 장씩 실행
+        self.fixed_batch = model_input.shape[0] if isinstance(model_input.shape[0], int) else None
+        if isinstance(model_input.shape[2], int):
+            self.input_size = model_input.shape[2]
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        if 'names' in metadata:
+            try:
+                self.class_names = {int(k): v for k, v in ast.literal_eval(metadata['names']).items()}
+            except (ValueError, SyntaxError):
+                pass
+        logger.info(f"ONNX 모델 로드 완료 ({', '.join(self.session.get_providers())})")
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+    def predict(self, images: Sequence[np.ndarray]) -> List[List[Detection]]:
+        if not images:
+            return []
+
+        batch, transforms = self._prepare(images)
+        if self.fixed_batch == 1 and len(images) > 1:
+            outputs = np.concatenate([self._run(batch[i:i + 1]) for i in range(len(images))])
+        else:
+            outputs = self._run(batch)
+
+        return [self._decode(output, transform) for output, transform in zip(outputs, transforms)]
+
+    def _prepare(self, images: Sequence[np.ndarray]):
+        """레터박스 리사이즈 후 NCHW float32 배치 구성 (배치 버퍼 재사용)"""
+        import cv2
+
+        size = self.input_size
+        shape = (len(images), 3, size, size)
+        if self._letterbox.shape != shape:
+            self._letterbox = np.empty(shape, dtype=np.float32)
+        batch = self._letterbox
+        batch.fill(114 / 255.0)
+
+        transforms = []
+        for index, image in enumerate(images):
+            if image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            height, width = image.shape[:2]
+            scale = min(size / height, size / width)
+            new_w, new_h = int(round(width * scale)), int(round(height * scale))
+            pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+
+            resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+            # BGR HWC uint8 → RGB CHW float
+            batch[index, :, pad_y:pad_y + new_h, pad_x:pad_x + new_w] = \
+                resized[..., ::-1].transpose(2, 0, 1) * (1 / 255.0)
+            transforms.append((scale, pad_x, pad_y, width, height))
+
+        return batch, transforms
+
+    def _decode(self, output: np.ndarray, transform) -> List[Detection]:
+        # [4 + nc, N] → [N, 4 + nc]
+        if output.shape[0] < output.shape[1]:
+            output = output.T
+        scores_all = output[:, 4:]
+        class_ids = scores_all.argmax(axis=1)
+        scores = scores_all[np.arange(len(class_ids)), class_ids]
+
+        keep = scores >= self.confidence
+        if not keep.any():
+            return []
+        boxes, scores, class_ids = output[keep, :4], scores[keep], class_ids[keep]
+
+        scale, pad_x, pad_y, width, height = transform
+        xyxy = np.empty_like(boxes)
+        xyxy[:, 0] = (boxes[:, 0] - boxes[:, 2] / 2 - pad_x) / scale
+        xyxy[:, 1] = (boxes[:, 1] - boxes[:, 3] / 2 - pad_y) / scale
+        xyxy[:, 2] = (boxes[:, 0] + boxes[:, 2] / 2 - pad_x) / scale
+        xyxy[:, 3] = (boxes[:, 1] + boxes[:, 3] / 2 - pad_y) / scale
+        xyxy[:, [0, 2]] = np.clip(xyxy[:, [0, 2]], 0, width)
+        xyxy[:, [1, 3]] = np.clip(xyxy[:, [1, 3]], 0, height)
+
+        selected = non_max_suppression(xyxy, scores, class_ids, self.iou, self.max_detections)
+        return [
+            Detection(int(class_ids[i]), self._class_name(int(class_ids[i])), float(scores[i]),
+                      tuple(map(float, xyxy[i])))
+            for i in selected
+        ]
+
+
+class OpenVINOBackend(OnnxBackend):
+    """OpenVINO Runtime CPU 백엔드 (.onnx 또는 .xml IR 모델)"""
+
+    name = 'openvino'
+
+    def _load(self):
+        import openvino as ov
+
+        core = ov.Core()
+        model = core.read_model(self.model_path)
+        self.compiled = core.compile_model(model, 'CPU', {'PERFORMANCE_HINT': 'LATENCY'})
+        self.output = self.compiled.output(0)
+
+        shape = self.compiled.input(0).get_partial_shape()
+        self.fixed_batch = shape[0].get_length() if shape[0].is_static else None
+        if shape[2].is_static:
+            self.input_size = shape[2].get_length()
+
+        try:
+            names = model.get_rt_info(['model_info', 'names']).astype(str)
+            self.class_names = {int(k): v for k, v in ast.literal_eval(names).items()}
+        except Exception:
+            pass
+        logger.info("OpenVINO 모델 로드 완료 (CPU)")
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self.compiled(batch)[self.output]
+
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, class_ids: np.ndarray,
+                        iou_threshold: float, max_detections: int) -> List[int]:
+    """
+    클래스별 NMS
+
+    클래스마다 좌표를 충분히 떨어뜨려(offset) 한 번의 NMS로 클래스별 억제를 수행한다.
+    """
+    if len(boxes) == 0:
+        return []
+
+    offsets = class_ids[:, None].astype(np.float32) * (boxes.max() + 1)
+    shifted = boxes + offsets
+    x1, y1, x2, y2 = shifted[:, 0], shifted[:, 1], shifted[:, 2], shifted[:, 3]
+    areas = np.maximum(0, x2 - x1) * np.maximum(0, y2 - y1)
+
+    order = scores.argsort()[::-1]
+    keep: List[int] = []
+    while order.size and len(keep) < max_detections:
+        best = order[0]
+        keep.append(int(best))
+        rest = order[1:]
+
+        inter_w = np.maximum(0, np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]))
+        inter_h = np.maximum(0, np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]))
+        intersection = inter_w * inter_h
+        iou = intersection / (areas[best] + areas[rest] - intersection + 1e-9)
+        order = rest[iou <= iou_threshold]
+
+    return keep
+
+
+BACKENDS = {
+    'ultralytics': UltralyticsBackend,
+    'onnx': OnnxBackend,
+    'openvino': OpenVINOBackend,
+}
+
+
+def create_backend(name: Optional[str] = None, model_path: Optional[str] = None) -> InferenceBackend:
+    """
+    설정에 맞는 추론 백엔드 생성
+
+    Args:
+        name: 'ultralytics', 'onnx', 'openvino' (기본값: settings.YOLO_BACKEND)
+        model_path: 모델 파일 경로 (기본값: settings.YOLO_MODEL_PATH)
+    """
+    name = (name or settings.YOLO_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 YOLO 백엔드입니다: {name}")
+
+    return BACKENDS[name](
+        model_path or settings.YOLO_MODEL_PATH,
+        confidence=settings.YOLO_CONFIDENCE_THRESHOLD,
+        iou=settings.YOLO_IOU_THRESHOLD,
+        max_detections=settings.YOLO_MAX_DETECTIONS,
+        input_size=settings.YOLO_INPUT_SIZE,
+    )
@@ -0,0 +1,85 @@
+"""
+CarePill 카메라 프레임 링 버퍼
+생산자(카메라)는 막히지 않고, 소비자(추론)는 항상 가장 최근 프레임부터 가져감
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, List, NamedTuple, Optional
+
+import numpy as np
+
+
+class Frame(NamedTuple):
+    """카메라 프레임"""
+    frame_id: int
+    timestamp: float        # time.monotonic()
+    image: np.ndarray
+
+
+class FrameRingBuffer:
+    """고정 크기 프레임 버퍼
+
+    가득 차면 가장 오래된 프레임을 버리고, take_latest()는 최신 프레임만 꺼낸 뒤 남은(더 오래된)
+    프레임을 모두 버린다. 추론이 카메라 속도를 따라가지 못해도 지연이 쌓이지 않는다.
+    """
+
+    def __init__(self, capacity: int = 4):
+        self.capacity = max(1, capacity)
+        self._frames: Deque[Frame] = deque(maxlen=self.capacity)
+        self._condition = threading.Condition()
+        self._next_id = 0
+        self._closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, image: np.ndarray) -> int:
+        """
+        프레임 추가 (막히지 않음)
+
+        Returns:
+            int: 프레임 ID
+        """
+        with self._condition:
+            if len(self._frames) == self.capacity:
+                self.dropped += 1
+            frame_id = self._next_id
+            self._next_id += 1
+            self._frames.append(Frame(frame_id, time.monotonic(), image))
+            self.received += 1
+            self._condition.notify()
+        return frame_id
+
+    def take_latest(self, max_frames: int = 1, timeout: Optional[float] = None) -> List[Frame]:
+        """
+        최신 프레임을 최대 max_frames개 꺼냄 (오래된 것부터 정렬)
+
+        Args:
+            max_frames: 꺼낼 최대 프레임 수
+            timeout: 프레임이 없을 때 대기할 시간 (초, None이면 무한 대기)
+
+        Returns:
+            List[Frame]: 꺼낸 프레임 (닫혔거나 시간 초과 시 빈 목록)
+        """
+        with self._condition:
+            if not self._frames and not self._closed:
+                self._condition.wait(timeout)
+            if not self._frames:
+                return []
+
+            frames = [self._frames.pop() for _ in range(min(max_frames, len(self._frames)))]
+            self.dropped += len(self._frames)
+            self._frames.clear()
+
+        frames.reverse()
+        return frames
+
+    def close(self):
+        """대기 중인 소비자를 깨우고 종료"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def __len__(self) -> int:
+        return len(self._frames)
@@ -0,0 +1,238 @@
+"""
+CarePill YOLO 추론 서비스
+카메라 프레임을 링 버퍼로 받아 최신 프레임 위주로 묶음 추론하고 검출 결과를 비동기로 저장
+"""
+
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from config import settings
+from database.database import DatabaseManager, get_db_manager
+from database.models import YOLODetection
+from utils.metrics import get_metrics_registry
+from .backends import Detection, InferenceBackend, create_backend
+from .frame_buffer import Frame, FrameRingBuffer
+from .storage import detection_row
+
+logger = logging.getLogger(__name__)
+
+# 검출 결과 콜백: (프레임, 검출 목록)
+DetectionCallback = Callable[[Frame, List[Detection]], None]
+
+
+class YOLOInferenceService:
+    """YOLO 추론 서비스
+
+    - 모델은 백엔드 생성 시 한 번만 로드한다.
+    - 추론 스레드는 링 버퍼에서 최신 프레임만 가져오므로 처리 속도가 카메라 FPS보다 느리면
+      중간 프레임을 건너뛰고 지연이 쌓이지 않는다.
+    - 직전 추론 프레임과 지각 해시가 거의 같으면(정지 화면) 추론을 생략하고 결과를 재사용한다.
+    - DB 저장은 별도 스레드에서 묶어서 수행하며, 저장이 밀리면 오래된 결과부터 버린다.
+    """
+
+    def __init__(self, backend: Optional[InferenceBackend] = None, db_manager: Optional[DatabaseManager] = None,
+                 batch_size: Optional[int] = None, buffer_size: Optional[int] = None,
+                 reuse_distance: Optional[int] = None, persist: bool = True):
+        """
+        Args:
+            backend: 추론 백엔드 (기본값: settings.YOLO_BACKEND로 생성)
+            db_manager: 데이터베이스 매니저 (기본값: 전역 매니저)
+            batch_size: 한 번에 추론할 최대 프레임 수
+            buffer_size: 프레임 링 버퍼 크기
+            reuse_distance: 결과를 재사용할 최대 지각 해시 거리 (음수면 재사용 안 함)
+            persist: 검출 결과 DB 저장 여부
+        """
+        self.backend = backend or create_backend()
+        self.db_manager = (db_manager or get_db_manager()) if persist else None
+        self.batch_size = batch_size or settings.YOLO_BATCH_SIZE
+        self.buffer = FrameRingBuffer(buffer_size or settings.YOLO_BUFFER_SIZE)
+        self.reuse_distance = settings.IMAGE_HASH_MAX_DISTANCE if reuse_distance is None else reuse_distance
+
+        self._callbacks: List[DetectionCallback] = []
+        self._write_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=settings.YOLO_WRITE_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._last_hash: Optional[int] = None
+        self._last_detections: List[Detection] = []
+        self._latest: Optional[tuple] = None
+        self._stats = {'inferred': 0, 'reused': 0, 'batches': 0, 'written': 0, 'write_dropped': 0}
+
+    def start(self):
+        """추론/저장 스레드 시작"""
+        if self._threads:
+            return
+        self._stop.clear()
+        self._threads = [threading.Thread(target=self._inference_loop, name='YOLOInference', daemon=True)]
+        if self.db_manager is not None:
+            self._threads.append(threading.Thread(target=self._writer_loop, name='YOLOWriter', daemon=True))
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"YOLO 추론 서비스 시작 ({self.backend.model_version}, 배치 {self.batch_size})")
+
+    def stop(self, timeout: float = 5.0):
+        """스레드 종료 (남은 검출 결과는 저장)"""
+        self._stop.set()
+        self.buffer.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._flush_writes()
+
+    def submit_frame(self, image: np.ndarray) -> int:
+        """카메라 프레임 입력 (막히지 않음)"""
+        return self.buffer.put(image)
+
+    def subscribe(self, callback: DetectionCallback):
+        """검출 결과 콜백 등록 (추론 스레드에서 호출됨)"""
+        self._callbacks.append(callback)
+
+    @property
+    def latest(self) -> Optional[tuple]:
+        """가장 최근 (프레임 ID, 검출 목록)"""
+        return self._latest
+
+    def stats(self) -> Dict[str, Any]:
+        """처리 통계"""
+        return {
+            **self._stats,
+            'received': self.buffer.received,
+            'skipped': self.buffer.dropped,
+            'write_queue': self._write_queue.qsize(),
+        }
+
+    def process_frames(self, frames: List[Frame]) -> List[List[Detection]]:
+        """
+        프레임 묶음 처리 (추론 스레드에서 호출, 직접 호출도 가능)
+
+        Returns:
+            List[List[Detection]]: 프레임별 검출 목록
+        """
+        from modules.vision.image_hash import hamming_distance, perceptual_hash
+
+        results: List[Optional[List[Detection]]] = [None] * len(frames)
+        hashes: List[Optional[int]] = []
+        to_infer: List[int] = []
+
+        for index, frame in enumerate(frames):
+            try:
+                frame_hash = perceptual_hash(frame.image)
+            except ValueError:
+                frame_hash = None
+            hashes.append(frame_hash)
+
+            if (self.reuse_distance >= 0 and frame_hash is not None and self._last_hash is not None
+                    and hamming_distance(frame_hash, self._last_hash) <= self.reuse_distance):
+                results[index] = self._last_detections
+                self._stats['reused'] += 1
+            else:
+                to_infer.append(index)
+
+        if to_infer:
+            start = time.perf_counter()
+            inferred = self.backend.predict([frames[i].image for i in to_infer])
+            elapsed = time.perf_counter() - start
+            get_metrics_registry().observe('yolo.inference', elapsed / len(to_infer), 'yolo')
+
+            self._stats['inferred'] += len(to_infer)
+            self._stats['batches'] += 1
+            for index, detections in zip(to_infer, inferred):
+                results[index] = detections
+                self._enqueue_write(frames[index], detections, hashes[index], elapsed / len(to_infer))
+
+            last = to_infer[-1]
+            self._last_hash = hashes[last]
+            self._last_detections = results[last]
+
+        for frame, detections in zip(frames, results):
+            get_metrics_registry().observe('yolo.frame_latency', time.monotonic() - frame.timestamp, 'yolo')
+            for callback in self._callbacks:
+                try:
+                    callback(frame, detections)
+                except Exception as e:
+                    logger.error(f"YOLO 검출 콜백 처리 실패: {e}")
+
+        if frames:
+            self._latest = (frames[-1].frame_id, results[-1])
+        return results
+
+    def _inference_loop(self):
+        while not self._stop.is_set():
+            frames = self.buffer.take_latest(self.batch_size, timeout=0.5)
+            if not frames:
+                continue
+            try:
+                self.process_frames(frames)
+            except Exception as e:
+                logger.error(f"YOLO 추론 실패: {e}")
+                time.sleep(0.5)
+
+    def _enqueue_write(self, frame: Frame, detections: List[Detection], frame_hash: Optional[int],
+                       processing_time: float):
+        if self.db_manager is None:
+            return
+        from modules.vision.image_hash import ImageHash, array_content_hash
+
+        # 지각 해시는 이미 계산했으므로 내용 해시만 더해 ImageResultCache와 같은 64자 키로 저장
+        image_hash = None
+        if frame_hash is not None:
+            image_hash = ImageHash(frame_hash, array_content_hash(frame.image)).key
+        row = detection_row(
+            detections,
+            image_path=f"camera://{frame.frame_id}",
+            image_hash=image_hash,
+            model_version=self.backend.model_version,
+            processing_time=processing_time,
+            created_at=datetime.utcnow(),
+        )
+        while True:
+            try:
+                self._write_queue.put_nowait(row)
+                return
+            except queue.Full:
+                # 저장이 밀리면 가장 오래된 결과를 버림
+                try:
+                    self._write_queue.get_nowait()
+                    self._stats['write_dropped'] += 1
+                except queue.Empty:
+                    pass
+
+    def _writer_loop(self):
+        while not self._stop.is_set():
+            try:
+                first = self._write_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            self._write_rows([first] + self._drain(self.batch_size * 16))
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        rows = []
+        while len(rows) < limit:
+            try:
+                rows.append(self._write_queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _flush_writes(self):
+        if self.db_manager is None:
+            return
+        while True:
+            rows = self._drain(500)
+            if not rows:
+                return
+            self._write_rows(rows)
+
+    def _write_rows(self, rows: List[Dict[str, Any]]):
+        try:
+            with self.db_manager.engine.begin() as connection:
+                connection.execute(YOLODetection.__table__.insert(), rows)
+            self._stats['written'] += len(rows)
+        except Exception as e:
+            self._stats['write_dropped'] += len(rows)
+            logger.error(f"YOLO 검출 결과 저장 실패 ({len(rows)}건): {e}")
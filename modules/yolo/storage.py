@@ -0,0 +1,188 @@
+"""
+CarePill YOLO 검출 결과 압축 저장
+검출 목록을 고정 길이 레코드(class_id int16, confidence float32, box int16×4)로 묶어 BLOB 하나에 저장
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import bindparam, null, select, update
+
+from database.models import YOLODetection
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# 검출 1건 = 14바이트 (JSON 3개 컬럼은 검출 1건당 약 80바이트이므로 약 1/5.5)
+DETECTION_DTYPE = np.dtype([
+    ('class_id', '<i2'),
+    ('confidence', '<f4'),
+    ('box', '<i2', (4,)),       # x1, y1, x2, y2 (픽셀)
+])
+
+_BOX_LIMIT = np.iinfo(np.int16).max
+
+
+class DetectionArrays(NamedTuple):
+    """검출 결과 배열"""
+    class_ids: np.ndarray       # (N,) int16
+    confidences: np.ndarray     # (N,) float32
+    boxes: np.ndarray           # (N, 4) int16
+
+    def __len__(self) -> int:
+        return len(self.class_ids)
+
+
+def pack_detections(class_ids: Sequence[int], confidences: Sequence[float], boxes: Sequence[Sequence[float]]) -> bytes:
+    """
+    검출 결과를 BLOB으로 인코딩
+
+    Args:
+        class_ids: 클래스 ID 목록
+        confidences: 신뢰도 목록
+        boxes: (x1, y1, x2, y2) 목록
+
+    Returns:
+        bytes: 형식 버전 1바이트 + 레코드 배열
+    """
+    records = np.empty(len(class_ids), dtype=DETECTION_DTYPE)
+    if len(records):
+        records['class_id'] = np.asarray(class_ids, dtype=np.int16)
+        records['confidence'] = np.asarray(confidences, dtype=np.float32)
+        records['box'] = np.clip(np.rint(np.asarray(boxes, dtype=np.float32).reshape(-1, 4)), 0, _BOX_LIMIT)
+    return bytes((FORMAT_VERSION,)) + records.tobytes()
+
+
+def pack_detection_list(detections: Iterable) -> bytes:
+    """Detection 목록을 BLOB으로 인코딩"""
+    detections = list(detections)
+    return pack_detections(
+        [d.class_id for d in detections],
+        [d.confidence for d in detections],
+        [d.box for d in detections],
+    )
+
+
+def unpack_detections(blob: Optional[bytes]) -> DetectionArrays:
+    """BLOB을 배열로 디코딩 (복사 없이 BLOB 버퍼를 그대로 참조)"""
+    if not blob:
+        return DetectionArrays(np.empty(0, np.int16), np.empty(0, np.float32), np.empty((0, 4), np.int16))
+    if blob[0] != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 검출 결과 형식입니다: {blob[0]}")
+
+    records = np.frombuffer(blob, dtype=DETECTION_DTYPE, offset=1)
+    return DetectionArrays(records['class_id'], records['confidence'], records['box'])
+
+
+def detections_from_json(detected_objects: Any, confidence_scores: Any, bounding_boxes: Any) -> DetectionArrays:
+    """기존 JSON 컬럼 값을 배열로 변환"""
+    objects = detected_objects or []
+    class_ids = [
+        int(obj.get('class_id', obj.get('class', -1))) if isinstance(obj, dict) else int(obj)
+        for obj in objects
+    ]
+    blob = pack_detections(class_ids, confidence_scores or [], bounding_boxes or [])
+    return unpack_detections(blob)
+
+
+def detection_arrays(row) -> DetectionArrays:
+    """YOLODetection 행(또는 같은 컬럼을 가진 Row)의 검출 결과를 배열로 반환"""
+    if row.detections is not None:
+        return unpack_detections(row.detections)
+    return detections_from_json(row.detected_objects, row.confidence_scores, row.bounding_boxes)
+
+
+def load_detections(session, since: Optional[datetime] = None, model_version: Optional[str] = None,
+                    limit: Optional[int] = None) -> List[tuple]:
+    """
+    검출 결과 조회
+
+    Args:
+        session: 데이터베이스 세션
+        since: 이 시각 이후 결과만
+        model_version: 모델 버전 필터
+        limit: 최대 행 수 (최신순)
+
+    Returns:
+        List[tuple]: (id, created_at, DetectionArrays)
+    """
+    stmt = select(
+        YOLODetection.id, YOLODetection.created_at, YOLODetection.detections,
+        YOLODetection.detected_objects, YOLODetection.confidence_scores, YOLODetection.bounding_boxes,
+    ).order_by(YOLODetection.id.desc())
+    if since is not None:
+        stmt = stmt.where(YOLODetection.created_at >= since)
+    if model_version is not None:
+        stmt = stmt.where(YOLODetection.model_version == model_version)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    return [(row.id, row.created_at, detection_arrays(row)) for row in session.execute(stmt)]
+
+
+def migrate_json_detections(engine, chunk_size: int = 1000) -> int:
+    """
+    JSON 컬럼에 저장된 기존 검출 결과를 BLOB으로 변환하고 JSON 값을 비움
+
+    Args:
+        engine: SQLAlchemy 엔진
+        chunk_size: 한 트랜잭션에서 변환할 행 수
+
+    Returns:
+        int: 변환된 행 수
+    """
+    table = YOLODetection.__table__
+    converted = 0
+    last_id = 0
+
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select(table.c.id, table.c.detected_objects, table.c.confidence_scores, table.c.bounding_boxes)
+                .where(table.c.id > last_id, table.c.detections.is_(None))
+                .order_by(table.c.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+
+            updates = []
+            for row in rows:
+                try:
+                    arrays = detections_from_json(row.detected_objects, row.confidence_scores, row.bounding_boxes)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"YOLO 검출 결과 {row.id} 변환 실패: {e}")
+                    continue
+                updates.append({
+                    'b_id': row.id,
+                    'detections': pack_detections(arrays.class_ids, arrays.confidences, arrays.boxes),
+                    'detection_count': len(arrays),
+                })
+
+            if updates:
+                connection.execute(
+                    update(table)
+                    .where(table.c.id == bindparam('b_id'))
+                    .values(detections=bindparam('detections'), detection_count=bindparam('detection_count'),
+                            detected_objects=null(), confidence_scores=null(), bounding_boxes=null()),
+                    updates,
+                )
+            converted += len(updates)
+            last_id = rows[-1].id
+
+    if converted:
+        logger.info(f"YOLO 검출 결과 {converted}건을 압축 형식으로 변환했습니다")
+    return converted
+
+
+def detection_row(detections: Iterable, **fields) -> Dict[str, Any]:
+    """yolo_detections INSERT용 행 구성 (JSON 컬럼은 생략하여 NULL로 저장)"""
+    detections = list(detections)
+    return {
+        'detections': pack_detection_list(detections),
+        'detection_count': len(detections),
+        **fields,
+    }
@@ -0,0 +1,173 @@
+"""
+조제 배치 할당 테스트
+FEFO 순서, 유효기간 지난 배치 제외, 부분/전체 조제, 동시 재고 변경 시 롤백 확인
+"""
+
+from datetime import date, timedelta
+from itertools import count
+
+import pytest
+from sqlalchemy import func, select, update
+
+from database.database import DatabaseManager
+from database.models import (DispensingRecord, InventoryItem, Medication, Patient, Prescription,
+                             PrescriptionItem)
+from modules.inventory.dispensing import DispensingAllocator, InsufficientStockError
+
+TODAY = date(2025, 3, 1)
+_prescription_numbers = count(1)
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'dispensing.db'}")
+    manager.create_tables()
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def allocator(db_manager):
+    return DispensingAllocator(db_manager)
+
+
+def add_medication(db_manager, name):
+    with db_manager.session_scope() as session:
+        medication = Medication(name=name)
+        session.add(medication)
+        session.flush()
+        return medication.id
+
+
+def add_batch(db_manager, medication_id, batch_number, expires_in_days, quantity, is_active=True):
+    with db_manager.session_scope() as session:
+        batch = InventoryItem(medication_id=medication_id, batch_number=batch_number,
+                              expiry_date=TODAY + timedelta(days=expires_in_days),
+                              quantity=quantity, initial_quantity=quantity, is_active=is_active)
+        session.add(batch)
+        session.flush()
+        return batch.id
+
+
+def add_prescription(db_manager, quantities):
+    """quantities: {medication_id: 처방 수량}"""
+    with db_manager.session_scope() as session:
+        patient = Patient(name='홍길동')
+        prescription = Prescription(patient=patient, prescription_number=f'RX-{next(_prescription_numbers):04d}',
+                                    doctor_name='김의사', hospital_name='서울병원', prescribed_date=TODAY)
+        for medication_id, quantity in quantities.items():
+            prescription.prescription_items.append(
+                PrescriptionItem(medication_id=medication_id, quantity=quantity, dosage='1일 1회', duration_days=7)
+            )
+        session.add(prescription)
+        session.flush()
+        return prescription.id
+
+
+def batch_quantities(db_manager):
+    with db_manager.session_scope() as session:
+        return dict(session.execute(select(InventoryItem.batch_number, InventoryItem.quantity)).all())
+
+
+def prescription_state(db_manager, prescription_id):
+    with db_manager.session_scope() as session:
+        status = session.scalar(select(Prescription.status).where(Prescription.id == prescription_id))
+        dispensed = session.scalars(
+            select(PrescriptionItem.dispensed_quantity)
+            .where(PrescriptionItem.prescription_id == prescription_id)
+            .order_by(PrescriptionItem.id)
+        ).all()
+        records = session.scalar(select(func.count()).select_from(DispensingRecord))
+        return status, dispensed, records
+
+
+def test_batches_are_allocated_first_expiry_first(db_manager, allocator):
+    medication_id = add_medication(db_manager, '아스피린')
+    add_batch(db_manager, medication_id, 'B-JUN', 90, 5)
+    add_batch(db_manager, medication_id, 'B-APR', 30, 3)
+    add_batch(db_manager, medication_id, 'B-DEC', 270, 10)
+    prescription_id = add_prescription(db_manager, {medication_id: 6})
+
+    result = allocator.dispense_prescription(prescription_id, '약사', today=TODAY)
+
+    assert [(a.batch_number, a.quantity) for a in result.allocations] == [('B-APR', 3), ('B-JUN', 3)]
+    assert (result.shortages, result.fully_dispensed) == ({}, True)
+    assert batch_quantities(db_manager) == {'B-APR': 0, 'B-JUN': 2, 'B-DEC': 10}
+    assert prescription_state(db_manager, prescription_id) == ('dispensed', [6], 2)
+
+
+def test_expired_and_inactive_batches_are_skipped(db_manager, allocator):
+    medication_id = add_medication(db_manager, '아스피린')
+    add_batch(db_manager, medication_id, 'EXPIRED', -1, 10)
+    add_batch(db_manager, medication_id, 'RECALLED', 10, 10, is_active=False)
+    add_batch(db_manager, medication_id, 'TODAY', 0, 2)
+    add_batch(db_manager, medication_id, 'LATER', 60, 5)
+    prescription_id = add_prescription(db_manager, {medication_id: 4})
+
+    result = allocator.dispense_prescription(prescription_id, '약사', today=TODAY)
+
+    # 유효기간이 오늘인 배치는 아직 사용 가능
+    assert [(a.batch_number, a.quantity) for a in result.allocations] == [('TODAY', 2), ('LATER', 2)]
+    assert batch_quantities(db_manager) == {'EXPIRED': 10, 'RECALLED': 10, 'TODAY': 0, 'LATER': 3}
+
+
+def test_shortage_dispenses_nothing_without_allow_partial(db_manager, allocator):
+    aspirin = add_medication(db_manager, '아스피린')
+    warfarin = add_medication(db_manager, '와파린')
+    add_batch(db_manager, aspirin, 'A-1', 30, 5)
+    add_batch(db_manager, warfarin, 'W-1', 30, 3)
+    add_batch(db_manager, warfarin, 'W-OLD', -5, 10)
+    prescription_id = add_prescription(db_manager, {aspirin: 2, warfarin: 5})
+
+    with pytest.raises(InsufficientStockError) as excinfo:
+        allocator.dispense_prescription(prescription_id, '약사', today=TODAY)
+
+    assert excinfo.value.shortages == {warfarin: 2}
+    assert batch_quantities(db_manager) == {'A-1': 5, 'W-1': 3, 'W-OLD': 10}
+    assert prescription_state(db_manager, prescription_id) == ('pending', [0, 0], 0)
+
+
+def test_partial_dispense_takes_what_is_available(db_manager, allocator):
+    aspirin = add_medication(db_manager, '아스피린')
+    warfarin = add_medication(db_manager, '와파린')
+    add_batch(db_manager, aspirin, 'A-1', 30, 5)
+    add_batch(db_manager, warfarin, 'W-1', 30, 3)
+    prescription_id = add_prescription(db_manager, {aspirin: 2, warfarin: 5})
+
+    partial = allocator.dispense_prescription(prescription_id, '약사', allow_partial=True, today=TODAY)
+
+    assert [(a.batch_number, a.quantity) for a in partial.allocations] == [('A-1', 2), ('W-1', 3)]
+    assert (partial.shortages, partial.fully_dispensed) == ({warfarin: 2}, False)
+    assert prescription_state(db_manager, prescription_id) == ('pending', [2, 3], 2)
+
+    # 입고 후 다시 조제하면 남은 수량만 할당
+    add_batch(db_manager, warfarin, 'W-2', 60, 10)
+    rest = allocator.dispense_prescription(prescription_id, '약사', today=TODAY)
+
+    assert [(a.batch_number, a.quantity) for a in rest.allocations] == [('W-2', 2)]
+    assert rest.fully_dispensed is True
+    assert batch_quantities(db_manager) == {'A-1': 3, 'W-1': 0, 'W-2': 8}
+    assert prescription_state(db_manager, prescription_id) == ('dispensed', [2, 5], 3)
+
+
+def test_stock_changed_after_read_rolls_back(db_manager, allocator, monkeypatch):
+    medication_id = add_medication(db_manager, '아스피린')
+    batch_id = add_batch(db_manager, medication_id, 'A-1', 30, 5)
+    add_batch(db_manager, medication_id, 'A-2', 60, 5)
+    prescription_id = add_prescription(db_manager, {medication_id: 4})
+
+    load_batches = allocator._load_batches
+
+    def load_then_change_stock(connection, medication_ids, today):
+        batches = load_batches(connection, medication_ids, today)
+        # 배치를 읽은 뒤 다른 조제로 재고가 줄어든 상황
+        connection.execute(update(InventoryItem).where(InventoryItem.id == batch_id).values(quantity=1))
+        return batches
+
+    monkeypatch.setattr(allocator, '_load_batches', load_then_change_stock)
+
+    with pytest.raises(RuntimeError, match='재고가 변경'):
+        allocator.dispense_prescription(prescription_id, '약사', today=TODAY)
+
+    assert batch_quantities(db_manager) == {'A-1': 5, 'A-2': 5}
+    assert prescription_state(db_manager, prescription_id) == ('pending', [0], 0)
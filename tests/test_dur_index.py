@@ -0,0 +1,147 @@
+"""
+DUR 메모리 인덱스 테스트
+환자의 복용 중 처방과의 상호작용 점검, 종료/취소 처방 제외, updated_at 워터마크 증분 반영 확인
+"""
+
+from datetime import date, timedelta
+from itertools import count
+
+import pytest
+from sqlalchemy import select
+
+from database.database import DatabaseManager
+from database.models import DURInteraction, Medication, Patient, Prescription, PrescriptionItem
+from modules.dur.engine import DURIndex
+
+TODAY = date(2025, 3, 1)
+_prescription_numbers = count(1)
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'dur.db'}")
+    manager.create_tables()
+    # 기존 DB와 같은 스키마 (001 등 마이그레이션 적용 후)
+    manager.migrate()
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def medications(db_manager):
+    with db_manager.session_scope() as session:
+        rows = {
+            'aspirin': Medication(name='아스피린정', generic_name='아스피린'),
+            'warfarin': Medication(name='와파린정', generic_name='와파린나트륨'),
+            'ibuprofen': Medication(name='부루펜정', generic_name='이부프로펜'),
+        }
+        session.add_all(rows.values())
+        session.flush()
+        return {key: medication.id for key, medication in rows.items()}
+
+
+@pytest.fixture
+def patient_id(db_manager):
+    with db_manager.session_scope() as session:
+        patient = Patient(name='홍길동')
+        session.add(patient)
+        session.flush()
+        return patient.id
+
+
+def add_interaction(db_manager, medication_id, interacting_medication, severity_level='high'):
+    with db_manager.session_scope() as session:
+        interaction = DURInteraction(medication_id=medication_id, interacting_medication=interacting_medication,
+                                     interaction_type='drug-drug', severity_level=severity_level,
+                                     description='출혈 위험 증가', source='KFDA')
+        session.add(interaction)
+        session.flush()
+        return interaction.id
+
+
+def add_prescription(db_manager, patient_id, medication_ids, days_ago=0, duration_days=7, status='pending'):
+    with db_manager.session_scope() as session:
+        prescription = Prescription(patient_id=patient_id, prescription_number=f'RX-{next(_prescription_numbers):04d}',
+                                    doctor_name='김의사', hospital_name='서울병원',
+                                    prescribed_date=TODAY - timedelta(days=days_ago), status=status)
+        for medication_id in medication_ids:
+            prescription.prescription_items.append(PrescriptionItem(
+                medication_id=medication_id, quantity=7, dosage='1일 1회', duration_days=duration_days))
+        session.add(prescription)
+        session.flush()
+        return prescription.id
+
+
+def check(db_manager, index, prescription_id, **kwargs):
+    with db_manager.session_scope() as session:
+        prescription = session.get(Prescription, prescription_id)
+        return [
+            (alert.medication_name, alert.interacting_medication_name, alert.from_current_prescription)
+            for alert in index.check_prescription(session, prescription, today=TODAY, **kwargs)
+        ]
+
+
+def rebuilt_index(db_manager):
+    index = DURIndex()
+    with db_manager.session_scope() as session:
+        index.rebuild(session)
+    return index
+
+
+def test_interaction_with_active_prescription_is_reported(db_manager, medications, patient_id):
+    add_interaction(db_manager, medications['aspirin'], '와파린 나트륨')
+    # 10일 전부터 30일간 복용 중인 처방
+    add_prescription(db_manager, patient_id, [medications['warfarin']], days_ago=10, duration_days=30)
+    current = add_prescription(db_manager, patient_id, [medications['aspirin']])
+    index = rebuilt_index(db_manager)
+
+    assert check(db_manager, index, current) == [('아스피린정', '와파린정', False)]
+    assert check(db_manager, index, current, include_active=False) == []
+
+
+def test_interaction_within_current_prescription_is_reported(db_manager, medications, patient_id):
+    add_interaction(db_manager, medications['aspirin'], '이부프로펜')
+    current = add_prescription(db_manager, patient_id, [medications['aspirin'], medications['ibuprofen']])
+    index = rebuilt_index(db_manager)
+
+    assert check(db_manager, index, current) == [('아스피린정', '부루펜정', True)]
+
+
+def test_finished_and_cancelled_prescriptions_are_excluded(db_manager, medications, patient_id):
+    add_interaction(db_manager, medications['aspirin'], '와파린나트륨')
+    add_interaction(db_manager, medications['aspirin'], '이부프로펜')
+    # 복용 기간이 어제 끝난 처방과 취소된 처방
+    add_prescription(db_manager, patient_id, [medications['warfarin']], days_ago=31, duration_days=30)
+    add_prescription(db_manager, patient_id, [medications['ibuprofen']], days_ago=1, status='cancelled')
+    current = add_prescription(db_manager, patient_id, [medications['aspirin']])
+    index = rebuilt_index(db_manager)
+
+    assert check(db_manager, index, current) == []
+
+    # 오늘이 복용 마지막 날이면 아직 복용 중
+    add_prescription(db_manager, patient_id, [medications['warfarin']], days_ago=30, duration_days=30)
+    assert check(db_manager, index, current) == [('아스피린정', '와파린정', False)]
+
+
+def test_refresh_applies_rows_changed_after_watermark(db_manager, medications):
+    changed_id = add_interaction(db_manager, medications['aspirin'], '와파린나트륨', severity_level='medium')
+    removed_id = add_interaction(db_manager, medications['aspirin'], '이부프로펜')
+    index = rebuilt_index(db_manager)
+    loaded_watermark = index.watermark
+
+    assert [entry.severity_level for entry in index.lookup(medications['aspirin'], '와파린나트륨')] == ['medium']
+
+    with db_manager.session_scope() as session:
+        session.get(DURInteraction, changed_id).severity_level = 'high'
+        session.get(DURInteraction, removed_id).is_active = False
+    added_id = add_interaction(db_manager, medications['warfarin'], '아스피린')
+
+    with db_manager.session_scope() as session:
+        assert index.refresh(session) >= 3
+        changed_at = session.scalar(select(DURInteraction.updated_at).where(DURInteraction.id == added_id))
+
+    assert index.watermark == changed_at > loaded_watermark
+    assert [entry.severity_level for entry in index.lookup(medications['aspirin'], '와파린나트륨')] == ['high']
+    assert index.lookup(medications['aspirin'], '이부프로펜') == []
+    assert [entry.id for entry in index.lookup(medications['warfarin'], '아스피린')] == [added_id]
+    assert len(index) == 2
@@ -0,0 +1,104 @@
+"""
+식약처 데이터 반영기 테스트
+CP949 CSV, XML(iterparse), JSON 배열 스트리밍 읽기와 upsert 변경 건수 집계 확인
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+
+from database.database import DatabaseManager
+from database.models import DURInteraction, Medication
+from modules.dur.importer import KFDAImporter, iter_json_records, iter_records
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'kfda'
+MEDICATIONS_CSV = FIXTURES / 'medications.csv'
+MEDICATIONS_JSON = FIXTURES / 'medications_update.json'
+DUR_XML = FIXTURES / 'dur_interactions.xml'
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'kfda.db'}")
+    manager.create_tables()
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def importer(db_manager):
+    # 묶음 경계를 지나도록 작게 설정
+    return KFDAImporter(db_manager, chunk_size=2)
+
+
+def test_csv_records_are_decoded_from_cp949():
+    records = list(iter_records(MEDICATIONS_CSV))
+
+    assert len(records) == 4
+    assert records[0]['ITEM_NAME'] == '아스피린장용정100밀리그램'
+    assert records[2]['ITEM_NAME'] == '타이레놀정500밀리그램(아세트아미노펜)'
+
+
+def test_xml_records_are_streamed_per_item():
+    records = list(iter_records(DUR_XML))
+
+    assert [record['ITEM_SEQ'] for record in records] == ['199100001', '199100002', '199100003', '199999999']
+    assert records[2]['TYPE_NAME'] == '효능군중복'
+    assert 'NOTIFICATION_DATE' not in records[3]
+
+
+@pytest.mark.parametrize('chunk_size', [8, 64, 65536])
+def test_json_array_is_streamed_across_chunk_boundaries(chunk_size):
+    expected = json.loads(MEDICATIONS_JSON.read_text(encoding='utf-8'))
+
+    assert list(iter_json_records(MEDICATIONS_JSON, chunk_size=chunk_size)) == expected
+
+
+def test_import_medications_counts_only_changed_rows(importer, db_manager):
+    first = importer.import_medications(MEDICATIONS_CSV)
+    assert (first.processed, first.changed, first.skipped) == (4, 3, 1)
+
+    # 같은 덤프를 다시 반영하면 바뀐 행이 없음
+    again = importer.import_medications(MEDICATIONS_CSV)
+    assert (again.processed, again.changed) == (4, 0)
+
+    # 1건 동일, 1건 유효기간 변경, 1건 신규
+    update = importer.import_medications(MEDICATIONS_JSON)
+    assert (update.processed, update.changed, update.skipped) == (3, 2, 0)
+
+    with db_manager.session_scope() as session:
+        rows = {row.kfda_code: row for row in session.scalars(select(Medication))}
+        assert len(rows) == 4
+        assert rows['199100001'].generic_name == '아스피린'
+        assert rows['199100001'].shelf_life_months == 36
+        assert rows['199100002'].shelf_life_months == 60
+        assert rows['199100005'].prescription_required is True
+
+
+def test_import_dur_interactions_counts_only_changed_rows(importer, db_manager):
+    importer.import_medications(MEDICATIONS_CSV)
+
+    first = importer.import_dur_interactions(DUR_XML, full_snapshot=True)
+    # 등록되지 않은 품목 1건은 제외
+    assert (first.processed, first.changed, first.skipped, first.deactivated) == (4, 3, 1, 0)
+
+    again = importer.import_dur_interactions(DUR_XML, full_snapshot=True)
+    assert (again.changed, again.deactivated) == (0, 0)
+
+    # 심각도 변경 1건만 담은 전체 덤프: 1건 변경, 나머지 2건 비활성화
+    records = [{
+        'ITEM_SEQ': '199100001', 'TYPE_NAME': '병용금기', 'MIXTURE_INGR_KOR_NAME': '와파린나트륨',
+        'PROHBT_CONTENT': '출혈 위험 증가', 'NOTIFICATION_DATE': '20240105', 'SEVERITY_LEVEL': 'critical',
+    }]
+    update = importer.import_dur_interactions(lambda: iter(records), full_snapshot=True)
+    assert (update.processed, update.changed, update.deactivated) == (1, 1, 2)
+
+    with db_manager.session_scope() as session:
+        rows = session.scalars(select(DURInteraction).order_by(DURInteraction.id)).all()
+        assert [(row.interaction_type, row.severity_level, row.is_active) for row in rows] == [
+            ('drug-drug', 'critical', True),
+            ('drug-drug', 'high', False),
+            ('duplicate-therapy', 'medium', False),
+        ]
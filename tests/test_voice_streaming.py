@@ -0,0 +1,143 @@
+"""
+음성 스트리밍 모드 테스트
+가짜 OpenAI 클라이언트로 문장 분리, 재생 순서, 스트림 오류 시 대화 기록 확인
+(오디오 장치 없이 실행되도록 pyaudio/pygame/openai 모듈은 대체)
+"""
+
+import importlib
+import json
+import sys
+import time
+import types
+from types import SimpleNamespace
+
+import pytest
+
+FALLBACK = "죄송합니다. 응답을 생성하는 중 오류가 발생했습니다."
+
+
+class FakeStream:
+    """chunk 목록을 차례로 돌려준 뒤 error가 있으면 발생시키는 스트리밍 응답"""
+
+    def __init__(self, deltas, error=None):
+        self.deltas = deltas
+        self.error = error
+
+    def __iter__(self):
+        for delta in self.deltas:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+        if self.error is not None:
+            raise self.error
+
+
+class FakeOpenAI:
+    """chat.completions.create(stream=True)와 audio.speech.create만 흉내내는 클라이언트"""
+
+    def __init__(self, deltas=(), error=None, tts_delays=None):
+        self.deltas = list(deltas)
+        self.error = error
+        self.tts_delays = tts_delays or {}
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_completion))
+        self.audio = SimpleNamespace(speech=SimpleNamespace(create=self._create_speech))
+
+    def _create_completion(self, **kwargs):
+        self.requests.append(kwargs)
+        return FakeStream(self.deltas, self.error)
+
+    def _create_speech(self, model, voice, input):
+        time.sleep(self.tts_delays.get(input, 0))
+        return SimpleNamespace(content=input.encode('utf-8'))
+
+
+@pytest.fixture
+def voice_chat(monkeypatch):
+    pyaudio = types.ModuleType('pyaudio')
+    pyaudio.paInt16 = 8
+    pyaudio.PyAudio = lambda: SimpleNamespace(terminate=lambda: None)
+    pygame = types.ModuleType('pygame')
+    pygame.mixer = SimpleNamespace(init=lambda: None, quit=lambda: None)
+    openai = types.ModuleType('openai')
+    openai.OpenAI = None
+
+    for name, module in (('pyaudio', pyaudio), ('pygame', pygame), ('openai', openai)):
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.delitem(sys.modules, 'voice_chat', raising=False)
+    return importlib.import_module('voice_chat')
+
+
+@pytest.fixture
+def make_chat(voice_chat, tmp_path):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({
+        'openai_api_key': 'sk-test', 'tts_model': 'tts-1', 'tts_voice': 'alloy', 'tts_cache': False,
+    }), encoding='utf-8')
+    return lambda client: voice_chat.VoiceChatGPT(str(config_path), client=client)
+
+
+def test_sentences_are_split_across_chunk_boundaries(voice_chat):
+    chunks = ['오늘 드실 약은', ' 두 가지입니다. 아침', ' 식후에 한 알씩 드', '세요! 물과 함께', ' 드세요.']
+
+    assert list(voice_chat.iter_sentences(chunks)) == [
+        '오늘 드실 약은 두 가지입니다.',
+        '아침 식후에 한 알씩 드세요!',
+        '물과 함께 드세요.',
+    ]
+
+
+def test_short_sentences_are_merged_with_the_next(voice_chat):
+    assert list(voice_chat.iter_sentences(['네. 알', '겠습니다. 다른 질문이 있으신가요?'])) == [
+        '네. 알겠습니다.',
+        '다른 질문이 있으신가요?',
+    ]
+
+
+def test_audio_is_played_in_sentence_order_when_tts_is_slower(make_chat):
+    sentences = ['첫 번째 안내 문장입니다.', '두 번째 안내 문장입니다.', '세 번째 안내 문장입니다.']
+    # 앞 문장일수록 TTS가 늦게 끝나도록 설정
+    chat = make_chat(FakeOpenAI(tts_delays={sentences[0]: 0.2, sentences[1]: 0.1}))
+    played = []
+
+    spoken = chat.speak_streaming(iter(sentences), player=played.append, tts_workers=3)
+
+    assert played == [sentence.encode('utf-8') for sentence in sentences]
+    assert spoken == ' '.join(sentences)
+
+
+def test_streamed_reply_is_spoken_and_recorded(make_chat):
+    client = FakeOpenAI(deltas=['아스피린은 식후에', ' 드세요. 하루', ' 한 번입니다.'])
+    chat = make_chat(client)
+    played = []
+
+    spoken = chat.speak_streaming(chat.chat_with_gpt_stream('아스피린 언제 먹어요?'), player=played.append)
+
+    assert spoken == '아스피린은 식후에 드세요. 하루 한 번입니다.'
+    assert played == ['아스피린은 식후에 드세요.'.encode('utf-8'), '하루 한 번입니다.'.encode('utf-8')]
+    assert client.requests[0]['stream'] is True
+    assert chat.conversation_history[-2:] == [
+        {'role': 'user', 'content': '아스피린 언제 먹어요?'},
+        {'role': 'assistant', 'content': '아스피린은 식후에 드세요. 하루 한 번입니다.'},
+    ]
+
+
+def test_stream_error_before_any_text_speaks_fallback(make_chat):
+    chat = make_chat(FakeOpenAI(error=ConnectionError('연결 끊김')))
+    played = []
+
+    spoken = chat.speak_streaming(chat.chat_with_gpt_stream('안녕하세요'), player=played.append)
+
+    assert spoken == FALLBACK
+    assert played == [FALLBACK.encode('utf-8')]
+    assert chat.conversation_history[-1] == {'role': 'assistant', 'content': FALLBACK}
+
+
+def test_stream_error_after_partial_text_keeps_received_text(make_chat):
+    chat = make_chat(FakeOpenAI(deltas=['식후 30분에 드세요. 물은', ' 충분히'], error=ConnectionError('연결 끊김')))
+    played = []
+
+    spoken = chat.speak_streaming(chat.chat_with_gpt_stream('언제 먹어요?'), player=played.append)
+
+    # 완성된 문장만 재생하고, 대화 기록에는 받은 내용까지 남김
+    assert spoken == '식후 30분에 드세요.'
+    assert played == ['식후 30분에 드세요.'.encode('utf-8')]
+    assert chat.conversation_history[-1] == {'role': 'assistant', 'content': '식후 30분에 드세요. 물은 충분히'}
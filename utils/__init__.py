@@ -4,6 +4,8 @@ CarePill 유틸리티 패키지
 
 from .logger import (
     get_logger,
+    get_logging_stats,
+    shutdown_logging,
     log_system_event,
     log_error,
     log_performance,
@@ -16,8 +18,29 @@ from .logger import (
     log_voice_event
 )
 
+from .metrics import (
+    MetricsRegistry,
+    get_metrics_registry,
+    timer,
+    timed
+)
+
+from .startup import (
+    StartupProfiler,
+    get_startup_profiler
+)
+
+from .db_logging import (
+    SystemLogHandler,
+    enable_database_logging,
+    disable_database_logging,
+    prune_system_logs
+)
+
 __all__ = [
     'get_logger',
+    'get_logging_stats',
+    'shutdown_logging',
     'log_system_event',
     'log_error',
     'log_performance',
@@ -27,5 +50,15 @@ __all__ = [
     'log_api_event',
     'log_hardware_event',
     'log_dur_event',
-    'log_voice_event'
+    'log_voice_event',
+    'MetricsRegistry',
+    'get_metrics_registry',
+    'timer',
+    'timed',
+    'StartupProfiler',
+    'get_startup_profiler',
+    'SystemLogHandler',
+    'enable_database_logging',
+    'disable_database_logging',
+    'prune_system_logs'
 ]
\ No newline at end of file
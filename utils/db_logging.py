@@ -0,0 +1,246 @@
+"""
+CarePill 데이터베이스 로그 싱크
+시스템/에러/성능 로그를 버퍼링하여 system_logs 테이블에 일괄 저장
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import delete, select
+
+from config import settings
+
+# DB에 저장할 로거 이름
+DATABASE_LOGGERS = ('carepill.system', 'carepill.error', 'carepill.performance')
+
+# LogRecord 기본 속성 (details에서 제외)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+# 핸들러 자체 오류는 DB 싱크가 붙지 않은 로거로 기록
+_internal_logger = logging.getLogger('carepill_db_logging')
+
+
+class SystemLogHandler(logging.Handler):
+    """로그 레코드를 모아 system_logs 테이블에 일괄 삽입하는 핸들러
+
+    emit()은 버퍼에 추가만 하며, 실제 INSERT는 전용 연결을 가진 백그라운드 스레드에서
+    배치 크기 또는 주기 조건을 만족할 때 한 번의 executemany로 수행한다.
+    """
+
+    def __init__(self, database_url: Optional[str] = None, batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None, max_buffer: Optional[int] = None,
+                 retention_days: Optional[int] = None, level: int = logging.INFO):
+        """
+        Args:
+            database_url: 데이터베이스 연결 URL
+            batch_size: 즉시 flush를 유발하는 버퍼 크기
+            flush_interval: 주기적 flush 간격 (초)
+            max_buffer: 버퍼 최대 크기 (초과 시 오래된 레코드부터 버림)
+            retention_days: 로그 보관 일수 (0이면 정리하지 않음)
+            level: 저장할 최소 로그 레벨
+        """
+        super().__init__(level)
+        from database.database import DatabaseManager
+
+        self.db_manager = DatabaseManager(database_url or settings.get_database_url())
+        self.batch_size = batch_size or settings.SYSTEM_LOG_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.SYSTEM_LOG_FLUSH_INTERVAL
+        self.retention_days = settings.SYSTEM_LOG_RETENTION_DAYS if retention_days is None else retention_days
+        self.max_buffer = max_buffer or self.batch_size * 50
+
+        self.dropped = 0
+        self.written = 0
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._buffer_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._last_prune = 0.0
+        self._thread = threading.Thread(target=self._run, name='SystemLogFlusher', daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            row = self._to_row(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self._buffer_lock:
+            if len(self._buffer) >= self.max_buffer:
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append(row)
+            should_flush = len(self._buffer) >= self.batch_size
+
+        if should_flush:
+            self._wakeup.set()
+
+    def flush(self):
+        """버퍼에 남은 로그를 즉시 저장 (호출 스레드에서 실행)"""
+        self._write_pending()
+
+    def close(self):
+        """백그라운드 스레드 종료 후 남은 로그 저장"""
+        if not self._stopping.is_set():
+            self._stopping.set()
+            self._wakeup.set()
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._write_pending()
+            self.db_manager.close()
+        super().close()
+
+    def prune(self, retention_days: Optional[int] = None, chunk_size: int = 1000) -> int:
+        """
+        보관 기간이 지난 로그를 청크 단위로 삭제
+
+        Args:
+            retention_days: 보관 일수
+            chunk_size: 한 번에 삭제할 행 수
+
+        Returns:
+            int: 삭제된 행 수
+        """
+        return prune_system_logs(self.db_manager.engine,
+                                 self.retention_days if retention_days is None else retention_days,
+                                 chunk_size)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._write_pending()
+
+            if self.retention_days > 0 and time.monotonic() - self._last_prune > 3600:
+                self._last_prune = time.monotonic()
+                try:
+                    self.prune()
+                except Exception as e:
+                    _internal_logger.warning(f"시스템 로그 정리 실패: {e}")
+
+    def _write_pending(self):
+        from database.models import SystemLog
+
+        while True:
+            with self._buffer_lock:
+                if not self._buffer:
+                    return
+                rows = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+
+            try:
+                with self.db_manager.engine.begin() as connection:
+                    connection.execute(SystemLog.__table__.insert(), rows)
+                self.written += len(rows)
+            except Exception as e:
+                self.dropped += len(rows)
+                _internal_logger.warning(f"시스템 로그 DB 저장 실패 ({len(rows)}건): {e}")
+                return
+
+    @staticmethod
+    def _to_row(record: logging.LogRecord) -> Dict[str, Any]:
+        details = {
+            key: value for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES and key != 'component' and value is not None
+        }
+        if record.exc_info and record.exc_info[1] is not None:
+            details['exception'] = repr(record.exc_info[1])
+        details['logger'] = record.name
+
+        return {
+            'level': record.levelname,
+            'module': str(getattr(record, 'component', None) or record.module)[:100],
+            'message': record.getMessage(),
+            'details': {key: _json_safe(value) for key, value in details.items()},
+            'user_id': details.get('user_id'),
+            'ip_address': details.get('ip_address'),
+            'created_at': datetime.utcfromtimestamp(record.created),
+        }
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def prune_system_logs(engine, retention_days: int, chunk_size: int = 1000) -> int:
+    """
+    보관 기간이 지난 system_logs 행을 청크 단위로 삭제 (긴 잠금을 피하기 위함)
+
+    Args:
+        engine: SQLAlchemy 엔진
+        retention_days: 보관 일수
+        chunk_size: 한 트랜잭션에서 삭제할 최대 행 수
+
+    Returns:
+        int: 삭제된 행 수
+    """
+    from database.models import SystemLog
+
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = 0
+
+    while True:
+        with engine.begin() as connection:
+            ids = connection.execute(
+                select(SystemLog.id)
+                .where(SystemLog.created_at < cutoff)
+                .order_by(SystemLog.created_at)
+                .limit(chunk_size)
+            ).scalars().all()
+            if not ids:
+                break
+            connection.execute(delete(SystemLog).where(SystemLog.id.in_(ids)))
+        deleted += len(ids)
+        if len(ids) < chunk_size:
+            break
+
+    if deleted:
+        _internal_logger.info(f"시스템 로그 정리 완료: {deleted}건 삭제 (보관 {retention_days}일)")
+    return deleted
+
+
+# 전역 DB 로그 핸들러
+_db_log_handler: Optional[SystemLogHandler] = None
+
+
+def enable_database_logging(database_url: Optional[str] = None) -> Optional[SystemLogHandler]:
+    """
+    시스템/에러/성능 로거에 DB 로그 싱크 연결
+
+    Args:
+        database_url: 데이터베이스 연결 URL
+
+    Returns:
+        SystemLogHandler: 연결된 핸들러 (비활성화 설정이면 None)
+    """
+    global _db_log_handler
+
+    if not settings.SYSTEM_LOG_DB_ENABLED:
+        return None
+
+    if _db_log_handler is None:
+        _db_log_handler = SystemLogHandler(database_url)
+        for name in DATABASE_LOGGERS:
+            logging.getLogger(name).addHandler(_db_log_handler)
+        atexit.register(disable_database_logging)
+
+    return _db_log_handler
+
+
+def disable_database_logging():
+    """DB 로그 싱크 분리 및 남은 로그 저장"""
+    global _db_log_handler
+
+    handler = _db_log_handler
+    if handler is None:
+        return
+    _db_log_handler = None
+
+    for name in DATABASE_LOGGERS:
+        logging.getLogger(name).removeHandler(handler)
+    handler.close()
@@ -3,18 +3,120 @@ CarePill 로깅 유틸리티
 시스템 전체에서 사용할 로거 설정 및 관리
 """
 
+import atexit
+import queue
+import sys
 import logging
 import logging.config
+import logging.handlers
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 from config import settings
 
 
+class BatchRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """레코드마다 flush하지 않고 배치 단위로 flush하는 회전 파일 핸들러"""
+
+    def flush(self):
+        # emit()마다 호출되는 flush는 생략하고 flush_batch()에서 처리
+        pass
+
+    def flush_batch(self):
+        """버퍼에 쌓인 로그를 파일에 기록"""
+        super().flush()
+
+    def close(self):
+        self.flush_batch()
+        super().close()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 레코드를 버리고 개수를 세는 큐 핸들러"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped: Dict[str, int] = {}
+        self._dropped_lock = threading.Lock()
+
+    # 오류 레코드는 버리기 전에 잠시 대기 (초)
+    error_put_timeout: float = 0.05
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if record.levelno >= logging.ERROR:
+                self.queue.put(record, timeout=self.error_put_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """큐에 쌓인 레코드를 배치로 꺼내 처리한 뒤 한 번에 flush하는 리스너"""
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler,
+                 batch_size: int = 100, respect_handler_level: bool = True):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = max(1, batch_size)
+        self.batches = 0
+        self.processed = 0
+
+    def enqueue_sentinel(self):
+        # 큐가 가득 차 있어도 종료 신호는 반드시 전달
+        self.queue.put(self._sentinel)
+
+    def _monitor(self):
+        log_queue = self.queue
+        has_task_done = hasattr(log_queue, 'task_done')
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+                    self.processed += 1
+                if has_task_done:
+                    log_queue.task_done()
+
+            self.batches += 1
+            self._flush_handlers()
+            if stop:
+                break
+
+    def _flush_handlers(self):
+        for handler in self.handlers:
+            stream = getattr(handler, 'stream', None)
+            if stream is not None and getattr(stream, 'closed', False):
+                # 이미 닫힌 스트림 (테스트 종료 후 교체된 stderr 등)
+                continue
+            try:
+                if isinstance(handler, BatchRotatingFileHandler):
+                    handler.flush_batch()
+                else:
+                    handler.flush()
+            except Exception as e:
+                # handleError()는 레코드가 있어야 하므로 한 줄만 남김
+                if logging.raiseExceptions and sys.stderr:
+                    sys.stderr.write(f"로그 핸들러 flush 실패 ({type(handler).__name__}): {e}\n")
+
+
 class CarePillLogger:
     """CarePill 전용 로거 클래스"""
 
     _instance: Optional['CarePillLogger'] = None
     _initialized: bool = False
+    _queue_handler: Optional[DroppingQueueHandler] = None
+    _listener: Optional[BatchingQueueListener] = None
 
     def __new__(cls) -> 'CarePillLogger':
         if cls._instance is None:
@@ -34,12 +136,63 @@ class CarePillLogger:
 
         # 로깅 설정 적용
         logging_config = settings.get_logging_config()
+        if settings.LOG_ASYNC:
+            # 파일 핸들러는 리스너 스레드에서 배치 단위로 flush
+            file_handler_config = logging_config['handlers']['file']
+            file_handler_config.pop('class')
+            file_handler_config['()'] = BatchRotatingFileHandler
         logging.config.dictConfig(logging_config)
 
+        if settings.LOG_ASYNC:
+            self._start_async_logging()
+
         # 기본 로거 설정
         self.logger = logging.getLogger('carepill')
         self.logger.info("CarePill 로깅 시스템 초기화 완료")
 
+    def _start_async_logging(self):
+        """루트 로거 핸들러를 백그라운드 리스너로 옮기고 큐 핸들러로 교체"""
+        root_logger = logging.getLogger()
+        handlers: List[logging.Handler] = list(root_logger.handlers)
+
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        self._queue_handler = DroppingQueueHandler(log_queue)
+        self._listener = BatchingQueueListener(
+            log_queue, *handlers,
+            batch_size=settings.LOG_BATCH_SIZE,
+            respect_handler_level=True
+        )
+
+        for handler in handlers:
+            root_logger.removeHandler(handler)
+        root_logger.addHandler(self._queue_handler)
+
+        self._listener.start()
+        atexit.register(self.shutdown)
+
+    def shutdown(self):
+        """비동기 로깅 종료 (남은 레코드 기록 후 리스너 중지)"""
+        listener = self._listener
+        if listener is None:
+            return
+        self._listener = None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+    def get_stats(self) -> Dict[str, object]:
+        """비동기 로깅 통계 반환 (큐 적재량, 처리/누락 건수)"""
+        if self._queue_handler is None:
+            return {'async': False}
+        listener = self._listener
+        return {
+            'async': True,
+            'queued': self._queue_handler.queue.qsize(),
+            'processed': listener.processed if listener else 0,
+            'batches': listener.batches if listener else 0,
+            'dropped': dict(self._queue_handler.dropped),
+        }
+
     def get_logger(self, name: str = 'carepill') -> logging.Logger:
         """지정된 이름의 로거 반환"""
         return logging.getLogger(name)
@@ -47,7 +200,7 @@ class CarePillLogger:
     def log_system_event(self, level: str, module: str, message: str, **kwargs):
         """시스템 이벤트 로깅"""
         extra = {
-            'module': module,
+            'component': module,
             **kwargs
         }
 
@@ -57,7 +210,7 @@ class CarePillLogger:
     def log_ocr_event(self, message: str, image_path: str = None, confidence: float = None, **kwargs):
         """OCR 이벤트 로깅"""
         extra = {
-            'module': 'ocr',
+            'component': 'ocr',
             'image_path': image_path,
             'confidence': confidence,
             **kwargs
@@ -69,7 +222,7 @@ class CarePillLogger:
     def log_yolo_event(self, message: str, image_path: str = None, detections: int = None, **kwargs):
         """YOLO 이벤트 로깅"""
         extra = {
-            'module': 'yolo',
+            'component': 'yolo',
             'image_path': image_path,
             'detections': detections,
             **kwargs
@@ -81,7 +234,7 @@ class CarePillLogger:
     def log_database_event(self, message: str, operation: str = None, table: str = None, **kwargs):
         """데이터베이스 이벤트 로깅"""
         extra = {
-            'module': 'database',
+            'component': 'database',
             'operation': operation,
             'table': table,
             **kwargs
@@ -93,7 +246,7 @@ class CarePillLogger:
     def log_api_event(self, message: str, endpoint: str = None, method: str = None, status_code: int = None, **kwargs):
         """API 이벤트 로깅"""
         extra = {
-            'module': 'api',
+            'component': 'api',
             'endpoint': endpoint,
             'method': method,
             'status_code': status_code,
@@ -106,7 +259,7 @@ class CarePillLogger:
     def log_hardware_event(self, message: str, device: str = None, **kwargs):
         """하드웨어 이벤트 로깅"""
         extra = {
-            'module': 'hardware',
+            'component': 'hardware',
             'device': device,
             **kwargs
         }
@@ -117,7 +270,7 @@ class CarePillLogger:
     def log_dur_event(self, message: str, interaction_type: str = None, severity: str = None, **kwargs):
         """DUR 이벤트 로깅"""
         extra = {
-            'module': 'dur',
+            'component': 'dur',
             'interaction_type': interaction_type,
             'severity': severity,
             **kwargs
@@ -129,7 +282,7 @@ class CarePillLogger:
     def log_voice_event(self, message: str, operation: str = None, duration: float = None, **kwargs):
         """음성 처리 이벤트 로깅"""
         extra = {
-            'module': 'voice',
+            'component': 'voice',
             'operation': operation,
             'duration': duration,
             **kwargs
@@ -141,7 +294,7 @@ class CarePillLogger:
     def log_error(self, message: str, error: Exception = None, module: str = None, **kwargs):
         """에러 로깅"""
         extra = {
-            'module': module or 'unknown',
+            'component': module or 'unknown',
             'error_type': type(error).__name__ if error else None,
             'error_details': str(error) if error else None,
             **kwargs
@@ -153,7 +306,7 @@ class CarePillLogger:
     def log_performance(self, operation: str, duration: float, module: str = None, **kwargs):
         """성능 로깅"""
         extra = {
-            'module': module or 'performance',
+            'component': module or 'performance',
             'operation': operation,
             'duration': duration,
             **kwargs
@@ -171,6 +324,14 @@ def get_logger(name: str = 'carepill') -> logging.Logger:
     """로거 인스턴스 반환"""
     return _carepill_logger.get_logger(name)
 
+def get_logging_stats() -> Dict[str, object]:
+    """비동기 로깅 통계 반환"""
+    return _carepill_logger.get_stats()
+
+def shutdown_logging():
+    """남은 로그를 기록하고 비동기 로깅 종료"""
+    _carepill_logger.shutdown()
+
 def log_system_event(level: str, module: str, message: str, **kwargs):
     """시스템 이벤트 로깅 헬퍼"""
     _carepill_logger.log_system_event(level, module, message, **kwargs)
@@ -0,0 +1,191 @@
+"""
+CarePill 성능 지표 수집
+작업별 실행 시간 히스토그램(p50/p95/p99)을 프로세스 내에서 유지하고 Prometheus 텍스트로 내보냄
+"""
+
+import functools
+import inspect
+import math
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, Optional
+
+from config import settings
+
+
+class LatencyHistogram:
+    """최근 실행 시간 표본과 누적 통계를 보관하는 히스토그램"""
+
+    def __init__(self, window: int = 1024):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.errors = 0
+
+    def observe(self, duration: float, error: bool = False):
+        """실행 시간 기록 (초)"""
+        self._samples.append(duration)
+        self.count += 1
+        self.total += duration
+        if duration > self.maximum:
+            self.maximum = duration
+        if error:
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """누적 통계와 최근 표본 기준 백분위수 반환"""
+        ordered = sorted(self._samples)
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'sum': self.total,
+            'avg': self.total / self.count if self.count else 0.0,
+            'p50': _percentile(ordered, 0.50),
+            'p95': _percentile(ordered, 0.95),
+            'p99': _percentile(ordered, 0.99),
+            'max': self.maximum,
+        }
+
+
+def _percentile(ordered, fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+class MetricsRegistry:
+    """작업별 히스토그램 레지스트리"""
+
+    def __init__(self, window: Optional[int] = None, slow_threshold: Optional[float] = None):
+        """
+        Args:
+            window: 백분위수 계산에 사용할 최근 표본 수
+            slow_threshold: 이 시간(초)을 넘는 작업은 log_performance로 기록
+        """
+        self.window = window or settings.METRICS_WINDOW
+        self.slow_threshold = settings.PERF_SLOW_THRESHOLD if slow_threshold is None else slow_threshold
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._modules: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, operation: str, duration: float, module: Optional[str] = None, error: bool = False):
+        """작업 실행 시간 기록"""
+        with self._lock:
+            histogram = self._histograms.get(operation)
+            if histogram is None:
+                histogram = self._histograms[operation] = LatencyHistogram(self.window)
+                self._modules[operation] = module or 'performance'
+            histogram.observe(duration, error)
+
+        if duration >= self.slow_threshold:
+            from .logger import log_performance
+            log_performance(operation, duration, module, slow=True)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """전체 작업 통계 반환"""
+        with self._lock:
+            return {name: histogram.snapshot() for name, histogram in sorted(self._histograms.items())}
+
+    def reset(self):
+        """수집된 지표 초기화"""
+        with self._lock:
+            self._histograms.clear()
+            self._modules.clear()
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 형식으로 변환"""
+        lines = [
+            '# HELP carepill_operation_duration_seconds 작업 실행 시간',
+            '# TYPE carepill_operation_duration_seconds summary',
+        ]
+        with self._lock:
+            modules = dict(self._modules)
+        for name, stats in self.snapshot().items():
+            labels = f'operation="{_escape_label(name)}",module="{_escape_label(modules.get(name, ""))}"'
+            for quantile in ('p50', 'p95', 'p99'):
+                value = stats[quantile]
+                lines.append(
+                    f'carepill_operation_duration_seconds{{{labels},quantile="0.{quantile[1:]}"}} {value:.6f}'
+                )
+            lines.append(f'carepill_operation_duration_seconds_sum{{{labels}}} {stats["sum"]:.6f}')
+            lines.append(f'carepill_operation_duration_seconds_count{{{labels}}} {stats["count"]}')
+            lines.append(f'carepill_operation_errors_total{{{labels}}} {stats["errors"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: Optional[str] = None) -> Path:
+        """Prometheus 텍스트 파일 저장 (node_exporter textfile collector 용)"""
+        target = Path(path or settings.METRICS_FILE)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_suffix(target.suffix + '.tmp')
+        temp_path.write_text(self.to_prometheus(), encoding='utf-8')
+        temp_path.replace(target)
+        return target
+
+
+_LABEL_ESCAPE = re.compile(r'(["\\])')
+
+
+def _escape_label(value: str) -> str:
+    return _LABEL_ESCAPE.sub(r'\\\1', value).replace('\n', '\\n')
+
+
+# 전역 지표 레지스트리
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """전역 지표 레지스트리 반환"""
+    return _registry
+
+
+@contextmanager
+def timer(operation: str, module: Optional[str] = None) -> Iterator[None]:
+    """
+    코드 블록 실행 시간 측정
+
+    Example:
+        with timer('db.session_scope', module='database'):
+            ...
+    """
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        _registry.observe(operation, time.perf_counter() - start, module, error)
+
+
+def timed(operation: Optional[str] = None, module: Optional[str] = None) -> Callable:
+    """
+    함수 실행 시간 측정 데코레이터 (동기/비동기 함수 모두 지원)
+
+    Args:
+        operation: 작업 이름 (기본값: 함수의 정규 이름)
+        module: 모듈명
+    """
+    def decorator(func: Callable) -> Callable:
+        name = operation or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timer(name, module):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name, module):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
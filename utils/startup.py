@@ -0,0 +1,108 @@
+"""
+CarePill 시작 시간 측정
+모듈 import와 서브시스템 초기화 단계별 소요 시간을 기록하여 --profile-startup 보고서로 출력
+"""
+
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class StartupPhase(NamedTuple):
+    """시작 단계"""
+    kind: str           # 'import' | 'init'
+    name: str
+    started: float      # 시작 시점 (time.perf_counter 값)
+    duration: float
+    background: bool    # REPL 시작 후 백그라운드에서 진행된 단계
+
+
+class StartupProfiler:
+    """시작 단계별 소요 시간 기록기
+
+    기록 비용이 작아 항상 켜 두며, 각 단계는 지표 레지스트리에도 startup.<name>으로 남긴다.
+    백그라운드 초기화는 여러 스레드에서 동시에 기록하므로 잠금으로 보호한다.
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        """
+        Args:
+            origin: 기준 시각 (time.perf_counter 값, 기본값: 생성 시각)
+        """
+        self.origin = time.perf_counter() if origin is None else origin
+        self._phases: List[StartupPhase] = []
+        self._milestones: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, started: float, ended: float, background: bool = False):
+        """측정한 구간 기록 (perf_counter 값)"""
+        phase = StartupPhase(kind, name, started, ended - started, background)
+        with self._lock:
+            self._phases.append(phase)
+
+        from .metrics import get_metrics_registry
+        get_metrics_registry().observe(f"startup.{kind}.{name}", phase.duration, module='startup')
+
+    def record_marks(self, kind: str, marks: Sequence[Tuple[str, float]]):
+        """연속된 시점 목록을 구간으로 기록 (첫 시점은 시작점, 측정기 생성 전이면 기준 시각을 앞당김)"""
+        self.origin = min(self.origin, marks[0][1])
+        for (_, started), (name, ended) in zip(marks, marks[1:]):
+            self.record(kind, name, started, ended)
+
+    @contextmanager
+    def phase(self, kind: str, name: str, background: bool = False) -> Iterator[None]:
+        """구간 측정 컨텍스트 매니저"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, started, time.perf_counter(), background)
+
+    def import_module(self, name: str, background: bool = False) -> ModuleType:
+        """지연 import (처음 불러올 때만 시간 기록)"""
+        if name in sys.modules:
+            return sys.modules[name]
+        with self.phase('import', name, background):
+            return importlib.import_module(name)
+
+    def mark(self, name: str):
+        """시점 기록 (예: REPL 사용 가능, 전체 초기화 완료)"""
+        with self._lock:
+            self._milestones.setdefault(name, time.perf_counter())
+
+    def phases(self) -> List[StartupPhase]:
+        """기록된 단계 (시작 순)"""
+        with self._lock:
+            return sorted(self._phases, key=lambda phase: phase.started)
+
+    def report(self) -> str:
+        """단계별 소요 시간 표"""
+        lines = []
+        for kind, title in (('import', '모듈 import'), ('init', '초기화')):
+            phases = [phase for phase in self.phases() if phase.kind == kind]
+            if not phases:
+                continue
+            lines.append(f"[{title}] 합계 {sum(phase.duration for phase in phases) * 1000:.0f}ms")
+            for phase in phases:
+                where = '백그라운드' if phase.background else '시작 경로'
+                lines.append(f"  {phase.name:<32} {phase.duration * 1000:>8.1f}ms  "
+                             f"(+{(phase.started - self.origin) * 1000:.0f}ms, {where})")
+        with self._lock:
+            milestones = sorted(self._milestones.items(), key=lambda item: item[1])
+        if milestones:
+            lines.append("[시점]")
+            lines.extend(f"  {name:<32} {(at - self.origin) * 1000:>8.1f}ms" for name, at in milestones)
+        return '\n'.join(lines)
+
+
+# 전역 시작 시간 측정기
+_profiler = StartupProfiler()
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """전역 시작 시간 측정기 반환"""
+    return _profiler
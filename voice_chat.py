@@ -8,18 +8,67 @@ from io import BytesIO
 import tempfile
 import os
 import json
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from config import settings
+from utils.metrics import timed, get_metrics_registry
+from modules.voice import VoiceActivityDetector, TTSCache, DEFAULT_PREWARM_PHRASES, ConversationHistory
+
+# 문장 경계 (마침표/물음표/느낌표/줄바꿈 뒤 공백)
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?。！？…])\s+|\n+')
+
+
+def iter_sentences(text_chunks, min_length=8):
+    """
+    스트리밍 텍스트 조각을 문장 단위로 묶어서 반환
+    
+    Args:
+        text_chunks (iterable): 스트리밍으로 도착하는 텍스트 조각
+        min_length (int): 너무 짧은 문장은 다음 문장과 합쳐서 TTS 호출 수를 줄임
+    
+    Yields:
+        str: 완성된 문장
+    """
+    buffer = ''
+    for chunk in text_chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        parts = SENTENCE_BOUNDARY.split(buffer)
+        # 마지막 조각은 아직 완성되지 않았을 수 있으므로 버퍼에 남김
+        buffer = parts.pop()
+        pending = ''
+        for part in parts:
+            pending = f"{pending} {part}".strip() if pending else part.strip()
+            if len(pending) >= min_length:
+                yield pending
+                pending = ''
+        if pending:
+            buffer = f"{pending} {buffer}" if buffer else pending
+    if buffer.strip():
+        yield buffer.strip()
+
 
 class VoiceChatGPT:
-    def __init__(self,config_path='config.json'):
+    def __init__(self,config_path='config.json', client=None):
         """
         OpenAI API를 사용한 음성 대화 시스템
         
         Args:
-            api_key (str): OpenAI API 키
+            config_path (str): 설정 파일 경로 (openai_api_key 등)
+            client: OpenAI 호환 클라이언트 (테스트용 가짜 클라이언트 주입 가능)
         """
         self.config = self.load_config(config_path)
-        self.client = openai.OpenAI(api_key=self.config['openai_api_key'])
+        self.client = client or openai.OpenAI(api_key=self.config['openai_api_key'])
         self.is_recording = False
+        
+        # 임시 파일 대신 메모리 버퍼 사용 (문제 발생 시 config에서 'use_temp_files': true)
+        self.use_temp_files = self.config.get('use_temp_files', False)
+        
+        # TTS 응답 캐시 (반복되는 안내 문구는 네트워크 호출 없이 재생)
+        self.tts_cache = TTSCache() if self.config.get('tts_cache', settings.TTS_CACHE_ENABLED) else None
         self.audio_format = pyaudio.paInt16
         self.channels = 1
         self.rate = 16000
@@ -31,10 +80,20 @@ class VoiceChatGPT:
         # Pygame mixer 초기화 (TTS 재생용)
         pygame.mixer.init()
         
-        # 대화 히스토리
-        self.conversation_history = [
-            {"role": "system", "content": "당신은 도움이 되는 AI 어시스턴트입니다. 한국어로 자연스럽게 대화하세요."}
-        ]
+        # 대화 히스토리 (토큰 예산을 넘는 오래된 대화는 요약으로 대체)
+        self.history = ConversationHistory(
+            "당신은 도움이 되는 AI 어시스턴트입니다. 한국어로 자연스럽게 대화하세요.",
+            response_tokens=500,
+            summarizer=self._summarize_with_gpt if self.config.get('gpt_history_summary', False) else None
+        )
+    
+    @property
+    def conversation_history(self):
+        """
+        API 요청용 대화 히스토리 (시스템 프롬프트 + 요약 + 최근 대화)
+        """
+        return self.history.messages()
+    
     def load_config(self, config_path):
         with open(config_path, 'r', encoding='utf-8') as f:
             config = json.load(f)
@@ -53,7 +112,7 @@ class VoiceChatGPT:
             duration (int): 녹음 시간 (초)
         
         Returns:
-            str: 임시 WAV 파일 경로
+            BytesIO | str: 메모리 WAV 버퍼 (임시 파일 모드에서는 파일 경로)
         """
         print("🎤 녹음을 시작합니다...")
         
@@ -73,27 +132,36 @@ class VoiceChatGPT:
         stream.stop_stream()
         stream.close()
         
-        # 임시 파일로 저장
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-        with wave.open(temp_file.name, 'wb') as wf:
-            wf.setnchannels(self.channels)
-            wf.setsampwidth(self.audio.get_sample_size(self.audio_format))
-            wf.setframerate(self.rate)
-            wf.writeframes(b''.join(frames))
-        
         print("✅ 녹음 완료!")
-        return temp_file.name
+        return self.save_wav(frames)
     
-    def record_until_silence(self, silence_threshold=500, silence_duration=2):
+    @timed('voice.record_until_silence', module='voice')
+    def record_until_silence(self, silence_threshold=500, silence_duration=0.8, pre_roll=0.3, max_wait=10, max_duration=30):
         """
-        음성이 끝날 때까지 녹음 (침묵 감지)
+        음성이 끝날 때까지 녹음 (VAD 기반 침묵 감지)
         
         Args:
-            silence_threshold (int): 침묵으로 간주할 볼륨 임계값
-            silence_duration (float): 침묵이 지속되어야 하는 시간 (초)
+            silence_threshold (int): 발화로 간주할 최소 RMS 에너지 (주변 소음에 따라 자동 상향)
+            silence_duration (float): 발화 후 침묵이 지속되어야 하는 시간 (초)
+            pre_roll (float): 발화 시작 전 함께 저장할 오디오 길이 (초)
+            max_wait (float): 발화가 없을 때 최대 대기 시간 (초)
+            max_duration (float): 최대 녹음 시간 (초)
+        
+        Returns:
+            BytesIO | str: 메모리 WAV 버퍼 (임시 파일 모드에서는 파일 경로, 발화가 없으면 None)
         """
         print("🎤 말씀하세요... (침묵이 감지되면 자동으로 종료됩니다)")
         
+        vad = VoiceActivityDetector(
+            sample_rate=self.rate,
+            chunk_size=self.chunk,
+            min_energy=silence_threshold,
+            hangover=silence_duration,
+            pre_roll=pre_roll,
+            max_wait=max_wait,
+            max_duration=max_duration
+        )
+        
         stream = self.audio.open(
             format=self.audio_format,
             channels=self.channels,
@@ -102,55 +170,79 @@ class VoiceChatGPT:
             frames_per_buffer=self.chunk
         )
         
-        frames = []
-        silence_start = None
+        try:
+            while not vad.process(stream.read(self.chunk, exception_on_overflow=False)):
+                pass
+        finally:
+            stream.stop_stream()
+            stream.close()
         
-        while True:
-            data = stream.read(self.chunk)
-            frames.append(data)
-            
-            # 볼륨 계산
-            volume = max(data)
-            
-            if volume < silence_threshold:
-                if silence_start is None:
-                    silence_start = time.time()
-                elif time.time() - silence_start > silence_duration:
-                    print("🔇 침묵 감지됨. 녹음을 종료합니다.")
-                    break
-            else:
-                silence_start = None
+        if not vad.has_speech:
+            print("🔇 음성이 감지되지 않았습니다.")
+            return None
         
-        stream.stop_stream()
-        stream.close()
+        print("🔇 침묵 감지됨. 녹음을 종료합니다.")
+        frames = vad.frames
+        
+        return self.save_wav(frames)
+    
+    def save_wav(self, frames):
+        """
+        녹음된 프레임을 WAV로 저장
         
-        # 임시 파일로 저장
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-        with wave.open(temp_file.name, 'wb') as wf:
+        Args:
+            frames (list): PCM 프레임 목록
+        
+        Returns:
+            BytesIO | str: 메모리 WAV 버퍼 (임시 파일 모드에서는 파일 경로)
+        """
+        if self.use_temp_files:
+            # 임시 파일로 저장 (대체 경로)
+            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
+            temp_file.close()
+            target = temp_file.name
+        else:
+            # 파일 이름은 API가 오디오 형식을 판단하는 데 사용됨
+            target = BytesIO()
+            target.name = 'speech.wav'
+        
+        with wave.open(target, 'wb') as wf:
             wf.setnchannels(self.channels)
             wf.setsampwidth(self.audio.get_sample_size(self.audio_format))
             wf.setframerate(self.rate)
             wf.writeframes(b''.join(frames))
         
-        return temp_file.name
+        if isinstance(target, BytesIO):
+            target.seek(0)
+        return target
     
-    def speech_to_text(self, audio_file_path):
+    @timed('voice.speech_to_text', module='voice')
+    def speech_to_text(self, audio_source):
         """
         Whisper API를 사용하여 음성을 텍스트로 변환
         
         Args:
-            audio_file_path (str): 오디오 파일 경로
+            audio_source (BytesIO | str): 메모리 오디오 버퍼 또는 오디오 파일 경로
         
         Returns:
             str: 변환된 텍스트
         """
         print("🔄 음성을 텍스트로 변환 중...")
         
+        audio_file_path = audio_source if isinstance(audio_source, (str, os.PathLike)) else None
+        
         try:
-            with open(audio_file_path, "rb") as audio_file:
+            if audio_file_path:
+                with open(audio_file_path, "rb") as audio_file:
+                    transcript = self.client.audio.transcriptions.create(
+                        model="whisper-1",
+                        file=audio_file,
+                        language="ko"  # 한국어 지정
+                    )
+            else:
                 transcript = self.client.audio.transcriptions.create(
                     model="whisper-1",
-                    file=audio_file,
+                    file=audio_source,
                     language="ko"  # 한국어 지정
                 )
             
@@ -163,9 +255,10 @@ class VoiceChatGPT:
             return None
         finally:
             # 임시 파일 삭제
-            if os.path.exists(audio_file_path):
+            if audio_file_path and os.path.exists(audio_file_path):
                 os.unlink(audio_file_path)
     
+    @timed('voice.chat_with_gpt', module='voice')
     def chat_with_gpt(self, user_message):
         """
         ChatGPT와 대화
@@ -180,7 +273,7 @@ class VoiceChatGPT:
         
         try:
             # 대화 히스토리에 추가
-            self.conversation_history.append({"role": "user", "content": user_message})
+            self.history.add("user", user_message)
             
             response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",  # 또는 "gpt-4"
@@ -192,7 +285,7 @@ class VoiceChatGPT:
             assistant_message = response.choices[0].message.content
             
             # 대화 히스토리에 추가
-            self.conversation_history.append({"role": "assistant", "content": assistant_message})
+            self.history.add("assistant", assistant_message)
             
             print(f"🤖 ChatGPT: {assistant_message}")
             return assistant_message
@@ -201,48 +294,252 @@ class VoiceChatGPT:
             print(f"❌ ChatGPT API 오류: {e}")
             return "죄송합니다. 응답을 생성하는 중 오류가 발생했습니다."
     
-    def text_to_speech(self, text):
+    def _summarize_with_gpt(self, previous_summary, messages, max_tokens):
         """
-        OpenAI TTS API를 사용하여 텍스트를 음성으로 변환하고 재생
+        오래된 대화를 ChatGPT로 요약
+        
+        Args:
+            previous_summary (str): 기존 요약
+            messages (list): 요약에 새로 포함할 메시지
+            max_tokens (int): 요약 최대 토큰 수
+        
+        Returns:
+            str: 새 요약
+        """
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        response = self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "다음 대화를 이후 상담에 필요한 사실(복용 약, 증상, 요청) 위주로 간결하게 한국어로 요약하세요."},
+                {"role": "user", "content": f"기존 요약:\n{previous_summary or '(없음)'}\n\n새 대화:\n{transcript}"}
+            ],
+            temperature=0.2,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content.strip()
+    
+    def chat_with_gpt_stream(self, user_message):
+        """
+        ChatGPT 스트리밍 응답을 문장 단위로 반환
+        
+        Args:
+            user_message (str): 사용자 메시지
+        
+        Yields:
+            str: 완성된 응답 문장
+        """
+        print("🤖 ChatGPT가 응답을 생성 중... (스트리밍)")
+        
+        self.history.add("user", user_message)
+        collected = []
+        
+        def deltas():
+            stream = self.client.chat.completions.create(
+                model="gpt-3.5-turbo",  # 또는 "gpt-4"
+                messages=self.conversation_history,
+                temperature=0.7,
+                max_tokens=500,
+                stream=True
+            )
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    collected.append(delta)
+                    yield delta
+        
+        try:
+            for sentence in iter_sentences(deltas()):
+                yield sentence
+        except Exception as e:
+            print(f"❌ ChatGPT API 오류: {e}")
+            if not collected:
+                fallback = "죄송합니다. 응답을 생성하는 중 오류가 발생했습니다."
+                collected.append(fallback)
+                yield fallback
+        finally:
+            assistant_message = ''.join(collected)
+            self.history.add("assistant", assistant_message)
+            print(f"🤖 ChatGPT: {assistant_message}")
+    
+    def synthesize_speech(self, text):
+        """
+        텍스트를 음성 데이터로 변환 (TTS 캐시 우선 조회)
         
         Args:
             text (str): 변환할 텍스트
+        
+        Returns:
+            bytes: MP3 오디오 데이터
         """
-        print("🔊 음성을 생성하고 재생 중...")
+        if self.tts_cache is None:
+            return self._request_speech(text)
+        return self.tts_cache.get_or_create(
+            text,
+            self.config['tts_model'],
+            self.config['tts_voice'],
+            self._request_speech
+        )
+    
+    def _request_speech(self, text):
+        """
+        OpenAI TTS API 호출
+        
+        Args:
+            text (str): 변환할 텍스트
+        
+        Returns:
+            bytes: MP3 오디오 데이터
+        """
+        response = self.client.audio.speech.create(
+            model=self.config['tts_model'],  # config에서 TTS 모델 사용
+            voice=self.config['tts_voice'],   # config에서 음성 설정 사용
+            input=text
+        )
+        return response.content
+    
+    def prewarm_tts_cache(self, phrases=None, background=True):
+        """
+        자주 쓰는 문구를 TTS 캐시에 미리 생성
+        
+        Args:
+            phrases (list): 미리 생성할 문구 (기본값: config의 'tts_prewarm_phrases' 또는 기본 문구)
+            background (bool): 백그라운드 스레드에서 실행 여부
+        """
+        if self.tts_cache is None:
+            return
+        
+        phrases = phrases or self.config.get('tts_prewarm_phrases') or DEFAULT_PREWARM_PHRASES
+        args = (phrases, self.config['tts_model'], self.config['tts_voice'], self._request_speech)
+        
+        if background:
+            threading.Thread(target=self.tts_cache.prewarm, args=args, daemon=True).start()
+        else:
+            self.tts_cache.prewarm(*args)
+    
+    def play_audio(self, audio_bytes):
+        """
+        MP3 오디오 데이터 재생 (재생이 끝날 때까지 대기)
+        
+        Args:
+            audio_bytes (bytes): MP3 오디오 데이터
+        """
+        if not self.use_temp_files:
+            try:
+                # 메모리 버퍼에서 바로 재생
+                pygame.mixer.music.load(BytesIO(audio_bytes), 'mp3')
+            except Exception as e:
+                print(f"⚠️ 메모리 재생 실패, 임시 파일로 재생합니다: {e}")
+            else:
+                self._wait_for_playback()
+                return
+        
+        # 임시 파일로 저장하여 재생 (대체 경로)
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
+            temp_file.write(audio_bytes)
+            temp_file_path = temp_file.name
         
         try:
-            response = self.client.audio.speech.create(
-                model=self.config['tts_model'],  # config에서 TTS 모델 사용
-                voice=self.config['tts_voice'],   # config에서 음성 설정 사용
-                input=text
-            )
-            
-            # BytesIO를 사용하여 메모리에서 오디오 재생
-            audio_data = BytesIO(response.content)
-            
-            # 임시 파일로 저장하여 재생
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                temp_file.write(response.content)
-                temp_file_path = temp_file.name
-            
             # Pygame으로 재생
             pygame.mixer.music.load(temp_file_path)
-            pygame.mixer.music.play()
-            
-            # 재생이 끝날 때까지 대기
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
-            
+            self._wait_for_playback()
+        finally:
             # 임시 파일 삭제
             os.unlink(temp_file_path)
-            
+    
+    def _wait_for_playback(self):
+        """
+        로드된 오디오를 재생하고 끝날 때까지 대기
+        """
+        pygame.mixer.music.play()
+        
+        while pygame.mixer.music.get_busy():
+            time.sleep(0.05)
+        
+        pygame.mixer.music.unload()
+    
+    @timed('voice.text_to_speech', module='voice')
+    def text_to_speech(self, text):
+        """
+        OpenAI TTS API를 사용하여 텍스트를 음성으로 변환하고 재생
+        
+        Args:
+            text (str): 변환할 텍스트
+        """
+        print("🔊 음성을 생성하고 재생 중...")
+        
+        try:
+            self.play_audio(self.synthesize_speech(text))
         except Exception as e:
             print(f"❌ TTS 오류: {e}")
     
-    def start_conversation(self):
+    def speak_streaming(self, sentences, player=None, tts_workers=2):
+        """
+        문장 스트림을 TTS로 변환하면서 순서대로 재생
+        
+        앞 문장이 재생되는 동안 다음 문장의 생성과 TTS 변환이 계속 진행된다.
+        
+        Args:
+            sentences (iterable): 재생할 문장 스트림
+            player (callable): 오디오 데이터 재생 함수 (기본값: play_audio)
+            tts_workers (int): 동시에 진행할 TTS 요청 수
+        
+        Returns:
+            str: 재생된 전체 텍스트
+        """
+        player = player or self.play_audio
+        audio_queue = queue.Queue(maxsize=tts_workers * 2)
+        spoken = []
+        
+        def produce(executor):
+            try:
+                for sentence in sentences:
+                    spoken.append(sentence)
+                    audio_queue.put((sentence, executor.submit(self.synthesize_speech, sentence)))
+            except Exception as e:
+                print(f"❌ 응답 생성 오류: {e}")
+            finally:
+                audio_queue.put(None)
+        
+        started_at = time.perf_counter()
+        first_audio = True
+        
+        with ThreadPoolExecutor(max_workers=tts_workers) as executor:
+            producer = threading.Thread(target=produce, args=(executor,), daemon=True)
+            producer.start()
+            
+            while True:
+                item = audio_queue.get()
+                if item is None:
+                    break
+                sentence, future = item
+                try:
+                    audio_bytes = future.result()
+                    if first_audio:
+                        # 응답 요청부터 첫 음성 재생까지의 지연
+                        get_metrics_registry().observe(
+                            'voice.time_to_first_audio', time.perf_counter() - started_at, 'voice'
+                        )
+                        first_audio = False
+                    player(audio_bytes)
+                except Exception as e:
+                    print(f"❌ TTS 오류: {e}")
+            
+            producer.join()
+        
+        return ' '.join(spoken)
+    
+    def start_conversation(self, streaming=None):
         """
         음성 대화 시작
+        
+        Args:
+            streaming (bool): 스트리밍 모드 사용 여부 (None이면 config의 'streaming' 값)
         """
+        if streaming is None:
+            streaming = self.config.get('streaming', False)
+        
         print("🎉 ChatGPT 음성 대화를 시작합니다!")
         print("💡 팁: 'exit', '종료', '끝' 이라고 말하면 대화가 종료됩니다.")
         
@@ -252,6 +549,9 @@ class VoiceChatGPT:
                 
                 # 1. 음성 녹음
                 audio_file = self.record_until_silence()
+                if not audio_file:
+                    continue
+                
                 
                 # 2. STT (음성 → 텍스트)
                 user_text = self.speech_to_text(audio_file)
@@ -265,6 +565,11 @@ class VoiceChatGPT:
                     print("👋 대화를 종료합니다.")
                     break
                 
+                if streaming:
+                    # 3-4. 응답 생성과 TTS/재생을 문장 단위로 겹쳐서 진행
+                    self.speak_streaming(self.chat_with_gpt_stream(user_text))
+                    continue
+                
                 # 3. ChatGPT와 대화
                 gpt_response = self.chat_with_gpt(user_text)
                 